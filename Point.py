@@ -1,10 +1,38 @@
 class Point:
+    '''
+    Class: Point
+    Attributes: x, y
+    Methods: delta_x, delta_y.
+    '''
+    __slots__ = ('x', 'y') # no __dict__, many points are made
+
     def __init__(self, x, y):
+        '''
+        Constructor: Create a new instance of a point,
+        Parameters:
+        self -- the current object,
+        x -- the coordinate x of this point,
+        y -- the coordinate y of this point.
+        '''
         self.x = x
         self.y = y
 
     def delta_x(self, other):
+        '''
+        Method: get the distance between two points on the x-axis.
+        Parameters:
+        self -- the current point,
+        other -- another point.
+        returns the distance between two points on the x-axis.
+        '''
         return abs(self.x - other.x)
 
     def delta_y(self, other):
+        '''
+        Method: get the distance between two points on the y-axis.
+        Parameters:
+        self -- the current point,
+        other -- another point.
+        returns the distance between two points on the y-axis.
+        '''
         return abs(self.y - other.y)
@@ -0,0 +1,250 @@
+import argparse
+import collections
+import concurrent.futures
+import json
+import mmap
+import os
+import time
+from game_engine import DEFAULT_CONFIG, WON, LOST, QUIT
+from board_state import STATES
+from replay import REPLAYS_FILE, RECORD, REPEATS, iter_offsets, shard_bounds
+
+CHUNK_BYTES = 16 * 2 ** 20 # bytes of log summarized by one task of a worker
+TOP_GUESSES = 10 # first guesses shown in the table
+
+class Summary:
+    '''
+    Class: Summary
+    Attributes: games, guesses, states, rounds_to_win, first_guesses,
+    secret_colors, variants
+    Methods: add, merge, loss_rate, quit_rate, top_first_guesses, color_bias, to_dict.
+    Counters over recorded games, which only grow with the variety of
+    the games and never with their number, so summaries of shards of a
+    log add up to the summary of the whole log.
+    '''
+    def __init__(self):
+        '''
+        Constructor: Create a new instance of an empty summary,
+        Parameters:
+        self -- the current object.
+        '''
+        self.games = 0
+        self.guesses = 0
+        self.states = collections.Counter() # final state -> games
+        self.rounds_to_win = collections.Counter() # guesses of a won game, its leaders score -> games
+        self.first_guesses = collections.Counter() # color indexes of the first guess -> games
+        self.secret_colors = collections.Counter() # (position, color index) of the secrets -> games
+        self.variants = collections.Counter() # (colors, pegs, rounds, repeats) -> games
+
+    def add(self, variant, state, secret, first_guess, n_guesses):
+        '''
+        Method: count one game
+        Parameters: self -- the current summary,
+        variant -- tuple (colors, pegs, rounds, repeats),
+        state -- string, how the game ended,
+        secret -- bytes, color indexes of the secret,
+        first_guess -- bytes, color indexes of the first guess, empty if none,
+        n_guesses -- integer,
+        returns None.
+        '''
+        self.games += 1
+        self.guesses += n_guesses
+        self.states[state] += 1
+        self.variants[variant] += 1
+        if state == WON:
+            self.rounds_to_win[n_guesses] += 1
+        if first_guess:
+            self.first_guesses[first_guess] += 1
+        for position, color in enumerate(secret):
+            self.secret_colors[position, color] += 1
+
+    def merge(self, other):
+        '''
+        Method: add the counts of another summary, e.g. of another shard
+        Parameters: self -- the current summary, other -- Summary,
+        returns the current summary.
+        '''
+        self.games += other.games
+        self.guesses += other.guesses
+        for name in ('states', 'rounds_to_win', 'first_guesses', 'secret_colors', 'variants'):
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def loss_rate(self):
+        '''
+        Method: the share of the finished games that ran out of rounds
+        Parameters: self -- the current summary,
+        returns float.
+        '''
+        finished = self.states[WON] + self.states[LOST]
+        return self.states[LOST] / finished if finished else 0.0
+
+    def quit_rate(self):
+        '''
+        Method: the share of the games that were quit before the end
+        Parameters: self -- the current summary,
+        returns float.
+        '''
+        return self.states[QUIT] / self.games if self.games else 0.0
+
+    def top_first_guesses(self, n=TOP_GUESSES):
+        '''
+        Method: the most played first guesses, ties in color order so
+        every sharding of a log gives the same table
+        Parameters: self -- the current summary, n -- integer,
+        returns a list of (color indexes, games).
+        '''
+        return sorted(self.first_guesses.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def color_bias(self, n_colors):
+        '''
+        Method: how far the colors of the secrets are from uniform, as
+        random.sample picks each color for each position equally often
+        Parameters: self -- the current summary,
+        n_colors -- integer, size of the palette,
+        returns a tuple (dict color index -> share of the secret pegs,
+        chi-square statistic with n_colors - 1 degrees of freedom).
+        '''
+        totals = collections.Counter()
+        for (_, color), count in self.secret_colors.items():
+            totals[color] += count
+        pegs = sum(totals.values())
+        if not pegs:
+            return {}, 0.0
+        expected = pegs / n_colors
+        chi_square = sum((totals[color] - expected) ** 2 / expected for color in range(n_colors))
+        return {color: totals[color] / pegs for color in range(n_colors)}, chi_square
+
+    def to_dict(self, palette=DEFAULT_CONFIG.palette):
+        '''
+        Method: the summary as plain values, colors by name
+        Parameters: self -- the current summary,
+        palette -- list of color strings the indexes refer to,
+        returns a dict.
+        '''
+        shares, chi_square = self.color_bias(len(palette))
+        return {
+            'games': self.games,
+            'guesses': self.guesses,
+            'states': dict(self.states),
+            'loss_rate': self.loss_rate(),
+            'quit_rate': self.quit_rate(),
+            'rounds_to_win': {str(rounds): n for rounds, n in sorted(self.rounds_to_win.items())},
+            'first_guesses': [[[palette[i] for i in guess], n]
+                              for guess, n in self.top_first_guesses()],
+            'secret_color_shares': {palette[color]: share for color, share in shares.items()},
+            'secret_color_chi_square': chi_square,
+        }
+
+def game_facts(data, start=None, stop=None):
+    '''
+    Function that streams what the statistics need from each record of
+    a replay log, reading only its header, secret and first guess.
+    Parameters: data -- bytes or mmap of the log,
+    start, stop -- integers, offsets of the first record and past the
+    last, None for the whole log.
+    Returns a generator of tuples (variant, state, secret, first guess, guesses).
+    '''
+    header = RECORD.size
+    for offset in iter_offsets(data, start, stop):
+        _, n_colors, length, rounds, flags, _, n = RECORD.unpack_from(data, offset)
+        position = offset + header
+        half = (length + 1) // 2 # bytes of a code, two color indexes per byte
+        packed = data[position:position + half + (length + 1) // 2]
+        secret = bytes(packed[i // 2] >> (i % 2 * 4) & 15 for i in range(length))
+        first_guess = b''
+        if n:
+            # the guesses are packed back to back, the first starts on a byte
+            first_guess = bytes(packed[half + i // 2] >> (i % 2 * 4) & 15 for i in range(length))
+        yield (n_colors, length, rounds, bool(flags & REPEATS)), STATES[flags >> 1 & 3], secret, first_guess, n
+
+def summarize(data, start=None, stop=None):
+    '''
+    Function that counts the games of a part of a replay log.
+    Parameters: data -- bytes or mmap of the log,
+    start, stop -- integers, offsets of the first record and past the last.
+    Returns Summary.
+    '''
+    summary = Summary()
+    for facts in game_facts(data, start, stop):
+        summary.add(*facts)
+    return summary
+
+def summarize_shard(path, start, stop):
+    '''
+    Function that counts the games of a shard of a log file,
+    it runs in the worker processes.
+    Parameters: path -- string, the log,
+    start, stop -- integers, offsets of the first record and past the last.
+    Returns Summary.
+    '''
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return summarize(data, start, stop)
+
+def analyze(path=REPLAYS_FILE, workers=0):
+    '''
+    Function that summarizes every game of a replay log, streaming over
+    the file so memory does not grow with its size.
+    Parameters: path -- string, the log,
+    workers -- integer, processes to shard the log over, 0 reads it in this process.
+    Returns a tuple (Summary, float wall time in seconds).
+    '''
+    start_time = time.perf_counter()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if workers == 0:
+            return summarize(data), time.perf_counter() - start_time
+        # shards of CHUNK_BYTES, and enough of them to keep every worker busy to the end
+        bounds = shard_bounds(data, max(workers * 4, len(data) // CHUNK_BYTES))
+    summary = Summary()
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(summarize_shard, path, a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+        for future in concurrent.futures.as_completed(futures):
+            summary.merge(future.result())
+    return summary, time.perf_counter() - start_time
+
+def print_summary(summary, palette=DEFAULT_CONFIG.palette):
+    '''
+    Function that prints the tables of a summary.
+    Parameters: summary -- Summary, palette -- list of color strings.
+    Returns None.
+    '''
+    print(f'{summary.games:,} games, {summary.guesses:,} guesses')
+    print(f'  {"state":<10}{"games":>12}{"share":>9}')
+    for state in STATES[1:]:
+        share = summary.states[state] / summary.games if summary.games else 0.0
+        print(f'  {state:<10}{summary.states[state]:>12,}{share:>9.1%}')
+    print(f'  loss rate {summary.loss_rate():.1%} of the finished games, quit rate {summary.quit_rate():.1%}')
+    wins = sum(summary.rounds_to_win.values())
+    if wins:
+        print('rounds to win (the leaders score)')
+        for rounds, n in sorted(summary.rounds_to_win.items()):
+            print(f'  {rounds:>3}{n:>12,}{n / wins:>9.1%}  {"#" * round(40 * n / wins)}')
+        print(f'  mean {sum(r * n for r, n in summary.rounds_to_win.items()) / wins:.2f}')
+    if summary.first_guesses:
+        print('most played first guesses')
+        for guess, n in summary.top_first_guesses():
+            print(f'  {" ".join(palette[i] for i in guess):<32}{n:>12,}{n / summary.games:>9.1%}')
+    shares, chi_square = summary.color_bias(len(palette))
+    if shares:
+        print(f'colors of the secrets, uniform is {1 / len(palette):.1%}')
+        for color, share in shares.items():
+            print(f'  {palette[color]:<10}{share:>9.2%}{share * len(palette) - 1:>+9.1%}')
+        print(f'  chi-square {chi_square:.2f} with {len(palette) - 1} degrees of freedom')
+
+def main():
+    parser = argparse.ArgumentParser(description='Statistics of the recorded MasterMind games')
+    parser.add_argument('path', nargs='?', default=REPLAYS_FILE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='processes to read with, 0 to read in this process')
+    parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    args = parser.parse_args()
+    summary, elapsed = analyze(args.path, args.workers)
+    if args.json:
+        print(json.dumps(summary.to_dict(), indent=2))
+        return
+    print_summary(summary)
+    rate = summary.guesses / elapsed if elapsed else 0
+    print(f'read in {elapsed:.2f} s, {rate:,.0f} guesses/sec')
+
+if __name__ == "__main__":
+    main()
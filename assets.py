@@ -0,0 +1,155 @@
+import os
+import struct
+import time
+import turtle
+from layout import OPTION_BUTTONS, MESSAGES
+
+# every gif of the game, the buttons first as they are drawn at once
+GIF_ASSETS = [gif_image for _, _, gif_image, _, _ in OPTION_BUTTONS.values()] + \
+             [gif_image for gif_image, _, _ in MESSAGES.values()]
+POOL_SIZE = 2 # turtles that stamp the gifs, shared by every overlay
+PRELOAD_INTERVAL = 100 # milliseconds between two gifs loaded while the game waits for clicks
+
+def gif_size(path):
+    '''
+    Function that reads the width and height of a gif from its header.
+    Parameters: path -- string, the gif file.
+    Returns a tuple of integers (width, height).
+    '''
+    with open(path, 'rb') as f:
+        header = f.read(10)
+    if header[:4] != b'GIF8':
+        raise ValueError(f'{path} is not a gif')
+    return struct.unpack('<HH', header[6:10])
+
+class AssetRegistry:
+    '''
+    Class: AssetRegistry
+    Attributes: screen, new_turtle, pool_size, assets, pool, turns, pending
+    Methods: load, preload, preload_step, turtle, stamp, stats.
+    Loads each gif shape once and keeps it registered with the screen,
+    and stamps the gifs with a small pool of hidden turtles instead of a
+    new turtle per overlay. Tk decodes images on its own thread, so the
+    gifs not needed at once are preloaded one per timer tick while the
+    game waits for the first clicks.
+    '''
+    def __init__(self, screen, new_turtle=turtle.Turtle, pool_size=POOL_SIZE):
+        '''
+        Constructor: Create a new instance of an empty registry,
+        Parameters:
+        self -- the current object,
+        screen -- turtle.Screen the shapes are registered with,
+        new_turtle -- callable that makes a turtle, turtle.Turtle by default,
+        pool_size -- integer, turtles stamping the gifs.
+        '''
+        self.screen = screen
+        self.new_turtle = new_turtle
+        self.pool_size = pool_size
+        self.assets = {} # gif -> dict of its load time and sizes
+        self.pool = []
+        self.turns = 0 # stamps so far, picks the next turtle of the pool
+        self.pending = [] # gifs to preload, in order
+
+    def load(self, gif_image):
+        '''
+        Method: register a gif shape with the screen, the first time only
+        Parameters: self -- the current registry, gif_image -- string, the gif file,
+        returns a dict of the seconds it took to load, and its bytes on
+        disk and decoded (4 per pixel in Tk).
+        '''
+        if gif_image not in self.assets:
+            start = time.perf_counter()
+            self.screen.register_shape(gif_image)
+            seconds = time.perf_counter() - start
+            width, height = gif_size(gif_image)
+            self.assets[gif_image] = {'seconds': seconds, 'file_bytes': os.path.getsize(gif_image),
+                                      'image_bytes': width * height * 4, 'width': width, 'height': height}
+        return self.assets[gif_image]
+
+    def preload(self, gif_images=GIF_ASSETS, interval=PRELOAD_INTERVAL):
+        '''
+        Method: load gifs later, one per timer tick, so none is decoded
+        when it must show
+        Parameters: self -- the current registry,
+        gif_images -- list of strings, the gif files,
+        interval -- integer, milliseconds between two gifs,
+        returns None.
+        '''
+        was_idle = not self.pending
+        self.pending += [gif_image for gif_image in gif_images
+                         if gif_image not in self.assets and gif_image not in self.pending]
+        if was_idle and self.pending:
+            self.screen.ontimer(lambda: self.preload_step(interval), interval)
+
+    def preload_step(self, interval=PRELOAD_INTERVAL):
+        '''
+        Method: load the next pending gif, and look again later if more are left
+        Parameters: self -- the current registry,
+        interval -- integer, milliseconds to the next gif,
+        returns None.
+        '''
+        if self.pending:
+            self.load(self.pending.pop(0))
+        if self.pending:
+            self.screen.ontimer(lambda: self.preload_step(interval), interval)
+
+    def turtle(self):
+        '''
+        Method: the next turtle of the pool, made on first use
+        Parameters: self -- the current registry,
+        returns a turtle.Turtle, hidden and with its pen up.
+        '''
+        if len(self.pool) < self.pool_size:
+            pen = self.new_turtle()
+            pen.hideturtle()
+            pen.penup()
+            pen.speed(0)
+            self.pool.append(pen)
+        pen = self.pool[self.turns % len(self.pool)]
+        self.turns += 1
+        return pen
+
+    def stamp(self, gif_image, position):
+        '''
+        Method: stamp a gif on the canvas, centered on a position
+        Parameters: self -- the current registry,
+        gif_image -- string, the gif file, position -- Point,
+        returns the id of the stamp.
+        '''
+        self.load(gif_image)
+        if gif_image in self.pending:
+            self.pending.remove(gif_image)
+        pen = self.turtle()
+        pen.shape(gif_image)
+        pen.goto(position.x, position.y)
+        return pen.stamp()
+
+    def stats(self):
+        '''
+        Method: what the assets cost
+        Parameters: self -- the current registry,
+        returns a dict of the gifs loaded, their total load time and
+        bytes, and the turtles made.
+        '''
+        return {'assets': len(self.assets),
+                'load_seconds': sum(asset['seconds'] for asset in self.assets.values()),
+                'file_bytes': sum(asset['file_bytes'] for asset in self.assets.values()),
+                'image_bytes': sum(asset['image_bytes'] for asset in self.assets.values()),
+                'turtles': len(self.pool)}
+
+def main():
+    screen = turtle.Screen()
+    registry = AssetRegistry(screen)
+    for gif_image in GIF_ASSETS:
+        registry.load(gif_image)
+    print(f'{"gif":<16}{"size":>10}{"file":>9}{"decoded":>10}{"load ms":>9}')
+    for gif_image, asset in registry.assets.items():
+        print(f'{gif_image:<16}{asset["width"]:>5}x{asset["height"]:<4}{asset["file_bytes"]:>9,}'
+              f'{asset["image_bytes"]:>10,}{asset["seconds"] * 1000:>9.2f}')
+    stats = registry.stats()
+    print(f'{stats["assets"]} gifs, {stats["file_bytes"]:,} bytes on disk, {stats["image_bytes"]:,} decoded, '
+          f'loaded in {stats["load_seconds"] * 1000:.2f} ms')
+    screen.bye()
+
+if __name__ == "__main__":
+    main()
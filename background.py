@@ -0,0 +1,138 @@
+import concurrent.futures
+import sys
+import threading
+
+POLL_INTERVAL = 50 # milliseconds between two looks at the running tasks
+
+class BackgroundTask:
+    '''
+    Class: BackgroundTask
+    Attributes: name, future, cancel_event, on_done
+    Methods: cancel, cancelled.
+    Work running in a worker thread; its result is handed to on_done
+    on the thread of the turtle window, unless it was cancelled.
+    '''
+    def __init__(self, name, future, cancel_event, on_done):
+        '''
+        Constructor: Create a new instance of a background task,
+        Parameters:
+        self -- the current object,
+        name -- string, a newer task of the same name cancels this one,
+        future -- concurrent.futures.Future of the work,
+        cancel_event -- threading.Event, set to ask the work to stop early,
+        on_done -- callable taking the result, or None.
+        '''
+        self.name = name
+        self.future = future
+        self.cancel_event = cancel_event
+        self.on_done = on_done
+
+    def cancel(self):
+        '''
+        Method: drop the result and ask the work to stop, at its next check
+        Parameters: self -- the current task,
+        returns None.
+        '''
+        self.cancel_event.set()
+        self.future.cancel() # only works if it has not started yet
+
+    def cancelled(self):
+        '''
+        Method: check if the task was cancelled
+        Parameters: self -- the current task,
+        returns Boolean.
+        '''
+        return self.cancel_event.is_set()
+
+class BackgroundTasks:
+    '''
+    Class: BackgroundTasks
+    Attributes: screen, executor, tasks, poll_interval, polling
+    Methods: submit, cancel, poll, shutdown.
+    Runs slow work (a hint search, leaders file I/O) off the turtle
+    thread, which only polls for results with screen.ontimer, so a click
+    is never stuck behind it. Tk must only be touched from its own
+    thread, so on_done is always called from poll.
+    '''
+    def __init__(self, screen, workers=2, poll_interval=POLL_INTERVAL):
+        '''
+        Constructor: Create a new instance of the background tasks,
+        Parameters:
+        self -- the current object,
+        screen -- turtle.Screen, whose ontimer polls the tasks,
+        workers -- integer, worker threads,
+        poll_interval -- integer, milliseconds between two polls.
+        '''
+        self.screen = screen
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='mastermind')
+        self.tasks: list[BackgroundTask] = []
+        self.poll_interval = poll_interval
+        self.polling = False
+
+    def submit(self, name, work, *args, on_done=None, replace=True):
+        '''
+        Method: start work in a worker thread, cancelling the running task of the same name
+        Parameters:
+        self -- the current tasks,
+        name -- string, the kind of work,
+        work -- callable, called as work(*args, cancel_event),
+        args -- its other arguments,
+        on_done -- callable, called with the result on the turtle thread,
+        replace -- Boolean, False to let the running tasks of the name finish,
+        returns BackgroundTask.
+        '''
+        if replace:
+            self.cancel(name)
+        cancel_event = threading.Event()
+        task = BackgroundTask(name, self.executor.submit(work, *args, cancel_event), cancel_event, on_done)
+        self.tasks.append(task)
+        if not self.polling:
+            self.polling = True
+            self.screen.ontimer(self.poll, self.poll_interval)
+        return task
+
+    def cancel(self, name):
+        '''
+        Method: cancel the running tasks of a name
+        Parameters: self -- the current tasks, name -- string,
+        returns Boolean, True if a task was cancelled.
+        '''
+        cancelled = [task for task in self.tasks if task.name == name]
+        for task in cancelled:
+            task.cancel()
+            self.tasks.remove(task)
+        return bool(cancelled)
+
+    def poll(self):
+        '''
+        Method: hand the finished results to their on_done, and look
+        again later while tasks are running; a task that failed is
+        reported on stderr and the others go on
+        Parameters: self -- the current tasks,
+        returns None.
+        '''
+        done = [task for task in self.tasks if task.future.done()]
+        for task in done:
+            self.tasks.remove(task)
+            try:
+                result = task.future.result() # an error in the work shows here
+                if task.on_done is not None and not task.cancelled():
+                    task.on_done(result)
+            except concurrent.futures.CancelledError:
+                pass # cancelled before it started
+            except Exception as error:
+                print(f'mastermind: {task.name} failed: {error!r}', file=sys.stderr)
+        self.polling = bool(self.tasks)
+        if self.polling:
+            self.screen.ontimer(self.poll, self.poll_interval)
+
+    def shutdown(self):
+        '''
+        Method: cancel the hints and wait for the work already started,
+        such as a leader being written
+        Parameters: self -- the current tasks,
+        returns None.
+        '''
+        for task in self.tasks:
+            task.cancel_event.set()
+        self.executor.shutdown(wait=True)
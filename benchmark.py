@@ -0,0 +1,560 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from game_engine import GameEngine, GameConfig, CODE_LENGTH, colors, count_bulls_and_cows
+from candidates import CandidateSet
+from scoring import count_bulls_and_cows_batch
+from solver import Solver, MINIMAX, EXPECTED_SIZE, compute_hint
+from leaderboard import LeaderBoard, format_record
+from board_state import BoardState, pack_boards, unpack_boards
+from layout import ROWS, PEGS, color_marble_position, peg_position, color_button_position
+from renderer import BoardRenderer
+from hit_test import HitGrid, marble_box
+from test_support import StubPen, StubScreen, stub_turtle, random_game
+
+# every guess the color buttons allow, as button indexes
+BUTTON_GUESSES = list(itertools.permutations(range(len(colors)), CODE_LENGTH))
+
+def bench_engine_games(n_games=20000, seed=0):
+    '''
+    Function that measures how many full games the engine plays per second.
+    Parameters: n_games -- integer, number of games to simulate,
+    seed -- integer, seed of the random guesses.
+    Returns a float, games per second.
+    '''
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(n_games):
+        random_game(rng)
+    return n_games / (time.perf_counter() - start)
+
+def bench_batch_scoring(n_pairs, seed=0, scalar_limit=100000):
+    '''
+    Function that compares the scalar and batch scoring of random code pairs.
+    Parameters: n_pairs -- integer, number of (secret, guess) pairs,
+    seed -- integer, seed of the random codes,
+    scalar_limit -- integer, the scalar rate is measured on at most this
+                    many pairs, larger sizes would only take longer.
+    Returns a tuple of floats, scalar and batch pairs per second.
+    '''
+    rng = np.random.default_rng(seed)
+    space = np.array(BUTTON_GUESSES, dtype=np.int16)
+    secrets = space[rng.integers(len(space), size=n_pairs)]
+    guesses = space[rng.integers(len(space), size=n_pairs)]
+    start = time.perf_counter()
+    count_bulls_and_cows_batch(secrets, guesses)
+    batch_rate = n_pairs / (time.perf_counter() - start)
+    n_scalar = min(n_pairs, scalar_limit)
+    pairs = [([colors[c] for c in secret_code], [colors[c] for c in guess])
+             for secret_code, guess in zip(secrets[:n_scalar].tolist(), guesses[:n_scalar].tolist())]
+    start = time.perf_counter()
+    for secret_code, guess in pairs:
+        count_bulls_and_cows(secret_code, guess)
+    scalar_rate = n_scalar / (time.perf_counter() - start)
+    return scalar_rate, batch_rate
+
+def bench_solver_latency(method=MINIMAX, n_games=100, seed=0):
+    '''
+    Function that measures how long the solver takes to suggest a guess.
+    Parameters: method -- string, MINIMAX or EXPECTED_SIZE,
+    n_games -- integer, number of random secrets to solve,
+    seed -- integer, seed of the secrets.
+    Returns a tuple of floats, median and worst latency in milliseconds.
+    '''
+    rng = random.Random(seed)
+    latencies = []
+    for _ in range(n_games):
+        engine = GameEngine(rng=rng)
+        solver = Solver(method=method)
+        while not engine.is_over():
+            for color in solver.suggest():
+                engine.pick_color(colors.index(color))
+            engine.submit()
+            solver.observe(*engine.history[-1])
+        latencies += solver.latencies
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000
+
+# Run in a fresh interpreter: stops the game when it asks for the username,
+# the moment the board is first shown and the window can take clicks.
+STARTUP_SCRIPT = '''
+import sys
+import time
+import turtle
+def first_frame(self, title, prompt):
+    print(time.time())
+    sys.exit(0)
+turtle.TurtleScreen.textinput = first_frame
+import mastermind_game
+mastermind_game.main()
+'''
+
+def bench_startup(runs=3):
+    '''
+    Function that measures the time from starting python to the first
+    interactive frame of the game, it needs a display, e.g. xvfb-run.
+    Parameters: runs -- integer, the best of how many starts.
+    Returns a float, seconds, or None if there is no display.
+    '''
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        return None
+    best = None
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        elapsed = float(output.split()[-1]) - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_leaderboard(n_rows, n_queries=1000, seed=0):
+    '''
+    Function that compacts a leaders log of n_rows wins and times the
+    queries, with up to 10,000 more wins in the active log since.
+    Parameters: n_rows -- integer, wins in the log, one user per 10 wins,
+    n_queries -- integer, queries of each kind, seed -- integer.
+    Returns a dict of seconds, peak bytes of compact and microseconds per query.
+    '''
+    rng = random.Random(seed)
+    n_users = max(1, n_rows // 10)
+    with tempfile.TemporaryDirectory() as directory:
+        board = LeaderBoard(os.path.join(directory, 'leaders.log'))
+        with open(board.path, 'w', encoding='utf-8') as f:
+            for start in range(0, n_rows, 100000):
+                f.write(''.join(format_record(rng.randint(1, 10), f'user{rng.randrange(n_users)}', 0.0)
+                                for _ in range(min(100000, n_rows - start))))
+        board.write_index(board.rebuild_index())
+        tracemalloc.start()
+        start = time.perf_counter()
+        board.compact()
+        compact_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        board.append([(rng.randint(1, 10), f'user{rng.randrange(n_users)}', 0.0)
+                      for _ in range(min(n_rows, 10000))]) # not compacted yet
+        timings = {}
+        queries = {
+            'top': lambda: board.top(5),
+            'personal_best': lambda: board.personal_best(f'user{rng.randrange(n_users)}'),
+            'percentile': lambda: board.percentile(rng.randint(1, 10)),
+        }
+        for name, query in queries.items():
+            start = time.perf_counter()
+            for _ in range(n_queries):
+                query()
+            timings[name] = (time.perf_counter() - start) / n_queries * 1e6
+    return {'compact_seconds': compact_time, 'compact_peak_bytes': peak, 'query_us': timings}
+
+def bench_board_state(n_games=1000, seed=0):
+    '''
+    Function that compares the memory of a game as BoardState with the
+    engine and marbles of the turtle game, and times the binary form.
+    Parameters: n_games -- integer, finished random games to measure,
+    seed -- integer.
+    Returns a dict of bytes per game and microseconds per game.
+    '''
+    from mastermind_game import Marble, Point # imports turtle, not needed elsewhere
+    rng = random.Random(seed)
+    engines = [random_game(rng) for _ in range(n_games)]
+
+    def measure(build):
+        tracemalloc.start()
+        kept = [build(engine) for engine in engines]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return size / n_games
+
+    def turtle_game(engine):
+        game = GameEngine(engine.secret_code)
+        game.history = [(list(guess), bulls, cows) for guess, bulls, cows in engine.history]
+        game.current_guess = list(engine.current_guess)
+        color_marbles = [[Marble(Point(*color_marble_position(row, col)), 'white', 16, None)
+                          for col in range(PEGS)] for row in range(ROWS)]
+        peg_marbles = [[Marble(Point(*peg_position(row, i)), 'white', 4, None)
+                        for i in range(PEGS)] for row in range(ROWS)]
+        buttons = [Marble(Point(*color_button_position(i)), color, 16, None) for i, color in enumerate(colors)]
+        return game, color_marbles, peg_marbles, buttons
+
+    boards = [BoardState.from_engine(engine) for engine in engines]
+    start = time.perf_counter()
+    data = pack_boards(boards)
+    pack_time = time.perf_counter() - start
+    start = time.perf_counter()
+    unpack_boards(data)
+    unpack_time = time.perf_counter() - start
+    return {
+        'turtle_bytes': measure(turtle_game),
+        'board_state_bytes': measure(BoardState.from_engine),
+        'binary_bytes': max(len(board.to_bytes()) for board in boards),
+        'pack_us': pack_time / n_games * 1e6,
+        'unpack_us': unpack_time / n_games * 1e6,
+    }
+
+def bench_marble_draw(n_frames=2000):
+    '''
+    Function that measures Marble.draw and the flush that paints it,
+    every marble of the board changes its look in every frame.
+    Parameters: n_frames -- integer, number of flushes.
+    Returns a float, microseconds per marble drawn and painted.
+    '''
+    from mastermind_game import Marble, Point
+    renderer = BoardRenderer(StubScreen(), new_pen=StubPen)
+    marbles = [Marble(Point(*color_marble_position(row, col)), 'white', 16, renderer)
+               for row in range(ROWS) for col in range(PEGS)]
+    start = time.perf_counter()
+    for frame in range(n_frames):
+        for marble in marbles:
+            marble.color = colors[frame % len(colors)]
+            marble.draw()
+        renderer.flush()
+    return (time.perf_counter() - start) / (n_frames * len(marbles)) * 1e6
+
+def bench_click_latency(n_clicks=500):
+    '''
+    Function that measures how long a click takes to handle, with the
+    worker threads idle and while a hint search runs in one of them,
+    four colors picked then reset, over and over.
+    Parameters: n_clicks -- integer, clicks of each run.
+    Returns a dict, 'idle' and 'searching' -> tuple of floats (median,
+    99th percentile, worst) in milliseconds.
+    '''
+    from mastermind_game import MasterMind
+    def search(cancel_event):
+        while not cancel_event.is_set(): # one hint after another, as long as the clicks go on
+            compute_hint([], cancel_event=cancel_event)
+
+    def clicks(game):
+        points = [game.color_buttons[i].position for i in range(4)] + [game.option_buttons['reset'].position]
+        latencies = []
+        for i in range(n_clicks):
+            point = points[i % len(points)]
+            start = time.perf_counter()
+            game.on_mouse_clicked(point.x, point.y)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        return (latencies[len(latencies) // 2] * 1000, latencies[len(latencies) * 99 // 100] * 1000,
+                latencies[-1] * 1000)
+
+    with tempfile.TemporaryDirectory() as directory, stub_turtle(os.path.join(directory, 'leaders.log')), \
+         contextlib.redirect_stdout(io.StringIO()): # the game prints its secret
+        game = MasterMind()
+        result = {'idle': clicks(game)}
+        task = game.tasks.submit('search', search, replace=False)
+        result['searching'] = clicks(game)
+        task.cancel()
+        game.tasks.shutdown()
+    return result
+
+def bench_hit_test(n_targets, n_clicks=20000, seed=0):
+    '''
+    Function that compares finding the marble under a click in the hit
+    grid with scanning every marble, as clicks were dispatched before,
+    on a square board of marbles as close as the color buttons.
+    Parameters: n_targets -- integer, marbles on the board,
+    n_clicks -- integer, random clicks over the board,
+    seed -- integer, seed of the clicks.
+    Returns a tuple of floats (grid, scan), nanoseconds per click.
+    '''
+    from mastermind_game import Marble, Point
+    side = math.ceil(math.sqrt(n_targets))
+    marbles = [Marble(Point(i % side * 40, i // side * 40), 'white', 16, None) for i in range(n_targets)]
+    grid = HitGrid()
+    for i, marble in enumerate(marbles):
+        grid.add(i, marble_box(marble))
+    rng = random.Random(seed)
+    clicks = [(rng.uniform(-40, side * 40), rng.uniform(-40, side * 40)) for _ in range(n_clicks)]
+    start = time.perf_counter()
+    for x, y in clicks:
+        grid.hit(x, y)
+    grid_time = time.perf_counter() - start
+    scan_clicks = clicks[:max(100, n_clicks * 10 // n_targets)] # a scan of a large board is slow
+    start = time.perf_counter()
+    for x, y in scan_clicks:
+        next((i for i, marble in enumerate(marbles) if marble.clicked_in_region(x, y)), None)
+    scan_time = time.perf_counter() - start
+    return grid_time / len(clicks) * 1e9, scan_time / len(scan_clicks) * 1e9
+
+def bench_snapshot(n_boards=500, seed=0):
+    '''
+    Function that measures drawing finished games without Tk, as SVG
+    and as PNG thumbnails.
+    Parameters: n_boards -- integer, random games drawn,
+    seed -- integer, seed of the games.
+    Returns a tuple of floats (svg, png), boards per second.
+    '''
+    from snapshot import render_svg, render_png
+    rng = random.Random(seed)
+    boards = [BoardState.from_engine(random_game(rng)) for _ in range(n_boards)]
+    rates = []
+    for render in (render_svg, lambda board: render_png(board, 0.25)):
+        render(boards[0]) # the static board is drawn once
+        start = time.perf_counter()
+        for board in boards:
+            render(board)
+        rates.append(n_boards / (time.perf_counter() - start))
+    return tuple(rates)
+
+def bench_codes_remaining(n_colors=8, n_pegs=6, rounds=8, n_games=5, seed=0):
+    '''
+    Function that measures the count of codes still possible kept from
+    round to round, against filtering every code by the whole history
+    each round, in a large variant with repeated colors.
+    Parameters: n_colors, n_pegs -- integers, the variant,
+    rounds -- integer, random guesses per game,
+    n_games -- integer, seed -- integer, seed of the secrets and guesses.
+    Returns a list per round of tuples (mean codes before the round,
+    incremental ms, from scratch ms).
+    '''
+    palette = (colors + [f'color{i}' for i in range(len(colors), n_colors)])[:n_colors]
+    config = GameConfig(palette, n_pegs, rounds, True)
+    CandidateSet(config) # the columns of the variant are built once
+    rng = random.Random(seed)
+    totals = [[0, 0.0, 0.0] for _ in range(rounds)]
+    for _ in range(n_games):
+        secret_code = [rng.choice(palette) for _ in range(n_pegs)]
+        candidates = CandidateSet(config)
+        history = []
+        for round_ in range(rounds):
+            guess = [rng.choice(palette) for _ in range(n_pegs)]
+            history.append((guess, *count_bulls_and_cows(secret_code, guess)))
+            totals[round_][0] += len(candidates)
+            start = time.perf_counter()
+            candidates.filter(*history[-1])
+            totals[round_][1] += time.perf_counter() - start
+            start = time.perf_counter()
+            scratch = CandidateSet(config)
+            for row in history:
+                scratch.filter(*row)
+            totals[round_][2] += time.perf_counter() - start
+    return [(codes / n_games, incremental / n_games * 1000, scratch / n_games * 1000)
+            for codes, incremental, scratch in totals]
+
+def bench_board_construction(runs=20):
+    '''
+    Function that measures building the whole board of the game with
+    a stubbed turtle, from the constructor to the main loop.
+    Parameters: runs -- integer, number of boards built.
+    Returns a float, milliseconds per board.
+    '''
+    from mastermind_game import MasterMind
+    with tempfile.TemporaryDirectory() as directory, stub_turtle(os.path.join(directory, 'leaders.log')), \
+         contextlib.redirect_stdout(io.StringIO()): # the game prints its secret
+        start = time.perf_counter()
+        for _ in range(runs):
+            MasterMind()
+        return (time.perf_counter() - start) / runs * 1000
+
+def bench_leaders_io(n_rows, n_calls=200, seed=0):
+    '''
+    Function that measures read_leaders and write_leaders of the game
+    on a leaders log of n_rows wins.
+    Parameters: n_rows -- integer, n_calls -- integer, calls of each,
+    seed -- integer.
+    Returns a tuple of floats, microseconds per read and per write.
+    '''
+    from mastermind_game import read_leaders, write_leaders
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'leaders.log')
+        board = LeaderBoard(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(''.join(format_record(rng.randint(1, 10), f'user{rng.randrange(1000)}', 0.0)
+                            for _ in range(n_rows)))
+        board.write_index(board.rebuild_index())
+        with stub_turtle(path):
+            start = time.perf_counter()
+            for _ in range(n_calls):
+                read_leaders()
+            read_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(n_calls):
+                write_leaders([(rng.randint(1, 10), 'bench')])
+            write_time = time.perf_counter() - start
+    return read_time / n_calls * 1e6, write_time / n_calls * 1e6
+
+# Run in a fresh interpreter: the cold import of the game, then its board
+# built with a stubbed turtle, so it needs no display.
+COLD_START_SCRIPT = '''
+import time
+start = time.perf_counter()
+import mastermind_game
+imported = time.perf_counter()
+import benchmark
+benchmark.bench_board_construction(runs=1)
+print(imported - start, time.perf_counter() - start)
+'''
+
+def bench_cold_start(runs=3):
+    '''
+    Function that measures the cold import of the game and the time to
+    its first frame in a fresh interpreter, with a stubbed turtle.
+    Parameters: runs -- integer, the best of how many starts.
+    Returns a tuple of floats, seconds to import and to the first frame.
+    '''
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        results.append(tuple(float(value) for value in output.split()[-2:]))
+    return min(result[0] for result in results), min(result[1] for result in results)
+
+def run_suite(leaders_rows=(1000, 10000, 100000), repeats=3):
+    '''
+    Function that runs the benchmarks the suite compares against a baseline,
+    each the best of a few runs.
+    Parameters: leaders_rows -- integers, sizes of the leaders logs,
+    repeats -- integer, runs of each benchmark.
+    Returns a dict, name -> {'value', 'unit', 'higher_is_better'}.
+    '''
+    def best(higher_is_better, unit, measure):
+        values = [measure() for _ in range(repeats)]
+        return {'value': max(values) if higher_is_better else min(values), 'unit': unit,
+                'higher_is_better': higher_is_better}
+
+    metrics = {
+        'scoring_scalar': best(True, 'pairs/sec', lambda: bench_batch_scoring(100000)[0]),
+        'scoring_batch': best(True, 'pairs/sec', lambda: bench_batch_scoring(100000)[1]),
+        'engine_games': best(True, 'games/sec', lambda: bench_engine_games(5000)),
+        'marble_draw': best(False, 'us/marble', lambda: bench_marble_draw(500)),
+        'board_construction': best(False, 'ms', bench_board_construction),
+        'hit_test_10': best(False, 'ns/click', lambda: bench_hit_test(10)[0]),
+        'hit_test_10000': best(False, 'ns/click', lambda: bench_hit_test(10000)[0]),
+        'click_p99_searching': best(False, 'ms', lambda: bench_click_latency()['searching'][1]),
+        'snapshot_svg': best(True, 'boards/sec', lambda: bench_snapshot()[0]),
+        'codes_remaining_game': best(False, 'ms', lambda: sum(ms for _, ms, _ in bench_codes_remaining(n_games=2))),
+        'snapshot_png_thumbnail': best(True, 'boards/sec', lambda: bench_snapshot()[1]),
+    }
+    for n_rows in leaders_rows:
+        io = [bench_leaders_io(n_rows) for _ in range(repeats)]
+        metrics[f'read_leaders_{n_rows}'] = {'value': min(read for read, _ in io), 'unit': 'us',
+                                             'higher_is_better': False}
+        metrics[f'write_leaders_{n_rows}'] = {'value': min(write for _, write in io), 'unit': 'us',
+                                              'higher_is_better': False}
+    import_time, start_time = bench_cold_start(repeats)
+    metrics['cold_import'] = {'value': import_time * 1000, 'unit': 'ms', 'higher_is_better': False}
+    metrics['cold_start'] = {'value': start_time * 1000, 'unit': 'ms', 'higher_is_better': False}
+    startup = bench_startup(repeats)
+    if startup is not None:
+        metrics['startup_display'] = {'value': startup * 1000, 'unit': 'ms', 'higher_is_better': False}
+    return metrics
+
+def compare(metrics, baseline, threshold=0.25):
+    '''
+    Function that finds the benchmarks slower than the baseline by more than the threshold.
+    Parameters: metrics, baseline -- dicts returned by run_suite,
+    threshold -- float, 0.25 allows 25% slower.
+    Returns a list of tuples (name, baseline value, value, change), the
+    change as a fraction of the baseline, worse is positive.
+    '''
+    regressions = []
+    for name, metric in metrics.items():
+        if name not in baseline:
+            continue # new benchmark, nothing to compare with
+        old = baseline[name]['value']
+        change = (metric['value'] - old) / old
+        if metric['higher_is_better']:
+            change = -change
+        if change > threshold:
+            regressions.append((name, old, metric['value'], change))
+    return regressions
+
+def main_suite(args):
+    baseline = None
+    if not args.save_baseline:
+        if not os.path.exists(args.baseline):
+            print(f'no baseline at {args.baseline}, run the suite on this machine with --save-baseline first',
+                  file=sys.stderr)
+            return 2 # a run with nothing to compare with would never catch a regression
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['metrics']
+    metrics = run_suite(args.suite_leaders_rows)
+    result = {'python': platform.python_version(), 'machine': platform.machine(), 'when': time.time(),
+              'metrics': metrics}
+    for name, metric in metrics.items():
+        line = f"{name:<22} {metric['value']:>14,.2f} {metric['unit']}"
+        if baseline and name in baseline:
+            line += f"  (baseline {baseline[name]['value']:,.2f})"
+        print(line)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f'baseline saved to {args.baseline}')
+        return 0
+    regressions = compare(metrics, baseline, args.threshold)
+    for name, old, new, change in regressions:
+        print(f'REGRESSION {name}: {old:,.2f} -> {new:,.2f}, {change:.0%} worse')
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description='MasterMind benchmarks')
+    parser.add_argument('--games', type=int, default=20000)
+    parser.add_argument('--max-pairs', type=int, default=10 ** 7,
+                        help='largest batch of the scoring benchmark')
+    parser.add_argument('--leaderboard-rows', type=int, nargs='*', default=[10 ** 6],
+                        help='sizes of the leaders logs to compact and query, e.g. 1000000 10000000')
+    parser.add_argument('--suite', action='store_true',
+                        help='run the regression suite instead and compare it with the baseline')
+    parser.add_argument('--suite-leaders-rows', type=int, nargs='*', default=[1000, 10000, 100000],
+                        help='sizes of the leaders logs read and written by the suite')
+    parser.add_argument('--json', help='write the results of the suite to this file')
+    parser.add_argument('--baseline', default='benchmark_baseline.json',
+                        help='results to compare with, the suite fails if there are none')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fail when a benchmark is this much worse than the baseline, 0.25 is 25%%')
+    args = parser.parse_args()
+    if args.suite:
+        sys.exit(main_suite(args))
+    startup = bench_startup()
+    if startup is None:
+        print('startup: skipped, no display (run under xvfb-run)')
+    else:
+        print(f'startup: {startup * 1000:.0f} ms to the first interactive frame')
+    print(f'engine: {bench_engine_games(args.games):,.0f} games/sec')
+    for method in (MINIMAX, EXPECTED_SIZE):
+        median, worst = bench_solver_latency(method)
+        print(f'solver {method}: median {median:.2f} ms, worst {worst:.2f} ms per hint')
+    n_pairs = 1000
+    while n_pairs <= args.max_pairs:
+        scalar_rate, batch_rate = bench_batch_scoring(n_pairs)
+        print(f'scoring {n_pairs:>10,} pairs: scalar {scalar_rate:,.0f}/sec, '
+              f'batch {batch_rate:,.0f}/sec, speedup {batch_rate / scalar_rate:.1f}x')
+        n_pairs *= 10
+    result = bench_board_state()
+    print(f"board state: {result['turtle_bytes']:,.0f} bytes per game as engine and marbles, "
+          f"{result['board_state_bytes']:,.0f} as BoardState, at most {result['binary_bytes']} packed; "
+          f"pack {result['pack_us']:.1f} us, unpack {result['unpack_us']:.1f} us per game")
+    for n_targets in (10, 100, 1000, 10000, 100000):
+        grid, scan = bench_hit_test(n_targets)
+        print(f'click dispatch {n_targets:>7,} targets: grid {grid:,.0f} ns, scan {scan:,.0f} ns per click')
+    for name, (median, p99, worst) in bench_click_latency().items():
+        print(f'click latency, {name}: median {median:.3f} ms, p99 {p99:.3f} ms, worst {worst:.3f} ms')
+    print(f'codes remaining, 8 colors 6 pegs with repeats: {"round":>5} {"codes":>9} {"kept ms":>8} {"redone ms":>10}')
+    for round_, (codes, incremental, scratch) in enumerate(bench_codes_remaining(), 1):
+        print(f'{"":47}{round_:>5} {codes:>9,.0f} {incremental:>8.3f} {scratch:>10.3f}')
+    svg_rate, png_rate = bench_snapshot()
+    print(f'snapshot: {svg_rate:,.0f} SVG boards/sec, {png_rate:,.0f} PNG thumbnails/sec')
+    for n_rows in args.leaderboard_rows:
+        result = bench_leaderboard(n_rows)
+        queries = ', '.join(f'{name} {us:.0f} us' for name, us in result['query_us'].items())
+        print(f"leaderboard {n_rows:,} wins: compact {result['compact_seconds']:.1f} s, "
+              f"peak {result['compact_peak_bytes'] / 2 ** 20:.1f} MiB; {queries}")
+
+if __name__ == "__main__":
+    main()
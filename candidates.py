@@ -0,0 +1,98 @@
+import numpy as np
+from game_engine import DEFAULT_CONFIG
+from scoring import code_space
+
+_code_arrays = {} # (palette, length, repeats) -> (digits, color_counts)
+
+def code_arrays(config):
+    '''
+    Function that builds, once per variant, the columns the filter reads.
+    Parameters: config -- GameConfig, the variant.
+    Returns two numpy arrays of bytes: digits[peg, code] is the color index
+    of a peg, color_counts[color, code] how often the code uses a color.
+    '''
+    key = (tuple(config.palette), config.code_length, config.allow_repeats)
+    if key not in _code_arrays:
+        codes = code_space(config.palette, config.code_length, config.allow_repeats)
+        digits = np.ascontiguousarray(codes.T)
+        color_counts = np.zeros((len(config.palette), len(codes)), dtype=np.uint8)
+        for row in digits:
+            for color in range(len(config.palette)):
+                color_counts[color] += row == color
+        _code_arrays[key] = (digits, color_counts)
+    return _code_arrays[key]
+
+class CandidateSet:
+    '''
+    Class: CandidateSet
+    Attributes: config, survivors
+    Methods: filter, first, codes.
+    The codes still consistent with every peg so far, kept as an array
+    of code indexes, see scoring.code_space, so a million codes take
+    four megabytes and are filtered in milliseconds.
+    '''
+    def __init__(self, config=DEFAULT_CONFIG, survivors=None):
+        '''
+        Constructor: Create a new instance of a candidate set,
+        Parameters:
+        self -- the current object,
+        config -- GameConfig, the variant of the game,
+        survivors -- numpy array of code indexes to start from, every code if None.
+        '''
+        self.config = config
+        self.digits, self.color_counts = code_arrays(config)
+        if survivors is None:
+            survivors = np.arange(self.digits.shape[1], dtype=np.int32)
+        self.survivors = survivors
+
+    def __len__(self):
+        return len(self.survivors)
+
+    def filter(self, guess, bulls, cows):
+        '''
+        Method: keep only the codes that would give these pegs to the guess,
+        only the survivors are scored, so each round gets cheaper
+        Parameters:
+        self -- the current candidate set,
+        guess -- list of color strings,
+        bulls, cows -- integers, the pegs of the guess,
+        returns None.
+        '''
+        guess = [self.config.palette.index(color) for color in guess]
+        everything = len(self.survivors) == self.digits.shape[1]
+        def column(array, row): # no gather while every code survives
+            return array[row] if everything else array[row][self.survivors]
+        matched = np.zeros(len(self.survivors), dtype=np.uint8)
+        for peg, color in enumerate(guess):
+            matched += column(self.digits, peg) == color
+        keep = matched == bulls
+        common = np.zeros(len(self.survivors), dtype=np.uint8)
+        for color in set(guess):
+            common += np.minimum(column(self.color_counts, color), guess.count(color))
+        keep &= common == bulls + cows
+        self.survivors = self.survivors[keep]
+
+    def code(self, index):
+        '''
+        Method: the colors of a code
+        Parameters: self -- the current candidate set, index -- integer, a code index,
+        returns a list of color strings.
+        '''
+        return [self.config.palette[c] for c in self.digits[:, index]]
+
+    def first(self):
+        '''
+        Method: the first code still consistent
+        Parameters: self -- the current candidate set,
+        returns a list of color strings.
+        '''
+        return self.code(self.survivors[0])
+
+    def codes(self):
+        '''
+        Method: every code still consistent, in code index order
+        Parameters: self -- the current candidate set,
+        returns a generator of lists of color strings.
+        '''
+        for index in self.survivors:
+            yield self.code(index)
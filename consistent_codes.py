@@ -0,0 +1,290 @@
+import argparse
+import collections
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from game_engine import DEFAULT_CONFIG
+from candidates import CandidateSet, code_arrays
+from feedback_table import MAX_TABLE_CODES, encode_feedback
+from scoring import code_index
+from solver import Solver, MINIMAX, EXPECTED_SIZE
+
+MAX_ENTRIES = 4096 # histories kept in memory
+MAX_BYTES = 64 * 2 ** 20 # bytes of candidate arrays kept in memory
+NO_GUESS = -1
+
+class ConsistentCodes:
+    '''
+    Class: ConsistentCodes
+    Attributes: config, method, max_entries, max_bytes, entries, bytes,
+    hits, prefix_hits, misses, evictions
+    Methods: fingerprint, candidates, codes, best_guess, stats, save, load.
+    The codes still consistent with a feedback history, and the best next
+    guess by partition size, remembered across games. A history is known
+    by the set of its (guess, feedback) rows, so the same rows in another
+    order share an entry, and a new history starts from its longest
+    remembered prefix. The least recently used entries are dropped first.
+    '''
+    def __init__(self, config=DEFAULT_CONFIG, method=MINIMAX, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        '''
+        Constructor: Create a new instance of an empty memo,
+        Parameters:
+        self -- the current object,
+        config -- GameConfig, the variant of the game,
+        method -- string, MINIMAX or EXPECTED_SIZE, how guesses are ranked,
+        max_entries -- integer, histories kept,
+        max_bytes -- integer, bytes of candidates kept.
+        '''
+        self.config = config
+        self.method = method
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict() # fingerprint -> [candidates, guess], oldest first
+        self.bytes = 0
+        self.hits = self.prefix_hits = self.misses = self.evictions = 0
+        self.n_codes = code_arrays(config)[0].shape[1]
+        self.root = [np.arange(self.n_codes, dtype=np.int32), NO_GUESS] # the empty history, never dropped
+        self.root[0].flags.writeable = False
+        self.solver = None # ranks guesses with the feedback table, made on first use
+
+    def fingerprint(self, history):
+        '''
+        Method: the key of a history, the same for its rows in any order
+        Parameters: self -- the current memo,
+        history -- list of (guess, bulls, cows),
+        returns a tuple of (guess code index, feedback) pairs.
+        '''
+        length = self.config.code_length
+        return tuple(sorted({(code_index(guess, self.config.palette, self.config.allow_repeats),
+                              encode_feedback(bulls, cows, length)) for guess, bulls, cows in history}))
+
+    def entry(self, history):
+        '''
+        Method: the entry of a history, filtered from its longest
+        remembered prefix if it is new, each prefix is remembered too
+        Parameters: self -- the current memo,
+        history -- list of (guess, bulls, cows),
+        returns a list [candidates, guess], guess is NO_GUESS until ranked.
+        '''
+        if not history:
+            return self.root
+        keys = [self.fingerprint(history[:n]) for n in range(len(history) + 1)]
+        if keys[-1] in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(keys[-1])
+            return self.entries[keys[-1]]
+        self.misses += 1
+        start = len(history) - 1
+        while start > 0 and keys[start] not in self.entries:
+            start -= 1
+        if start > 0:
+            self.prefix_hits += 1
+            self.entries.move_to_end(keys[start])
+            survivors = self.entries[keys[start]][0]
+        else:
+            survivors = self.root[0]
+        for n in range(start, len(history)):
+            candidates = CandidateSet(self.config, survivors)
+            candidates.filter(*history[n])
+            survivors = candidates.survivors
+            survivors.flags.writeable = False # shared by every caller
+            if keys[n + 1] not in self.entries:
+                self.remember(keys[n + 1], [survivors, NO_GUESS])
+        return self.entries[keys[-1]]
+
+    def remember(self, key, entry):
+        '''
+        Method: add an entry and drop the least recently used ones over the limits
+        Parameters: self -- the current memo, key -- a fingerprint,
+        entry -- list [candidates, guess],
+        returns None.
+        '''
+        self.entries[key] = entry
+        self.bytes += entry[0].nbytes
+        while len(self.entries) > self.max_entries or (self.bytes > self.max_bytes and len(self.entries) > 1):
+            _, (candidates, _) = self.entries.popitem(last=False)
+            self.bytes -= candidates.nbytes
+            self.evictions += 1
+
+    def candidates(self, history):
+        '''
+        Method: the codes still consistent with every row of a history
+        Parameters: self -- the current memo,
+        history -- list of (guess, bulls, cows),
+        returns a read-only numpy array of code indexes.
+        '''
+        return self.entry(history)[0]
+
+    def codes(self, history):
+        '''
+        Method: the colors of the codes still consistent
+        Parameters: self -- the current memo,
+        history -- list of (guess, bulls, cows),
+        returns a list of lists of color strings.
+        '''
+        digits = code_arrays(self.config)[0]
+        return [[self.config.palette[c] for c in digits[:, index]] for index in self.candidates(history)]
+
+    def best_guess(self, history):
+        '''
+        Method: the guess whose worst (or expected) partition of the
+        candidates is the smallest, as the hint solver ranks it; variants
+        too large for a feedback table guess the first candidate
+        Parameters: self -- the current memo,
+        history -- list of (guess, bulls, cows),
+        returns a list of color strings, None if no code is consistent
+        with the history.
+        '''
+        entry = self.entry(history)
+        if not len(entry[0]):
+            return None # the rows contradict each other
+        if entry[1] == NO_GUESS:
+            if self.n_codes > MAX_TABLE_CODES:
+                entry[1] = int(entry[0][0])
+            else:
+                if self.solver is None:
+                    self.solver = Solver(self.config, self.method)
+                self.solver.candidates = entry[0]
+                entry[1] = self.solver.best_guess()
+        return [self.config.palette[c] for c in code_arrays(self.config)[0][:, entry[1]]]
+
+    def stats(self):
+        '''
+        Method: how well the memo works
+        Parameters: self -- the current memo,
+        returns a dict of counts and the hit rate.
+        '''
+        lookups = self.hits + self.misses
+        return {'entries': len(self.entries), 'bytes': self.bytes, 'hits': self.hits,
+                'prefix_hits': self.prefix_hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def variant(self):
+        '''
+        Method: what a saved memo must have been made for
+        Parameters: self -- the current memo,
+        returns a string.
+        '''
+        return json.dumps([self.config.palette, self.config.code_length, self.config.allow_repeats, self.method])
+
+    def save(self, path):
+        '''
+        Method: write the entries to a file, replaced in one step, to warm up the next run
+        Parameters: self -- the current memo, path -- string,
+        returns None.
+        '''
+        keys = list(self.entries)
+        values = list(self.entries.values())
+        arrays = {
+            'variant': np.array(self.variant()),
+            'key_sizes': np.array([len(key) for key in keys], dtype=np.int32),
+            'keys': np.array([pair for key in keys for pair in key], dtype=np.int32).reshape(-1, 2),
+            'candidate_sizes': np.array([len(candidates) for candidates, _ in values], dtype=np.int32),
+            'candidates': np.concatenate([candidates for candidates, _ in values] or [np.zeros(0, np.int32)]),
+            'guesses': np.array([guess for _, guess in values], dtype=np.int32),
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        '''
+        Method: add the entries of a file written by save, oldest first
+        Parameters: self -- the current memo, path -- string,
+        returns integer, the entries read; raises ValueError for another variant.
+        '''
+        with np.load(path) as data:
+            if str(data['variant']) != self.variant():
+                raise ValueError(f'{path} was saved for another variant')
+            key_ends = np.cumsum(data['key_sizes']).tolist()
+            candidate_ends = np.cumsum(data['candidate_sizes']).tolist()
+            keys = [tuple(map(tuple, pairs.tolist())) for pairs in np.split(data['keys'], key_ends[:-1])] \
+                if key_ends else []
+            candidates = np.split(data['candidates'], candidate_ends[:-1]) if candidate_ends else []
+            for key, survivors, guess in zip(keys, candidates, data['guesses'].tolist()):
+                if key not in self.entries:
+                    survivors.flags.writeable = False
+                    self.remember(key, [survivors, guess])
+        return len(keys)
+
+_memos = {}
+
+def shared_memo(config=DEFAULT_CONFIG, method=MINIMAX):
+    '''
+    Function that returns the memo every game of a process shares,
+    one per variant and method.
+    Parameters: config -- GameConfig, method -- string, MINIMAX or EXPECTED_SIZE.
+    Returns ConsistentCodes.
+    '''
+    key = (config, method)
+    if key not in _memos:
+        _memos[key] = ConsistentCodes(config, method)
+    return _memos[key]
+
+def parse_row(text, config=DEFAULT_CONFIG):
+    '''
+    Function that reads a row of a history written as colors:bulls:cows,
+    e.g. red,blue,green,yellow:1:2.
+    Parameters: text -- string, config -- GameConfig.
+    Returns a tuple (list of color strings, bulls, cows); raises
+    ValueError for a bad row.
+    '''
+    try:
+        guess, bulls, cows = text.split(':')
+        bulls, cows = int(bulls), int(cows)
+    except ValueError:
+        raise ValueError(f'bad row {text!r}, expected colors:bulls:cows') from None
+    guess = guess.split(',')
+    if len(guess) != config.code_length or any(color not in config.palette for color in guess):
+        raise ValueError(f'bad guess {text!r}')
+    if bulls < 0 or cows < 0 or bulls + cows > config.code_length:
+        raise ValueError(f'bad pegs {text!r}, bulls and cows add up to at most {config.code_length}')
+    return guess, bulls, cows
+
+def main():
+    parser = argparse.ArgumentParser(description='Codes consistent with a feedback history, and the best next guess')
+    parser.add_argument('rows', nargs='*', help='one history, rows as colors:bulls:cows, e.g. red,blue,green,yellow:1:2')
+    parser.add_argument('--file', help='many histories, one JSON list of [guess, bulls, cows] per line, - for stdin')
+    parser.add_argument('--method', choices=[MINIMAX, EXPECTED_SIZE], default=MINIMAX)
+    parser.add_argument('--cache', help='file to warm the memo from and save it to')
+    parser.add_argument('--max-entries', type=int, default=MAX_ENTRIES)
+    parser.add_argument('--show', type=int, default=10, help='codes to print of a single history')
+    args = parser.parse_args()
+    memo = ConsistentCodes(method=args.method, max_entries=args.max_entries)
+    if args.cache and os.path.exists(args.cache):
+        memo.load(args.cache)
+    if args.file:
+        f = sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')
+        start = time.perf_counter()
+        histories = 0
+        with f:
+            for line in f:
+                if line.strip():
+                    memo.best_guess([tuple(row) for row in json.loads(line)])
+                    histories += 1
+        elapsed = time.perf_counter() - start
+        print(f'{histories:,} histories in {elapsed:.2f} s, {histories / elapsed if elapsed else 0:,.0f}/sec')
+    else:
+        try:
+            history = [parse_row(row) for row in args.rows]
+        except ValueError as error:
+            parser.error(str(error))
+        guess = memo.best_guess(history)
+        if guess is None:
+            print('no code is consistent with these rows')
+        else:
+            print(f'{len(memo.candidates(history))} codes left, best guess: {" ".join(guess)}')
+            for code in memo.codes(history)[:args.show]:
+                print('  ' + ' '.join(code))
+    print('memo: ' + ', '.join(f'{name} {value:.2f}' if isinstance(value, float) else f'{name} {value}'
+                              for name, value in memo.stats().items()))
+    if args.cache:
+        memo.save(args.cache)
+
+if __name__ == "__main__":
+    main()
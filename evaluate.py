@@ -0,0 +1,113 @@
+import argparse
+import collections
+import concurrent.futures
+import os
+import time
+from game_engine import GameConfig, DEFAULT_CONFIG, CODE_LENGTH, NUM_ROUNDS, colors, count_bulls_and_cows
+from scoring import code_space
+from strategies import load_strategy, STRATEGIES
+
+MAX_GUESSES = 50 # a strategy that needs more is considered stuck
+
+def play(strategy, secret_code):
+    '''
+    Function that lets a strategy play one game against a secret,
+    it may go on after the last round so the worst case is known.
+    Parameters: strategy -- a new Strategy, secret_code -- list of color strings.
+    Returns an integer, the number of guesses it took to win.
+    '''
+    for guesses in range(1, MAX_GUESSES + 1):
+        guess = strategy.next_guess()
+        bulls, cows = count_bulls_and_cows(secret_code, guess)
+        if bulls == len(secret_code):
+            return guesses
+        strategy.observe(guess, bulls, cows)
+    raise RuntimeError(f'strategy did not find {secret_code} in {MAX_GUESSES} guesses')
+
+def evaluate_shard(strategy_name, config, start, stop):
+    '''
+    Function that plays a strategy against a slice of the code space,
+    it runs in the worker processes.
+    Parameters: strategy_name -- string, see load_strategy,
+    config -- GameConfig, the variant of the game,
+    start, stop -- integers, the code indexes of the slice.
+    Returns a collections.Counter of guesses per game.
+    '''
+    strategy_class = load_strategy(strategy_name)
+    histogram = collections.Counter()
+    codes = code_space(config.palette, config.code_length, config.allow_repeats)
+    for code in codes[start:stop].tolist():
+        secret_code = [config.palette[c] for c in code]
+        histogram[play(strategy_class(config), secret_code)] += 1
+    return histogram
+
+def evaluate(strategy_name, config=DEFAULT_CONFIG, workers=None):
+    '''
+    Function that plays a strategy against every possible secret.
+    Parameters: strategy_name -- string, see load_strategy,
+    config -- GameConfig, the variant of the game,
+    workers -- integer, processes to shard the secrets over,
+               0 plays them all in this process.
+    Returns a dict with the histogram, mean, worst, losses (games over
+    config.rounds guesses), games and wall time.
+    '''
+    start_time = time.perf_counter()
+    n_codes = config.code_count()
+    histogram = collections.Counter()
+    if workers == 0:
+        histogram += evaluate_shard(strategy_name, config, 0, n_codes)
+    else:
+        workers = workers or os.cpu_count()
+        n_shards = workers * 4 # small shards keep every worker busy to the end
+        bounds = [n_codes * i // n_shards for i in range(n_shards + 1)]
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(evaluate_shard, strategy_name, config, a, b)
+                       for a, b in zip(bounds, bounds[1:]) if a < b]
+            for future in concurrent.futures.as_completed(futures):
+                histogram += future.result()
+    games = sum(histogram.values())
+    return {
+        'strategy': strategy_name,
+        'games': games,
+        'histogram': dict(sorted(histogram.items())),
+        'mean': sum(k * v for k, v in histogram.items()) / games,
+        'worst': max(histogram),
+        'losses': sum(v for k, v in histogram.items() if k > config.rounds),
+        'wall_time': time.perf_counter() - start_time,
+    }
+
+def print_report(result, label):
+    '''
+    Function that prints the result of evaluate.
+    Parameters: result -- dict returned by evaluate, label -- string, how it ran.
+    Returns None.
+    '''
+    print(f"{label}: {result['strategy']} over {result['games']} secrets in {result['wall_time']:.2f} s")
+    print(f"  mean {result['mean']:.3f} guesses, worst {result['worst']}, lost {result['losses']}")
+    for guesses, count in result['histogram'].items():
+        print(f'  {guesses:>2} guesses: {count}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Grade a guessing strategy against every secret')
+    parser.add_argument('--strategy', default='consistent',
+                        help=f'one of {sorted(STRATEGIES)} or module:Class')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='processes to use, 0 to play in this process')
+    parser.add_argument('--serial', action='store_true',
+                        help='also run in this process and report the speedup')
+    parser.add_argument('--colors', type=int, default=len(colors), help='size of the palette')
+    parser.add_argument('--pegs', type=int, default=CODE_LENGTH, help='length of the code')
+    parser.add_argument('--rounds', type=int, default=NUM_ROUNDS, help='guesses before a game is lost')
+    parser.add_argument('--repeats', action='store_true', help='allow repeated colors')
+    args = parser.parse_args()
+    palette = (colors + [f'color{i}' for i in range(len(colors), args.colors)])[:args.colors]
+    config = GameConfig(palette, args.pegs, args.rounds, args.repeats)
+    result = evaluate(args.strategy, config, args.workers)
+    print_report(result, f'{args.workers} workers')
+    if args.serial:
+        serial = evaluate(args.strategy, config, 0)
+        print_report(serial, 'serial')
+        print(f"speedup {serial['wall_time'] / result['wall_time']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from game_engine import CODE_LENGTH, colors
+from scoring import code_space, count_bulls_and_cows_batch
+
+TABLE_VERSION = 1
+TABLE_DIR = os.environ.get('MASTERMIND_TABLE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feedback_tables'))
+# The table holds one byte per (secret, guess) pair, so it grows with the
+# square of the code space: 4096 codes is 16 MiB, 16384 codes is 256 MiB.
+# 8 colors x 5 pegs fits (6720 codes), but not with repeats (32768 codes):
+# such variants score with count_bulls_and_cows_batch or candidates.py.
+MAX_TABLE_CODES = 16384
+
+def encode_feedback(bulls, cows, length=CODE_LENGTH):
+    '''
+    Function that packs a score into one byte of the table.
+    Parameters: bulls, cows -- integers or arrays, length -- the number of pegs.
+    Returns the packed feedback, bulls * (length + 1) + cows.
+    '''
+    return bulls * (length + 1) + cows
+
+def decode_feedback(feedback, length=CODE_LENGTH):
+    '''
+    Function that unpacks a byte of the table.
+    Parameters: feedback -- integer, length -- the number of pegs.
+    Returns integers, the counts of bulls and cows.
+    '''
+    return divmod(int(feedback), length + 1)
+
+class FeedbackTable:
+    '''
+    Class: FeedbackTable
+    Attributes: palette, length, path, codes
+    Methods: table, lookup, generate.
+    The bulls and cows of every (secret, guess) pair of a code space, kept
+    in a file and memory-mapped, so every process shares the same pages.
+    '''
+    def __init__(self, palette=colors, length=CODE_LENGTH, repeats=False, directory=None):
+        '''
+        Constructor: Create a new instance of a feedback table, nothing is
+        generated or read until the table is first used,
+        Parameters:
+        self -- the current object,
+        palette -- list of strings, the colors,
+        length -- integer, the number of pegs,
+        repeats -- Boolean, True if a color may be used more than once,
+        directory -- string, where the table files are kept.
+        '''
+        self.palette = list(palette)
+        self.length = length
+        self.repeats = repeats
+        self.codes = code_space(self.palette, length, repeats)
+        if len(self.codes) > MAX_TABLE_CODES:
+            raise ValueError(f'{len(self.codes)} codes is over the table limit of {MAX_TABLE_CODES}')
+        key = json.dumps([TABLE_VERSION, self.palette, length, repeats]) # new colors, new file
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        self.path = os.path.join(directory or TABLE_DIR, f'feedback-{digest}.npy')
+        self._table = None
+
+    @property
+    def table(self):
+        '''
+        Method: the table of packed feedback, indexed [secret, guess],
+        generated on first use if its file does not exist yet,
+        Parameters: self -- the current table,
+        returns a read-only numpy memmap of bytes.
+        '''
+        if self._table is None:
+            if not os.path.exists(self.path):
+                self.generate()
+            self._table = np.load(self.path, mmap_mode='r')
+        return self._table
+
+    def generate(self):
+        '''
+        Method: score the whole code space and write it to the table file,
+        the file is replaced in one step so readers never see half of it,
+        Parameters: self -- the current table,
+        returns None.
+        '''
+        n = len(self.codes)
+        table = np.empty((n, n), dtype=np.uint8)
+        rows = max(1, 2 ** 20 // n) # about a million pairs per batch
+        for start in range(0, n, rows):
+            secrets = self.codes[start:start + rows, None, :]
+            bulls, cows = count_bulls_and_cows_batch(secrets, self.codes[None, :, :])
+            table[start:start + rows] = encode_feedback(bulls, cows, self.length)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, table)
+        os.replace(temp_path, self.path)
+
+    def lookup(self, secret_index, guess_index):
+        '''
+        Method: score a guess against a secret by their code indexes
+        Parameters:
+        self -- the current table,
+        secret_index, guess_index -- integers, rows of the code space,
+        returns integers, the counts of bulls and cows.
+        '''
+        return decode_feedback(self.table[secret_index, guess_index], self.length)
+
+_tables = {}
+
+def get_feedback_table(palette=colors, length=CODE_LENGTH, repeats=False):
+    '''
+    Function that returns the shared table of a code space,
+    one per process and variant.
+    Parameters: palette -- list of strings, the colors,
+    length -- integer, the number of pegs,
+    repeats -- Boolean, True if a color may be used more than once.
+    Returns a FeedbackTable.
+    '''
+    key = (tuple(palette), length, repeats)
+    if key not in _tables:
+        _tables[key] = FeedbackTable(palette, length, repeats)
+    return _tables[key]
@@ -0,0 +1,207 @@
+import random # to generate a secret code
+import time # when each guess was submitted, for replays
+
+CODE_LENGTH = 4
+NUM_ROUNDS = 10
+colors = ['red', 'blue', 'green', 'yellow', 'purple', 'black']
+
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+QUIT = 'quit'
+
+def count_bulls_and_cows(secret_code, current_guess):
+    '''
+    Function that evaluates the user's score.
+    Parameters: secret_code and current_guess are lists of color strings
+    of the same length, colors may repeat.
+    Returns integers, the counts of bulls and cows, a peg of the secret
+    is never counted twice.
+    '''
+    bulls = 0
+    common = 0 # colors shared by both codes, wherever they are
+    unmatched = list(secret_code)
+    for i in range(len(current_guess)):
+        if current_guess[i] == secret_code[i]:
+            bulls += 1 # the colors and positions same
+        if current_guess[i] in unmatched:
+            unmatched.remove(current_guess[i]) # each secret peg matches once
+            common += 1
+    return bulls, common - bulls # cows: the colors are there but not the same index
+
+class GameConfig:
+    '''
+    Class: GameConfig
+    Attributes: palette, code_length, rounds, allow_repeats
+    Methods: code_count, random_code.
+    The variant of the game, by default 6 colors, 4 pegs, 10 rounds
+    and no repeated colors.
+    '''
+    def __init__(self, palette=colors, code_length=CODE_LENGTH, rounds=NUM_ROUNDS, allow_repeats=False):
+        '''
+        Constructor: Create a new instance of a game variant,
+        Parameters:
+        self -- the current object,
+        palette -- list of strings, the colors,
+        code_length -- integer, the number of pegs,
+        rounds -- integer, the number of guesses before the user loses,
+        allow_repeats -- Boolean, True if a color may be used more than once.
+        '''
+        if not allow_repeats and code_length > len(palette):
+            raise ValueError(f'{code_length} pegs need repeats with {len(palette)} colors')
+        self.palette = list(palette)
+        self.code_length = code_length
+        self.rounds = rounds
+        self.allow_repeats = allow_repeats
+
+    def __eq__(self, other):
+        return isinstance(other, GameConfig) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self):
+        '''
+        Method: the variant as a tuple, to compare and cache by
+        Parameters: self -- the current variant,
+        returns a tuple.
+        '''
+        return (tuple(self.palette), self.code_length, self.rounds, self.allow_repeats)
+
+    def code_count(self):
+        '''
+        Method: count the possible secret codes
+        Parameters: self -- the current variant,
+        returns an integer.
+        '''
+        if self.allow_repeats:
+            return len(self.palette) ** self.code_length
+        count = 1
+        for k in range(len(self.palette), len(self.palette) - self.code_length, -1):
+            count *= k
+        return count
+
+    def random_code(self, rng=None):
+        '''
+        Method: draw a secret code
+        Parameters: self -- the current variant,
+        rng -- random.Random, the random module if None,
+        returns a list of color strings.
+        '''
+        rng = rng or random
+        if self.allow_repeats:
+            return rng.choices(self.palette, k=self.code_length)
+        return rng.sample(self.palette, self.code_length)
+
+DEFAULT_CONFIG = GameConfig()
+
+class GameEngine:
+    '''
+    Class: GameEngine
+    Attributes: config, secret_code, current_round, current_guess, history,
+    started, submit_times, state, color_button_enabled, option_button_enabled, on_win
+    Methods: pick_color, submit, reset, quit, is_over.
+    The rules of one game without any drawing, so the turtle UI only
+    drives and renders it and simulations can run it headlessly.
+    '''
+    def __init__(self, secret_code=None, on_win=None, rng=None, config=DEFAULT_CONFIG):
+        '''
+        Constructor: Create a new instance of a game,
+        Parameters:
+        self -- the current object,
+        secret_code -- list of strings, the code to guess,
+                       a random one is generated if None,
+        on_win -- leaderboard hook, called with the score when the user wins,
+        rng -- random.Random, source of the secret code if none is given,
+        config -- GameConfig, the variant of the game.
+        '''
+        self.config = config
+        if secret_code is None:
+            secret_code = config.random_code(rng)
+        self.secret_code = list(secret_code)
+        self.on_win = on_win
+        self.state = PLAYING
+        self.current_guess = [] # an empty list to keep track of guesses
+        self.current_round = 0 # update the number of rounds
+        self.history = [] # (guess, bulls, cows) of every submitted round
+        self.started = time.time()
+        self.submit_times = [] # time.time() of every submitted round
+        self.color_button_enabled: list[bool] = [True for _ in range(len(config.palette))]
+        self.option_button_enabled: dict[str, bool] = {'submit': False, 'reset': True}
+
+    def is_over(self):
+        '''
+        Method: check if the game has ended
+        Parameters: self -- the current game,
+        returns Boolean, True if the game is won, lost or quit.
+        '''
+        return self.state != PLAYING
+
+    def pick_color(self, i):
+        '''
+        Method: add the color of a button to the current guess
+        Parameters:
+        self -- the current game,
+        i -- the index of the color button,
+        returns Boolean, True if the button was enabled and the color taken.
+        '''
+        if not self.color_button_enabled[i]:
+            return False # the color button is not functioning
+        if not self.config.allow_repeats:
+            self.color_button_enabled[i] = False # turn off the button
+        self.current_guess.append(self.config.palette[i])
+        if len(self.current_guess) == self.config.code_length: # if the guess is full
+            self.color_button_enabled[:] = [False] * len(self.color_button_enabled) # turn off all color buttons
+            self.option_button_enabled['submit'] = True # turn on submit button
+        return True
+
+    def submit(self):
+        '''
+        Method: score the current guess and move on to the next round
+        Parameters: self -- the current game,
+        returns a tuple of integers (bulls, cows), or None if submit is off.
+        '''
+        if not self.option_button_enabled['submit']:
+            return None
+        self.option_button_enabled['submit'] = False # not functioning
+        bulls, cows = count_bulls_and_cows(self.secret_code, self.current_guess)
+        self.history.append((list(self.current_guess), bulls, cows))
+        self.submit_times.append(time.time())
+        if bulls == self.config.code_length: # the user wins
+            self.state = WON
+            self.option_button_enabled['reset'] = False # turn off
+            if self.on_win is not None:
+                self.on_win(self.current_round + 1) # update username and score
+            return bulls, cows
+        self.current_round += 1 # otherwise round plus 1
+        if self.current_round == self.config.rounds:
+            self.state = LOST # the user loses
+            self.option_button_enabled['reset'] = False # turn off
+            return bulls, cows
+        self.current_guess.clear() # renew the tracker for the next round
+        self.color_button_enabled[:] = [True] * len(self.color_button_enabled) # turn on color buttons
+        return bulls, cows
+
+    def reset(self):
+        '''
+        Method: clear the current guess of this round
+        Parameters: self -- the current game,
+        returns Boolean, True if reset is enabled and was done.
+        '''
+        if not self.option_button_enabled['reset']:
+            return False
+        self.option_button_enabled['submit'] = False # turn off submit button
+        self.current_guess.clear() # renew the tracker
+        self.color_button_enabled[:] = [True] * len(self.color_button_enabled) # turn on color buttons
+        return True
+
+    def quit(self):
+        '''
+        Method: end the game and turn off every button
+        Parameters: self -- the current game,
+        returns None.
+        '''
+        self.state = QUIT
+        self.color_button_enabled[:] = [False] * len(self.color_button_enabled) # turn off color buttons
+        self.option_button_enabled['submit'] = False
+        self.option_button_enabled['reset'] = False # turn off option buttons
@@ -0,0 +1,219 @@
+import argparse
+import collections
+import concurrent.futures
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+import numpy as np
+from scoring import count_bulls_and_cows_batch
+
+CHUNK_ROWS = 20000 # rows parsed and scored at once, by one worker
+FORMATS = ('jsonl', 'csv')
+OUTPUT_FIELDS = ['row', 'id', 'bulls', 'cows', 'error']
+SEPARATORS = re.compile(r'[\s,;|]+') # between the colors of a code written as one string
+COLOR_TYPES = (str, int, float, bool) # JSON values a color may be, only compared for equality
+
+def parse_code(value):
+    '''
+    Function that reads a code as a list of colors, or as one string of
+    colors separated by spaces, commas, semicolons or bars.
+    Parameters: value -- list or string.
+    Returns a list of colors; raises ValueError if a color is not a
+    string, a number or a Boolean.
+    '''
+    if isinstance(value, str):
+        return [color for color in SEPARATORS.split(value.strip()) if color]
+    if isinstance(value, list):
+        for color in value:
+            if not isinstance(color, COLOR_TYPES):
+                raise ValueError(f'a color is a string or a number, not {color!r}')
+        return value
+    raise ValueError(f'a code is a list or a string, not {value!r}')
+
+def parse_row(line, format, fieldnames=None):
+    '''
+    Function that reads the secret, the guess and the id of an input row.
+    Parameters: line -- string, format -- string, 'jsonl' or 'csv',
+    fieldnames -- list of strings, the header of a CSV file.
+    Returns a tuple (secret, guess, id), codes as lists of colors,
+    id None if the row has none; raises ValueError for a bad row.
+    '''
+    if format == 'csv':
+        row = dict(zip(fieldnames, next(csv.reader([line]))))
+    else:
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f'bad JSON: {error.msg}') from None
+        if isinstance(row, list) and len(row) == 2:
+            row = {'secret': row[0], 'guess': row[1]}
+    if not isinstance(row, dict) or 'secret' not in row or 'guess' not in row:
+        raise ValueError('a row needs a secret and a guess')
+    secret, guess = parse_code(row['secret']), parse_code(row['guess'])
+    if len(secret) != len(guess) or not secret:
+        raise ValueError('the secret and the guess must have the same number of pegs')
+    return secret, guess, row.get('id')
+
+def grade_chunk(lines, format, fieldnames, first_row, output_format='jsonl'):
+    '''
+    Function that scores a chunk of input rows in one batch per code
+    length, it runs in the worker processes.
+    Parameters: lines -- list of strings, format -- string, 'jsonl' or 'csv',
+    fieldnames -- list of strings, the header of a CSV file,
+    first_row -- integer, the number of the first row of the chunk,
+    output_format -- string, 'jsonl' or 'csv'.
+    Returns a tuple (string, the results in input order, integer rows, integer errors).
+    '''
+    results = [None] * len(lines)
+    by_length = collections.defaultdict(list) # pegs -> row indexes
+    codes = []
+    for i, line in enumerate(lines):
+        try:
+            secret, guess, row_id = parse_row(line, format, fieldnames)
+        except (ValueError, IndexError, TypeError) as error:
+            results[i] = {'row': first_row + i, 'error': str(error)}
+            codes.append(None)
+            continue
+        results[i] = {'row': first_row + i, 'id': row_id}
+        by_length[len(secret)].append(i)
+        codes.append((secret, guess))
+    for rows in by_length.values():
+        index = {} # colors numbered as they come, only equality matters
+        secrets = np.array([[index.setdefault(c, len(index)) for c in codes[i][0]] for i in rows], dtype=np.int16)
+        guesses = np.array([[index.setdefault(c, len(index)) for c in codes[i][1]] for i in rows], dtype=np.int16)
+        bulls, cows = count_bulls_and_cows_batch(secrets, guesses)
+        for i, b, c in zip(rows, bulls.tolist(), cows.tolist()):
+            results[i]['bulls'] = b
+            results[i]['cows'] = c
+    errors = sum('error' in result for result in results)
+    if output_format == 'csv':
+        out = io.StringIO()
+        csv.DictWriter(out, OUTPUT_FIELDS, lineterminator='\n').writerows(results)
+        text = out.getvalue()
+    else:
+        text = ''.join(map(format_result, results))
+    return text, len(lines), errors
+
+def format_result(result):
+    '''
+    Function that writes the result of a row as a line of JSON, the
+    fields with no value left out.
+    Parameters: result -- dict with row, id, bulls and cows, or row and error.
+    Returns a string.
+    '''
+    if 'error' in result:
+        return json.dumps(result) + '\n'
+    row_id = result['id']
+    if row_id is None:
+        return f'{{"row": {result["row"]}, "bulls": {result["bulls"]}, "cows": {result["cows"]}}}\n'
+    row_id = row_id if type(row_id) is int else json.dumps(row_id) # no quotes around numbers
+    return f'{{"row": {result["row"]}, "id": {row_id}, "bulls": {result["bulls"]}, "cows": {result["cows"]}}}\n'
+
+def input_format(path):
+    '''
+    Function that guesses the format of an input file from its extension.
+    Parameters: path -- string, '-' for stdin.
+    Returns a string, 'csv' or 'jsonl'.
+    '''
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def read_chunks(paths, format=None, chunk_rows=CHUNK_ROWS):
+    '''
+    Function that streams the input rows of files, or stdin, in chunks,
+    skipping blank lines; a CSV file starts with its header.
+    Parameters: paths -- list of strings, '-' for stdin,
+    format -- string, 'jsonl' or 'csv', None to go by the extensions,
+    chunk_rows -- integer, rows per chunk.
+    Returns a generator of tuples (lines, format, fieldnames, first row number).
+    '''
+    first_row = 0
+    for path in paths:
+        file_format = format or input_format(path)
+        f = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        try:
+            fieldnames = None
+            if file_format == 'csv':
+                header = f.readline()
+                fieldnames = [name.strip() for name in next(csv.reader([header]), [])]
+            lines = []
+            for line in f:
+                if line.strip():
+                    lines.append(line)
+                    if len(lines) == chunk_rows:
+                        yield lines, file_format, fieldnames, first_row
+                        first_row += len(lines)
+                        lines = []
+            if lines:
+                yield lines, file_format, fieldnames, first_row
+                first_row += len(lines)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+def grade(paths, out, format=None, output_format='jsonl', workers=0, chunk_rows=CHUNK_ROWS):
+    '''
+    Function that scores every row of the inputs and writes the results
+    in input order as soon as each chunk is done. At most two chunks per
+    worker are in flight, so memory stays bounded however long the input.
+    Parameters: paths -- list of strings, '-' for stdin,
+    out -- text file the results are written to,
+    format -- string, 'jsonl' or 'csv' for every input, None to go by the extensions,
+    output_format -- string, 'jsonl' or 'csv',
+    workers -- integer, processes to score with, 0 scores in this process,
+    chunk_rows -- integer, rows per chunk.
+    Returns a dict of the rows, the errors and the seconds it took.
+    '''
+    start = time.perf_counter()
+    rows = errors = 0
+    if output_format == 'csv':
+        out.write(','.join(OUTPUT_FIELDS) + '\n')
+    chunks = read_chunks(paths, format, chunk_rows)
+    if workers == 0:
+        for chunk in chunks:
+            text, n, bad = grade_chunk(*chunk, output_format)
+            out.write(text)
+            rows, errors = rows + n, errors + bad
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            pending = collections.deque()
+            for chunk in chunks:
+                pending.append(pool.submit(grade_chunk, *chunk, output_format))
+                while len(pending) >= workers * 2: # the oldest is written first, in order
+                    text, n, bad = pending.popleft().result()
+                    out.write(text)
+                    rows, errors = rows + n, errors + bad
+            while pending:
+                text, n, bad = pending.popleft().result()
+                out.write(text)
+                rows, errors = rows + n, errors + bad
+    return {'rows': rows, 'errors': errors, 'seconds': time.perf_counter() - start}
+
+def main():
+    parser = argparse.ArgumentParser(description='Score (secret, guess) rows with the MasterMind rules')
+    parser.add_argument('paths', nargs='*', default=['-'],
+                        help='JSON-lines or CSV files, - for stdin; a row is {"secret": ..., "guess": ...} '
+                             'or a CSV with secret and guess columns, codes as lists or "red blue green yellow"')
+    parser.add_argument('--format', choices=FORMATS, help='format of the inputs, by default from their extension')
+    parser.add_argument('--output', default='-', help='file the results are written to, - for stdout')
+    parser.add_argument('--output-format', choices=FORMATS, default='jsonl')
+    parser.add_argument('--workers', type=int, default=0, help='processes to score with, 0 to score in this one, -1 for one per CPU')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    if args.workers < 0:
+        args.workers = os.cpu_count()
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        result = grade(args.paths, out, args.format, args.output_format, args.workers, args.chunk_rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    rate = result['rows'] / result['seconds'] if result['seconds'] else 0
+    print(f"{result['rows']:,} rows graded in {result['seconds']:.2f} s, {rate:,.0f} rows/sec, "
+          f"{result['errors']:,} errors", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import math
+
+class LatencyHistogram:
+    '''
+    Class: LatencyHistogram
+    Attributes: counts, count, total, low, high
+    Methods: record, percentile, merge, summary.
+    Counts latencies in buckets that grow by a fixed ratio, so memory
+    stays constant however many are recorded and percentiles are
+    within a few percent.
+    '''
+    def __init__(self, low=1e-6, high=100.0, ratio=1.05):
+        '''
+        Constructor: Create a new instance of an empty histogram,
+        Parameters:
+        self -- the current object,
+        low, high -- floats, seconds, the smallest and largest bucket,
+        ratio -- float, how much each bucket is wider than the last.
+        '''
+        self.low = low
+        self.ratio = ratio
+        self.log_ratio = math.log(ratio)
+        self.counts = [0] * (self.bucket(high) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def bucket(self, seconds):
+        '''
+        Method: the bucket of a latency
+        Parameters: self -- the current histogram, seconds -- float,
+        returns integer.
+        '''
+        if seconds <= self.low:
+            return 0
+        return int(math.log(seconds / self.low) / self.log_ratio) + 1
+
+    def record(self, seconds):
+        '''
+        Method: count one latency
+        Parameters: self -- the current histogram, seconds -- float,
+        returns None.
+        '''
+        self.counts[min(self.bucket(seconds), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        '''
+        Method: the latency below which p percent of them are
+        Parameters: self -- the current histogram, p -- float from 0 to 100,
+        returns float, seconds, the upper edge of the bucket.
+        '''
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= max(rank, 1):
+                return min(self.low * self.ratio ** i, self.max)
+        return self.max
+
+    def merge(self, other):
+        '''
+        Method: add the counts of another histogram of the same buckets
+        Parameters: self -- the current histogram, other -- LatencyHistogram,
+        returns None.
+        '''
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def summary(self):
+        '''
+        Method: the usual numbers of the histogram
+        Parameters: self -- the current histogram,
+        returns dict of count and seconds: mean, p50, p95, p99, max.
+        '''
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
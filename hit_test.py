@@ -0,0 +1,110 @@
+import math
+
+CELL_SIZE = 64 # pixels, about the hit box of a marble
+
+def marble_box(marble):
+    '''
+    Function that finds the region where a click hits a marble, as
+    Marble.clicked_in_region tests it.
+    Parameters: marble -- Marble, with a position and a radius.
+    Returns a tuple (left, bottom, right, top).
+    '''
+    x, y, reach = marble.position.x, marble.position.y, marble.radius * 2
+    return x - reach, y - reach, x + reach, y + reach
+
+def shape_box(shape):
+    '''
+    Function that finds the region where a click hits a shape, as
+    MyShape.clicked_in_region tests it.
+    Parameters: shape -- MyShape or TextButton, with a position, width and height.
+    Returns a tuple (left, bottom, right, top).
+    '''
+    x, y = shape.position.x, shape.position.y
+    return x - shape.width // 2, y - shape.height // 2, x + shape.width // 2, y + shape.height // 2
+
+class HitGrid:
+    '''
+    Class: HitGrid
+    Attributes: cell_size, boxes, cells
+    Methods: add, remove, hits, hit.
+    A uniform grid over the clickable regions of the board: each cell
+    lists the regions that overlap it, so a click only tests the few
+    regions of its own cell, however many the board has. Where regions
+    overlap, they are hit in the order added, as when they were scanned
+    in order, so a handler can pass the click on to the next one.
+    '''
+    def __init__(self, cell_size=CELL_SIZE):
+        '''
+        Constructor: Create a new instance of an empty grid,
+        Parameters:
+        self -- the current object,
+        cell_size -- integer, pixels on a side of a cell.
+        '''
+        self.cell_size = cell_size
+        self.boxes = {} # key -> (left, bottom, right, top)
+        self.cells = {} # (column, row) -> keys of the regions over it, in the order added
+
+    def cells_of(self, box):
+        '''
+        Method: the cells a region overlaps
+        Parameters: self -- the current grid, box -- tuple (left, bottom, right, top),
+        returns a generator of (column, row).
+        '''
+        left, bottom, right, top = box
+        size = self.cell_size
+        for column in range(math.floor(left / size), math.floor(right / size) + 1):
+            for row in range(math.floor(bottom / size), math.floor(top / size) + 1):
+                yield column, row
+
+    def add(self, key, box):
+        '''
+        Method: make a region clickable, in place of its old region if the key had one
+        Parameters: self -- the current grid,
+        key -- hashable, what a click on the region hits,
+        box -- tuple (left, bottom, right, top), the edges are inside,
+        returns None.
+        '''
+        self.remove(key)
+        self.boxes[key] = box
+        for cell in self.cells_of(box):
+            self.cells.setdefault(cell, []).append(key)
+
+    def remove(self, key):
+        '''
+        Method: make a region not clickable any more
+        Parameters: self -- the current grid, key -- hashable,
+        returns Boolean, True if the key had a region.
+        '''
+        box = self.boxes.pop(key, None)
+        if box is None:
+            return False
+        for cell in self.cells_of(box):
+            keys = self.cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self.cells[cell]
+        return True
+
+    def hits(self, x, y):
+        '''
+        Method: every region under a click
+        Parameters: self -- the current grid,
+        x, y -- the coordinates of the click,
+        returns a list of the keys of the regions, in the order added.
+        '''
+        keys = []
+        for key in self.cells.get((math.floor(x / self.cell_size), math.floor(y / self.cell_size)), ()):
+            left, bottom, right, top = self.boxes[key]
+            if left <= x <= right and bottom <= y <= top:
+                keys.append(key)
+        return keys
+
+    def hit(self, x, y):
+        '''
+        Method: the first region under a click
+        Parameters: self -- the current grid,
+        x, y -- the coordinates of the click,
+        returns the key of the region, None if the click hits nothing.
+        '''
+        keys = self.hits(x, y)
+        return keys[0] if keys else None
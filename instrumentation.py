@@ -0,0 +1,177 @@
+import atexit
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from histogram import LatencyHistogram
+
+ENV_FORMAT = 'MASTERMIND_METRICS' # json or prometheus, unset for no instrumentation
+ENV_FILE = 'MASTERMIND_METRICS_FILE' # where the metrics go on exit, stderr if unset
+FORMATS = ('json', 'prometheus')
+# (module, attribute) of the hot paths, a Class.method or a function
+HOT_PATHS = [
+    ('mastermind_game', 'MasterMind.on_mouse_clicked'),
+    ('mastermind_game', 'MasterMind.click_color'),
+    ('mastermind_game', 'MasterMind.process_submit'),
+    ('mastermind_game', 'Marble.draw'),
+    ('mastermind_game', 'Marble.draw_empty'),
+    ('mastermind_game', 'read_leaders'),
+    ('mastermind_game', 'write_leaders'),
+    ('mastermind_game', 'compute_hint'), # the hint search, in a worker thread
+    ('game_engine', 'count_bulls_and_cows'),
+    ('hit_test', 'HitGrid.hits'),
+    ('candidates', 'CandidateSet.filter'),
+    ('renderer', 'BoardRenderer.flush'),
+    ('assets', 'AssetRegistry.load'),
+    ('leaderboard', 'LeaderBoard.append'),
+    ('leaderboard', 'LeaderBoard.top'),
+]
+# upper bounds of the Prometheus buckets, seconds
+PROMETHEUS_BOUNDS = [1e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0]
+
+class Metrics:
+    '''
+    Class: Metrics
+    Attributes: histograms, lock, originals
+    Methods: timed, record, to_json, to_prometheus, dump.
+    Latency histograms of the instrumented calls, by name. Nothing is
+    wrapped unless instrumentation is enabled, so when it is off the hot
+    paths run exactly as they did.
+    '''
+    def __init__(self):
+        '''
+        Constructor: Create a new instance of empty metrics,
+        Parameters:
+        self -- the current object.
+        '''
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.lock = threading.Lock() # the leaderboard is written from worker threads
+        self.originals = [] # (owner, name, function) replaced by a timed wrapper
+
+    def record(self, name, seconds):
+        '''
+        Method: count one call of a name and its latency
+        Parameters: self -- the current metrics, name -- string, seconds -- float,
+        returns None.
+        '''
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = LatencyHistogram()
+            self.histograms[name].record(seconds)
+
+    def timed(self, name, function):
+        '''
+        Method: wrap a function so each call is timed under a name
+        Parameters: self -- the current metrics, name -- string, function -- callable,
+        returns callable.
+        '''
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        wrapper.__wrapped_by_metrics__ = True
+        return wrapper
+
+    def to_json(self):
+        '''
+        Method: the summary of every histogram, in seconds
+        Parameters: self -- the current metrics,
+        returns string.
+        '''
+        with self.lock:
+            return json.dumps({name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+                              indent=2)
+
+    def to_prometheus(self):
+        '''
+        Method: the histograms in the Prometheus text format
+        Parameters: self -- the current metrics,
+        returns string.
+        '''
+        lines = ['# HELP mastermind_call_seconds Latency of the instrumented calls.',
+                 '# TYPE mastermind_call_seconds histogram']
+        with self.lock:
+            for name, histogram in sorted(self.histograms.items()):
+                label = f'call="{name}"'
+                for bound in PROMETHEUS_BOUNDS:
+                    below = sum(histogram.counts[:histogram.bucket(bound) + 1])
+                    lines.append(f'mastermind_call_seconds_bucket{{{label},le="{bound:g}"}} {below}')
+                lines.append(f'mastermind_call_seconds_bucket{{{label},le="+Inf"}} {histogram.count}')
+                lines.append(f'mastermind_call_seconds_sum{{{label}}} {histogram.total:.9f}')
+                lines.append(f'mastermind_call_seconds_count{{{label}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, format='json', path=None):
+        '''
+        Method: write the metrics to a file, or to stderr
+        Parameters: self -- the current metrics,
+        format -- string, 'json' or 'prometheus',
+        path -- string, the file, None for stderr,
+        returns None.
+        '''
+        text = self.to_prometheus() if format == 'prometheus' else self.to_json() + '\n'
+        if path is None:
+            sys.stderr.write(text)
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def instrument(metrics, module_name, attribute):
+    '''
+    Function that replaces a function or method by its timed wrapper.
+    Parameters: metrics -- Metrics, module_name -- string,
+    attribute -- string, 'function' or 'Class.method'.
+    Returns None.
+    '''
+    owner = importlib.import_module(module_name)
+    *path, name = attribute.split('.')
+    for part in path:
+        owner = getattr(owner, part)
+    function = getattr(owner, name)
+    if not getattr(function, '__wrapped_by_metrics__', False):
+        metrics.originals.append((owner, name, function))
+        setattr(owner, name, metrics.timed(attribute, function))
+
+def enable(format='json', path=None, hot_paths=HOT_PATHS):
+    '''
+    Function that times the hot paths from now on and dumps the metrics at exit.
+    Parameters: format -- string, 'json' or 'prometheus',
+    path -- string, the file written at exit, None for stderr,
+    hot_paths -- list of (module, attribute) to time.
+    Returns Metrics.
+    '''
+    if format not in FORMATS:
+        raise ValueError(f'unknown metrics format {format!r}, use one of {FORMATS}')
+    metrics = Metrics()
+    for module_name, attribute in hot_paths:
+        instrument(metrics, module_name, attribute)
+    atexit.register(metrics.dump, format, path)
+    return metrics
+
+def disable(metrics):
+    '''
+    Function that puts the original functions back, nothing is dumped at exit.
+    Parameters: metrics -- Metrics returned by enable.
+    Returns None.
+    '''
+    for owner, name, function in reversed(metrics.originals):
+        setattr(owner, name, function)
+    metrics.originals.clear()
+    atexit.unregister(metrics.dump)
+
+def enable_from_env():
+    '''
+    Function that enables the instrumentation if MASTERMIND_METRICS is set.
+    Parameters: None.
+    Returns Metrics, or None when it is off.
+    '''
+    format = os.environ.get(ENV_FORMAT)
+    if not format:
+        return None
+    return enable(format, os.environ.get(ENV_FILE))
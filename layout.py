@@ -0,0 +1,86 @@
+# Where everything sits on the board, shared by the turtle game and
+# anything else that draws or hit-tests the same board.
+MARBLE_RADIUS = 16
+PEG_RADIUS = 4
+SCREEN_WIDTH = 700
+SCREEN_HEIGHT = 700
+ROWS = 10
+PEGS = 4
+
+# (pensize, color, x, y, width, height) of the boards of marbles, leaders and buttons
+RECTANGLES = [
+    (5, 'black', -340, 340, 400, 570),
+    (5, 'blue', 100, 340, 220, 570),
+    (5, 'black', -340, -240, 670, 100),
+]
+# name -> (x, y, gif image, width, height), centered on (x, y)
+OPTION_BUTTONS = {
+    'submit': (10, -290, 'checkbutton.gif', 60, 60),
+    'reset': (70, -290, 'xbutton.gif', 60, 60),
+    'quit': (240, -290, 'quit.gif', 200, 100),
+}
+# name -> (x, y, label, width, height), centered on (x, y)
+TEXT_BUTTONS = {
+    'hint': (160, -200, 'Hint', 80, 30),
+    'auto': (260, -200, 'Auto', 80, 30),
+}
+HINT_POSITION = (110, -170)
+MESSAGE_POSITION = (0, 0) # winner, lose and quit gifs
+# final state of the game -> (gif image, width, height) shown at MESSAGE_POSITION
+MESSAGES = {
+    'won': ('winner.gif', 183, 84),
+    'lost': ('Lose.gif', 183, 84),
+    'quit': ('quitmsg.gif', 184, 84),
+}
+LEADERS_FONT = ("Courier", 24, "bold")
+BUTTON_FONT = ("Courier", 14, "bold") # labels of the text buttons
+COUNT_FONT = ("Courier", 10, "bold") # codes still possible, right of the pegs
+
+def pointer_position(row):
+    '''
+    Function that locates the pointer of a row of guesses.
+    Parameters: row -- integer, the round.
+    Returns a tuple of integers (x, y).
+    '''
+    return -310, 290 - row * 50
+
+def color_marble_position(row, col):
+    '''
+    Function that locates a marble of a guess.
+    Parameters: row -- integer, the round, col -- integer, the peg.
+    Returns a tuple of integers (x, y), where the turtle starts the circle.
+    '''
+    return col * 50 - 280, 275 - row * 50
+
+def peg_position(row, i):
+    '''
+    Function that locates a peg of the score of a guess.
+    Parameters: row -- integer, the round, i -- integer, the peg.
+    Returns a tuple of integers (x, y), where the turtle starts the circle.
+    '''
+    return -50 + i % 2 * 32, 300 - row * 50 - i // 2 * 20
+
+def count_position(row):
+    '''
+    Function that locates the count of codes still possible after a
+    guess, right of the pegs of its row.
+    Parameters: row -- integer, the round.
+    Returns a tuple of integers (x, y), where the text starts.
+    '''
+    return 0, 286 - row * 50
+
+def color_button_position(i):
+    '''
+    Function that locates a color button.
+    Parameters: i -- integer, the index of the color.
+    Returns a tuple of integers (x, y), where the turtle starts the circle.
+    '''
+    return -280 + i * 40, -290
+
+def leader_position(i):
+    '''
+    Function that locates a line of the leader board, -1 is the title.
+    Parameters: i -- integer, the rank from 0.
+    Returns a tuple of integers (x, y).
+    '''
+    return 120, 260 - 30 * i
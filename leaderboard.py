@@ -0,0 +1,508 @@
+import argparse
+import ast
+import bisect
+import contextlib
+import heapq
+import json
+import os
+import re
+import tempfile
+import time
+
+try:
+    import fcntl # file locks on Linux and macOS
+except ImportError:
+    fcntl = None
+    import msvcrt # file locks on Windows
+
+LEADERS_LOG = 'leaders.log'
+OLD_LEADERS_FILE = 'leaders.txt' # the list written with str() before the log
+TOP_K = 100 # leaders kept in the index, the game shows the first 5
+CHUNK_ROWS = 200000 # log lines held in memory at once by compact
+SPARSE_EVERY = 128 # one key of the user index in memory per this many users
+
+@contextlib.contextmanager
+def locked(path):
+    '''
+    Function that holds an exclusive lock on a lock file next to path,
+    so game processes never write the log or the index at the same time.
+    Parameters: path -- string, the file to protect.
+    Returns a context manager.
+    '''
+    with open(path + '.lock', 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def format_record(score, username, when):
+    '''
+    Function that writes a leader as one line of the log.
+    Parameters: score -- integer, username -- string, when -- float, a time stamp.
+    Returns a string, tab separated, the username in JSON so any text fits.
+    '''
+    return f'{score}\t{when:.3f}\t{json.dumps(username)}\n'
+
+def parse_record(line):
+    '''
+    Function that reads one line of the log.
+    Parameters: line -- string or bytes.
+    Returns a tuple (score, username, when).
+    '''
+    score, when, username = line.split('\t', 2)
+    return int(score), json.loads(username), float(when)
+
+def write_atomic(path, text):
+    '''
+    Function that replaces a file in one step, readers see the old or
+    the new content, never half of it.
+    Parameters: path -- string, text -- string.
+    Returns None.
+    '''
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+def read_user_lines(path):
+    '''
+    Function that streams a sorted file of per-user bests.
+    Parameters: path -- string.
+    Returns a generator of tuples (key, best, wins), key is the JSON username.
+    '''
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            key, best, wins = line.rstrip('\n').rsplit('\t', 2)
+            yield key, int(best), int(wins)
+
+class LeaderBoard:
+    '''
+    Class: LeaderBoard
+    Attributes: path, index_path, users_path, top_k
+    Methods: record, append, top, personal_best, recent_users, percentile,
+    compact, segments, rebuild_index, migrate.
+    Every win is appended to the active log. compact moves the active log
+    into a numbered segment that is never rewritten, and merges it into
+    a per-user index sorted by username. The best top_k and a histogram
+    of every score are kept in a small index file, so a win costs
+    O(log k) and no query parses the history.
+    '''
+    def __init__(self, path=LEADERS_LOG, top_k=TOP_K):
+        '''
+        Constructor: Create a new instance of a leader board,
+        Parameters:
+        self -- the current object,
+        path -- string, the active log file, other files are named after it,
+        top_k -- integer, how many leaders the index keeps.
+        '''
+        self.path = path
+        self.index_path = path + '.top'
+        self.users_path = path + '.users'
+        self.top_k = top_k
+        self._sparse = None # ((mtime, size), keys, offsets) of the user index
+        self._recent = None # (file id, bytes read, {username: (best, wins)}) of the active log
+
+    def record(self, score, username, when=None):
+        '''
+        Method: append a win to the log and to the index
+        Parameters:
+        self -- the current board,
+        score -- integer, the rounds it took,
+        username -- string,
+        when -- float, time stamp of the win, now if None,
+        returns None.
+        '''
+        self.append([(score, username, time.time() if when is None else when)])
+
+    def append(self, records):
+        '''
+        Method: append wins to the log and to the index, under one lock
+        Parameters:
+        self -- the current board,
+        records -- list of tuples (score, username, when),
+        returns None.
+        '''
+        with locked(self.path):
+            self.append_locked(records)
+
+    def append_locked(self, records):
+        '''
+        Method: append wins while the caller holds the lock
+        Parameters: see append,
+        returns None.
+        '''
+        index = self.read_index()
+        with open(self.path, 'ab') as f:
+            # position in the whole history: unique and growing, older wins rank first on ties
+            position = index['archived'] + f.tell()
+            for score, username, when in records:
+                when = round(when, 3) # as precise as the log
+                line = format_record(score, username, when).encode('utf-8')
+                f.write(line)
+                self.push(index, score, position, username, when)
+                position += len(line)
+        self.write_index(index)
+
+    def push(self, index, score, position, username, when):
+        '''
+        Method: count a win in the histogram and keep it in the heap if it
+        is among the best top_k, the root of the heap is the worst one kept
+        Parameters:
+        self -- the current board,
+        index -- dict, with the heap 'top' and the list 'histogram',
+        score, position, username, when -- the win and its place in the history,
+        returns None.
+        '''
+        histogram = index['histogram']
+        if score >= len(histogram):
+            histogram.extend([0] * (score + 1 - len(histogram)))
+        histogram[score] += 1
+        heap = index['top']
+        item = (-score, -position, username, when)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def new_index(self):
+        '''
+        Method: an index of no wins
+        Parameters: self -- the current board,
+        returns a dict.
+        '''
+        return {'top': [], 'histogram': [], 'archived': 0}
+
+    def read_index(self):
+        '''
+        Method: load the index, rebuilt from the log if it is missing or unreadable
+        Parameters: self -- the current board,
+        returns a dict with the heap 'top', the score counts 'histogram'
+        and the bytes of history in segments 'archived'.
+        '''
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            index['top'] = [tuple(item) for item in index['top']]
+            return index
+        except (OSError, ValueError, KeyError, TypeError):
+            return self.rebuild_index()
+
+    def write_index(self, index):
+        '''
+        Method: save the index
+        Parameters: self -- the current board, index -- dict,
+        returns None.
+        '''
+        write_atomic(self.index_path, json.dumps(index))
+
+    def segments(self):
+        '''
+        Method: the compacted segments of the log, oldest first
+        Parameters: self -- the current board,
+        returns a list of paths.
+        '''
+        directory = os.path.dirname(os.path.abspath(self.path))
+        pattern = re.compile(re.escape(os.path.basename(self.path)) + r'\.(\d{6})$')
+        names = sorted(name for name in os.listdir(directory) if pattern.match(name))
+        return [os.path.join(os.path.dirname(self.path), name) for name in names]
+
+    def rebuild_index(self):
+        '''
+        Method: stream the segments and the active log into a new index
+        Parameters: self -- the current board,
+        returns a dict, see read_index.
+        '''
+        index = self.new_index()
+        position = 0
+        for path in self.segments() + [self.path]:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                for line in f:
+                    score, username, when = parse_record(line.decode('utf-8'))
+                    self.push(index, score, position, username, when)
+                    position += len(line)
+            if path != self.path:
+                index['archived'] = position
+        return index
+
+    def top(self, n=None):
+        '''
+        Method: the best leaders, fewest rounds first, earlier wins first on ties
+        Parameters: self -- the current board, n -- integer, at most top_k,
+        returns a list of tuples (score, username).
+        '''
+        best = sorted(self.read_index()['top'], reverse=True)[:n]
+        return [(-score, username) for score, _, username, _ in best]
+
+    def percentile(self, score):
+        '''
+        Method: the percentile rank of a score among every recorded win,
+        the share of wins it beats, ties counted half
+        Parameters: self -- the current board, score -- integer,
+        returns a float from 0 to 100.
+        '''
+        histogram = self.read_index()['histogram']
+        total = sum(histogram)
+        if total == 0:
+            return 100.0
+        worse = sum(histogram[score + 1:])
+        ties = histogram[score] if score < len(histogram) else 0
+        return 100.0 * (worse + ties / 2) / total
+
+    def personal_best(self, username):
+        '''
+        Method: the best score and number of wins of a user, from the user
+        index and the wins not compacted yet
+        Parameters: self -- the current board, username -- string,
+        returns a tuple (best, wins), best is None if the user never won.
+        '''
+        best, wins = self.lookup_user(json.dumps(username))
+        recent = self.recent_users().get(username)
+        if recent is not None:
+            best = recent[0] if best is None else min(best, recent[0])
+            wins += recent[1]
+        return best, wins
+
+    def recent_users(self):
+        '''
+        Method: the best score and wins of each user of the active log,
+        parsing only the lines appended since the last call, and the
+        whole log again only once compact has moved it to a segment
+        Parameters: self -- the current board,
+        returns a dict, username -> (best, wins).
+        '''
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            self._recent = None
+            return {}
+        with f:
+            stat = os.fstat(f.fileno())
+            file_id = (stat.st_dev, stat.st_ino) # compact renames the log, the next append makes a new one
+            if self._recent is None or self._recent[0] != file_id:
+                self._recent = (file_id, 0, {})
+            _, offset, users = self._recent
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break # still being written, read on the next call
+                score, name, _ = parse_record(line.decode('utf-8'))
+                best, wins = users.get(name, (score, 0))
+                users[name] = (min(best, score), wins + 1)
+                offset += len(line)
+        self._recent = (file_id, offset, users)
+        return users
+
+    def lookup_user(self, key):
+        '''
+        Method: binary search the user index through its sparse keys
+        Parameters: self -- the current board, key -- string, the JSON username,
+        returns a tuple (best, wins), best is None if the user is not there.
+        '''
+        if not os.path.exists(self.users_path):
+            return None, 0
+        keys, offsets = self.sparse_index()
+        i = bisect.bisect_right(keys, key) - 1
+        if i < 0:
+            return None, 0
+        with open(self.users_path, 'rb') as f:
+            f.seek(offsets[i])
+            for _ in range(SPARSE_EVERY):
+                line = f.readline().decode('utf-8')
+                if not line:
+                    break
+                name, best, wins = line.rstrip('\n').rsplit('\t', 2)
+                if name == key:
+                    return int(best), int(wins)
+                if name > key:
+                    break
+        return None, 0
+
+    def sparse_index(self):
+        '''
+        Method: every SPARSE_EVERY-th key of the user index and its offset,
+        read once and again only when compact has replaced the file, rebuilt
+        from the user index if the sparse file was written for another one
+        Parameters: self -- the current board,
+        returns two lists, keys and offsets.
+        '''
+        stat = os.stat(self.users_path)
+        version = (stat.st_mtime, stat.st_size)
+        if self._sparse is None or self._sparse[0] != version:
+            try:
+                with open(self.users_path + '.sparse', encoding='utf-8') as f:
+                    size, keys, offsets = json.load(f)
+            except (OSError, ValueError):
+                size = None
+            if size != stat.st_size: # compact is between the two files, or stopped there
+                keys, offsets = self.rebuild_sparse()
+            self._sparse = (version, keys, offsets)
+        return self._sparse[1], self._sparse[2]
+
+    def rebuild_sparse(self):
+        '''
+        Method: read the sparse keys of the user index from the index itself
+        Parameters: self -- the current board,
+        returns two lists, keys and offsets.
+        '''
+        keys, offsets = [], []
+        with open(self.users_path, 'rb') as f:
+            offset = 0
+            for count, line in enumerate(f):
+                if count % SPARSE_EVERY == 0:
+                    keys.append(line.decode('utf-8').rsplit('\t', 2)[0])
+                    offsets.append(offset)
+                offset += len(line)
+        return keys, offsets
+
+    def compact(self, chunk_rows=CHUNK_ROWS):
+        '''
+        Method: move the active log into a new segment and merge its users
+        into the user index, in sorted runs of chunk_rows lines, so memory
+        does not grow with the history
+        Parameters: self -- the current board, chunk_rows -- integer,
+        returns string, the new segment, or None if there was nothing to move.
+        '''
+        with locked(self.path):
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                return None
+            index = self.read_index()
+            segments = self.segments()
+            number = int(segments[-1].rsplit('.', 1)[1]) + 1 if segments else 1
+            segment = f'{self.path}.{number:06d}'
+            runs = self.write_runs(self.path, chunk_rows)
+            if os.path.exists(self.users_path):
+                runs.append(self.users_path)
+            self.merge_runs(runs)
+            for run in runs:
+                if run != self.users_path:
+                    os.remove(run)
+            index['archived'] += os.path.getsize(self.path)
+            os.replace(self.path, segment) # history is kept, never rewritten
+            self.write_index(index)
+        return segment
+
+    def write_runs(self, path, chunk_rows):
+        '''
+        Method: split a log into files of per-user bests, each sorted by user
+        Parameters: self -- the current board, path -- string, the log,
+        chunk_rows -- integer, users held in memory per run,
+        returns a list of paths of the runs.
+        '''
+        runs = []
+        with open(path, encoding='utf-8') as f:
+            while True:
+                users = {}
+                for line in f:
+                    score, when, key = line.rstrip('\n').split('\t', 2)
+                    best, wins = users.get(key, (int(score), 0))
+                    users[key] = (min(best, int(score)), wins + 1)
+                    if len(users) == chunk_rows:
+                        break
+                if not users:
+                    return runs
+                fd, run = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.run')
+                with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                    for key in sorted(users):
+                        best, wins = users[key]
+                        out.write(f'{key}\t{best}\t{wins}\n')
+                runs.append(run)
+
+    def merge_runs(self, runs):
+        '''
+        Method: merge sorted runs into a new user index and its sparse keys,
+        streaming one line of each run at a time
+        Parameters: self -- the current board, runs -- list of paths,
+        returns None.
+        '''
+        directory = os.path.dirname(os.path.abspath(self.users_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        keys, offsets = [], []
+        with os.fdopen(fd, 'wb') as out:
+            current = None
+            count = 0
+            for key, best, wins in heapq.merge(*map(read_user_lines, runs)):
+                if current is not None and current[0] == key:
+                    current = (key, min(current[1], best), current[2] + wins)
+                    continue
+                if current is not None:
+                    count = self.write_user(out, current, count, keys, offsets)
+                current = (key, best, wins)
+            if current is not None:
+                self.write_user(out, current, count, keys, offsets)
+            size = out.tell()
+        # the user index first: the size tells readers whether the sparse keys are its own
+        os.replace(temp_path, self.users_path)
+        write_atomic(self.users_path + '.sparse', json.dumps([size, keys, offsets]))
+
+    def write_user(self, out, user, count, keys, offsets):
+        '''
+        Method: write one user of the user index, noting every
+        SPARSE_EVERY-th key
+        Parameters: self -- the current board, out -- binary file,
+        user -- tuple (key, best, wins), count -- integer, users written so far,
+        keys, offsets -- lists, the sparse keys so far,
+        returns integer, the new count.
+        '''
+        if count % SPARSE_EVERY == 0:
+            keys.append(user[0])
+            offsets.append(out.tell())
+        out.write(f'{user[0]}\t{user[1]}\t{user[2]}\n'.encode('utf-8'))
+        return count + 1
+
+    def migrate(self, old_path=OLD_LEADERS_FILE):
+        '''
+        Method: append the leaders of the old leaders.txt list to the log,
+        only once, when the log does not exist yet
+        Parameters: self -- the current board, old_path -- string,
+        returns integer, the number of leaders moved.
+        '''
+        with locked(self.path):
+            if os.path.exists(self.path) or self.segments() or not os.path.exists(old_path):
+                return 0
+            with open(old_path, 'r') as f:
+                leaders = ast.literal_eval(f.read() or '[]') # a literal, never code
+            when = os.path.getmtime(old_path)
+            self.append_locked([(int(score), str(username), when) for score, username in leaders])
+        return len(leaders)
+
+def main():
+    parser = argparse.ArgumentParser(description='MasterMind leader board admin')
+    parser.add_argument('--log', default=LEADERS_LOG, help='the active leaders log')
+    commands = parser.add_subparsers(dest='command', required=True)
+    top_parser = commands.add_parser('top', help='the best leaders')
+    top_parser.add_argument('-n', type=int, default=10)
+    best_parser = commands.add_parser('best', help='the personal best of a user')
+    best_parser.add_argument('username')
+    percentile_parser = commands.add_parser('percentile', help='the percentile rank of a score')
+    percentile_parser.add_argument('score', type=int)
+    commands.add_parser('compact', help='move the active log into a segment and the user index')
+    commands.add_parser('rebuild', help='rebuild the top index from the history')
+    args = parser.parse_args()
+    board = LeaderBoard(args.log)
+    if args.command == 'top':
+        for i, (score, username) in enumerate(board.top(args.n), 1):
+            print(f'{i:>3}. {score} {username}')
+    elif args.command == 'best':
+        best, wins = board.personal_best(args.username)
+        print(f'{args.username}: best {best}, {wins} wins' if best is not None else f'{args.username}: no wins')
+    elif args.command == 'percentile':
+        print(f'{board.percentile(args.score):.2f}')
+    elif args.command == 'compact':
+        print(board.compact() or 'nothing to compact')
+    elif args.command == 'rebuild':
+        with locked(board.path):
+            board.write_index(board.rebuild_index())
+
+if __name__ == "__main__":
+    main()
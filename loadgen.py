@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from game_engine import DEFAULT_CONFIG
+from histogram import LatencyHistogram
+from server import GameServer
+from strategies import ConsistentGuessStrategy
+
+RETRY_DELAY = 0.01 # seconds a bot waits before asking again for a game the server refused
+
+class InProcessEndpoint:
+    '''
+    Class: InProcessEndpoint
+    Attributes: server
+    Methods: connect, request, close.
+    Calls the server directly, with the JSON encoding of the wire,
+    to measure the rules and sessions without any socket.
+    '''
+    def __init__(self, server):
+        self.server = server
+
+    async def connect(self):
+        '''
+        Method: nothing to connect, one endpoint serves every bot
+        Parameters: self -- the current endpoint,
+        returns the endpoint itself.
+        '''
+        return self
+
+    async def request(self, request):
+        '''
+        Method: send one request and wait for its response
+        Parameters: self -- the current endpoint, request -- dict,
+        returns dict.
+        '''
+        line = json.dumps(request).encode()
+        return json.loads(json.dumps(self.server.handle_request(json.loads(line))))
+
+    async def close(self):
+        pass
+
+class UnixEndpoint:
+    '''
+    Class: UnixEndpoint
+    Attributes: path, reader, writer
+    Methods: connect, request, close.
+    One connection of a bot to the server's Unix socket.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.reader = self.writer = None
+
+    async def connect(self):
+        '''
+        Method: open a connection of its own for a bot
+        Parameters: self -- the current endpoint,
+        returns a new connected UnixEndpoint.
+        '''
+        endpoint = UnixEndpoint(self.path)
+        endpoint.reader, endpoint.writer = await asyncio.open_unix_connection(self.path)
+        return endpoint
+
+    async def request(self, request):
+        self.writer.write(json.dumps(request).encode() + b'\n')
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+class RandomBot:
+    '''
+    Class: RandomBot
+    Attributes: config, rng
+    Methods: next_guess, observe.
+    Guesses at random, it rarely wins, so games last every round.
+    '''
+    def __init__(self, config, rng):
+        self.config = config
+        self.rng = rng
+
+    def next_guess(self):
+        return self.config.random_code(self.rng)
+
+    def observe(self, guess, bulls, cows):
+        pass
+
+class LoadReport:
+    '''
+    Class: LoadReport
+    Attributes: latency, games, requests, errors, started, finished
+    Methods: summary.
+    What the bots measured.
+    '''
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.games = 0
+        self.requests = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def summary(self):
+        '''
+        Method: throughput, latency percentiles in milliseconds and error rate
+        Parameters: self -- the current report,
+        returns dict.
+        '''
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latency = {key: value * 1000 if key != 'count' else value
+                   for key, value in self.latency.summary().items()}
+        return {
+            'seconds': elapsed,
+            'games': self.games,
+            'games_per_second': self.games / elapsed,
+            'requests_per_second': self.requests / elapsed,
+            'error_rate': self.errors / self.requests if self.requests else 0.0,
+            'latency_ms': latency,
+        }
+
+async def run_bot(endpoint, report, strategy, deadline, interval, rng):
+    '''
+    Function that plays full games until the deadline.
+    Parameters: endpoint -- connected endpoint of this bot,
+    report -- LoadReport, shared by every bot,
+    strategy -- string, 'random' or 'consistent',
+    deadline -- float, perf_counter time to stop,
+    interval -- float, seconds between two guesses of this bot, 0 for none,
+    rng -- random.Random.
+    Returns None.
+    '''
+    async def timed(request):
+        start = time.perf_counter()
+        response = await endpoint.request(request)
+        report.latency.record(time.perf_counter() - start)
+        report.requests += 1
+        if not response.get('ok'):
+            report.errors += 1
+        return response
+    next_time = time.perf_counter()
+    while time.perf_counter() < deadline:
+        response = await timed({'op': 'new', 'username': 'bot'})
+        if not response.get('ok'):
+            await asyncio.sleep(max(interval, RETRY_DELAY)) # never spin, the other bots must run
+            continue
+        session = response['session']
+        bot = ConsistentGuessStrategy(DEFAULT_CONFIG) if strategy == 'consistent' else RandomBot(DEFAULT_CONFIG, rng)
+        while time.perf_counter() < deadline:
+            if interval:
+                next_time += interval
+                await asyncio.sleep(max(0.0, next_time - time.perf_counter()))
+            guess = bot.next_guess()
+            response = await timed({'op': 'guess', 'session': session, 'colors': guess})
+            if not response.get('ok'):
+                break
+            if response['state'] != 'playing':
+                report.games += 1
+                break
+            bot.observe(guess, response['bulls'], response['cows'])
+            if not interval:
+                await asyncio.sleep(0) # let the other bots and the server run
+
+async def generate_load(bots=100, duration=10.0, ramp_up=0.0, rate=0.0,
+                        strategy='consistent', endpoint='inprocess', seed=0):
+    '''
+    Function that runs the bots against a server of its own, on localhost only.
+    Parameters: bots -- integer, number of players,
+    duration -- float, seconds of load,
+    ramp_up -- float, seconds over which the bots start,
+    rate -- float, target guesses per second of all bots, 0 for as fast as possible,
+    strategy -- string, 'random' or 'consistent',
+    endpoint -- string, 'inprocess' or 'unix',
+    seed -- integer.
+    Returns dict, see LoadReport.summary.
+    '''
+    server = GameServer()
+    report = LoadReport()
+    with tempfile.TemporaryDirectory() as directory:
+        serving = None
+        if endpoint == 'unix':
+            ready = asyncio.Event()
+            target = UnixEndpoint(os.path.join(directory, 'game.sock'))
+            serving = asyncio.create_task(server.serve(unix_path=target.path, ready=ready))
+            await ready.wait()
+        else:
+            target = InProcessEndpoint(server)
+        deadline = time.perf_counter() + ramp_up + duration
+        interval = bots / rate if rate else 0.0
+
+        async def start_bot(i):
+            await asyncio.sleep(ramp_up * i / bots)
+            connection = await target.connect()
+            try:
+                await run_bot(connection, report, strategy, deadline, interval, random.Random(seed + i))
+            finally:
+                await connection.close()
+
+        report.started = time.perf_counter()
+        await asyncio.gather(*(start_bot(i) for i in range(bots)))
+        report.finished = time.perf_counter()
+        if serving is not None:
+            serving.cancel()
+            try:
+                await serving
+            except asyncio.CancelledError:
+                pass
+    return report.summary()
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulated players against a local MasterMind server')
+    parser.add_argument('--bots', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of full load')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='seconds over which the bots start')
+    parser.add_argument('--rate', type=float, default=0.0, help='target guesses per second, 0 for no limit')
+    parser.add_argument('--strategy', choices=['random', 'consistent'], default='consistent')
+    parser.add_argument('--endpoint', choices=['inprocess', 'unix'], default='unix')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+    summary = asyncio.run(generate_load(args.bots, args.duration, args.ramp_up, args.rate,
+                                        args.strategy, args.endpoint))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    latency = summary['latency_ms']
+    print(f"{summary['games']} games in {summary['seconds']:.1f} s: "
+          f"{summary['games_per_second']:,.0f} games/sec, {summary['requests_per_second']:,.0f} requests/sec")
+    print(f"latency ms: p50 {latency['p50']:.2f}, p95 {latency['p95']:.2f}, "
+          f"p99 {latency['p99']:.2f}, max {latency['max']:.2f}")
+    print(f"errors: {summary['error_rate']:.2%}")
+
+if __name__ == "__main__":
+    main()
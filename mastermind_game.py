@@ -1,78 +1,40 @@
-import os.path # to check if the leaders file exists
-import random # to generate a secret code
+import argparse
+import functools
 import time 
 import turtle
 import sys # only make sure when quit option no error display
 import tkinter # only make sure when close the window no error display
-
-MARBLE_RADIUS = 16
-PEG_RADIUS = 4
-SCREEN_WIDTH = 700
-SCREEN_HEIGHT = 700
-LEADERS_FILE = 'leaders.txt'
-colors = ['red', 'blue', 'green', 'yellow', 'purple', 'black']
-
-class Point:
-   '''
-   Class: Point
-   Attributes: x, y
-   Methods: delta_x, delta_y.
-   '''
-   def __init__(self, x, y):
-       '''
-       Constructor: Create a new instance of a point,
-       Parameters:
-       self -- the current object,
-       x -- the coordinate x of this point,
-       y -- the coordinate y of this point.
-       '''
-       self.x = x
-       self.y = y
-       
-   def delta_x(self, other):
-       '''
-       Method: get the distance between two points on the x-axis.
-       Parameters:
-       self -- the current point,
-       other -- another point.
-       returns the distance between two points on the x-axis.
-       '''
-       return abs(self.x - other.x)
-
-   def delta_y(self, other):
-       '''
-       Method: get the distance between two points on the y-axis. 
-       Parameters:
-       self -- the current point,
-       other -- another point.
-       returns the distance between two points on the y-axis.
-       '''
-       return abs(self.y - other.y)
-
-def count_bulls_and_cows(secret_code, current_guess):
-    '''
-    Function that evaluates the user's score.
-    Parameters: secret_code and current_guess are lists of strings of 4 colors.
-    Returns integers, the counts of bulls and cows.
-    '''
-    bulls = 0 
-    cows = 0 # initial value to track the updates
-    for i in range(len(current_guess)):
-        if current_guess[i] == secret_code[i]:
-            bulls += 1 # the colors and positions same
-        if current_guess[i] in secret_code and \
-           current_guess[i] != secret_code[i]:
-            cows += 1 # the colors are there but not the same index
-    return bulls, cows
+from game_engine import GameEngine, count_bulls_and_cows, colors, WON, LOST, QUIT
+from solver import compute_hint, MINIMAX
+from background import BackgroundTasks
+from opening_book import get_opening_book, NO_NODE
+from instrumentation import enable, enable_from_env, FORMATS
+from leaderboard import LeaderBoard, LEADERS_LOG
+from renderer import BoardRenderer, draw_circle
+from Point import Point
+from replay import ReplayLog, REPLAYS_FILE
+from assets import AssetRegistry
+from hit_test import HitGrid, marble_box, shape_box
+from candidates import CandidateSet
+from layout import MARBLE_RADIUS, PEG_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT, ROWS, PEGS, \
+     RECTANGLES, OPTION_BUTTONS, TEXT_BUTTONS, HINT_POSITION, MESSAGE_POSITION, MESSAGES, LEADERS_FONT, \
+     BUTTON_FONT, COUNT_FONT, pointer_position, color_marble_position, peg_position, color_button_position, \
+     leader_position, count_position
+
+AUTO_PLAY_DELAY = 500 # milliseconds between two auto-play moves
+TOP_LEADERS = 5 # leaders shown on the board
+LEADERS_FILE = LEADERS_LOG
 
 class Marble:
     '''
     Class: Marble
-    Attributes: position, color, radius
-    Methods: new_pen, set_color, get_color, draw, draw_empty, erase,
+    Attributes: position, color, radius, renderer, layer
+    Methods: set_color, get_color, look, draw, draw_empty, erase,
     clicked_in_region.
     '''
-    def __init__(self, position, color, radius):
+    __slots__ = ('color', 'position', 'visible', 'is_empty', 'radius', 'renderer', 'layer')
+
+    def __init__(self, position, color, radius, renderer, layer='marbles'):
         '''
         Constructor: Create a new instance of a marble,
         Parameters:
@@ -80,24 +42,17 @@ class Marble:
         position --  reuse the class Point, the coordinates where the turtle
                     starts to draw the marble,
         color -- string, color fill in the marble,
-        radius -- integer, radius of the marble.    
+        radius -- integer, radius of the marble,
+        renderer -- BoardRenderer, paints the marble with a shared pen,
+        layer -- string, the name of the shared pen.
         '''
-        self.pen = self.new_pen()
-        self.pen.speed('fastest')
         self.color = color
         self.position = position
         self.visible = False
         self.is_empty = True
-        self.pen.hideturtle()
         self.radius = radius
-        self.pen.speed(0)  # set to the fastest drawing
-
-    def new_pen(self):
-        '''
-        Method: start a turtle pen
-        Parameters: self -- the current marble to be drawn.
-        '''
-        return turtle.Turtle()
+        self.renderer = renderer
+        self.layer = layer
 
     def set_color(self, color):
         '''
@@ -118,48 +73,45 @@ class Marble:
         '''
         return self.color
 
+    def look(self):
+        '''
+        Method: what the marble should look like on screen,
+          the color of an empty marble does not show
+        Parameters: self -- the current marble,
+        returns a tuple (visible, is_empty, color).
+        '''
+        return self.visible, self.is_empty, None if self.is_empty else self.color
+
     def draw(self):
         '''
         Method: draw a color-filled marble at a specified position,
-          with a specified color and radius.
+          with a specified color and radius, on the next flush.
         Parameters: self -- the current marble,
         returns None.
         '''
-        # if self.visible and not self.is_empty:
-        # return
-        self.pen.up()
-        self.pen.goto(self.position.x, self.position.y)
         self.visible = True
         self.is_empty = False
-        self.pen.down()
-        self.pen.fillcolor(self.color)
-        self.pen.begin_fill()
-        self.pen.circle(self.radius)
-        self.pen.end_fill()
+        self.renderer.mark_dirty(self) # skipped if already drawn
 
     def draw_empty(self):
         '''
         Method: draw an empty marble at a specified position and with
-           a specified radius
+           a specified radius, on the next flush.
         Parameters: self -- the current marble,
         returns None.
         '''
-        self.erase()
-        self.pen.up()
-        self.pen.goto(self.position.x, self.position.y)
         self.visible = True
         self.is_empty = True
-        self.pen.down()
-        self.pen.circle(self.radius)
+        self.renderer.mark_dirty(self)
 
     def erase(self):
         '''
-        Method: erase the current marble
+        Method: erase the current marble on the next flush
         Parameters: self -- the current marble,
         returns None.
         '''
         self.visible = False
-        self.pen.clear()
+        self.renderer.mark_dirty(self)
 
     def clicked_in_region(self, x, y):
         '''
@@ -178,26 +130,23 @@ class Marble:
 class MyShape:
     '''
     Class: Myshape
-    Attributes: screen, position, gif_image, width, height
+    Attributes: position, gif_image, width, height
     Methods: clicked_in_region.
     '''
-    def __init__(self, screen, position, gif_image, width, height):
+    def __init__(self, assets, position, gif_image, width, height):
         '''
         Constructor: Create a new instance of a shape,
         Parameters:
         self -- the current object,
+        assets -- AssetRegistry, loads the gif once and stamps it with a pooled turtle,
         position -- reuse class Point, position of the shape,
         gif_name -- string, name of the shape,
         width -- integer, width of the shape,
         height -- integer, height of the shape.
         '''
-        screen.register_shape(gif_image)            
-        self.turtle = turtle.Turtle(shape=gif_image)
-        self.turtle.penup()
+        assets.stamp(gif_image, position) # stamp the gif on canvas
         self.position = position
-        self.turtle.goto(position.x, position.y)
-        self.turtle.stamp() # stamp the gif on canvas
-        self.turtle.hideturtle()
+        self.gif_image = gif_image
         self.width = width
         self.height = height
 
@@ -216,83 +165,158 @@ class MyShape:
         else:
             return False
 
+class TextButton(MyShape):
+    '''
+    Class: TextButton
+    Attributes: position, label, width, height
+    Methods: clicked_in_region (inherited).
+    A framed label that is clickable like a gif shape.
+    '''
+    def __init__(self, position, label, width, height):
+        '''
+        Constructor: Create a new instance of a text button,
+        Parameters:
+        self -- the current object,
+        position -- reuse class Point, center of the button,
+        label -- string, the text of the button,
+        width -- integer, width of the button,
+        height -- integer, height of the button.
+        '''
+        self.turtle = turtle.Turtle()
+        self.turtle.hideturtle()
+        self.turtle.speed(0)
+        self.turtle.up()
+        self.turtle.goto(position.x - width // 2, position.y + height // 2)
+        self.turtle.down()
+        for side in (width, height, width, height):
+            self.turtle.forward(side)
+            self.turtle.right(90)
+        self.turtle.up()
+        self.turtle.goto(position.x, position.y - 8)
+        self.turtle.write(label, align='center', font=BUTTON_FONT)
+        self.position = position
+        self.label = label
+        self.width = width
+        self.height = height
+
 def read_leaders():
     '''
-    Function that reads the leaders file,
+    Function that reads the top leaders from the index of the leaders log,
+    a leaders.txt of older versions is moved into the log first,
     Parameters: None,
-    Returns a list of leaders and scores.
+    Returns a list of tuples (score, username), the best first.
     '''
-    if not os.path.exists(LEADERS_FILE):
-        return [] # if file does not exists
-    with open(LEADERS_FILE, 'r') as f:
-        leaders = eval(f.read()) # leaders being read as a list
-    return leaders
+    board = LeaderBoard(LEADERS_FILE)
+    board.migrate() # only does something the first time
+    return board.top(TOP_LEADERS)
 
 def write_leaders(leaders):
     '''
-    Function that writes to the leaders file,
-    Parameters: a list of tuples,
+    Function that appends new leaders to the leaders log,
+    Parameters: a list of tuples (score, username),
     Returns None.
     '''
-    with open(LEADERS_FILE, 'w') as f:
-        f.write(str(leaders))
+    when = time.time()
+    LeaderBoard(LEADERS_FILE).append([(score, username, when) for score, username in leaders])
+
+def record_leader(leader, cancel_event=None):
+    '''
+    Function that appends a new leader and reads the top leaders back,
+    it runs in a worker thread,
+    Parameters: leader -- tuple (score, username), cancel_event -- unused,
+    Returns a list of tuples (score, username), the best first.
+    '''
+    write_leaders([leader]) # the index keeps the best
+    return read_leaders()
+
+def record_game(engine, cancel_event=None):
+    '''
+    Function that appends a finished game to the replay log,
+    it runs in a worker thread,
+    Parameters: engine -- GameEngine, cancel_event -- unused,
+    Returns None.
+    '''
+    ReplayLog(REPLAYS_FILE).append([engine])
 
 class MasterMind:
     '''
     Class: MasterMind
     Attributes: None
-    Methods: move_pointer, draw_rectangles, draw_rectangle,
-    check_color_button_clicked, check_color_buttons_clicked,
-    check_option_buttons_clicked,on_mouse_clicked,
-    update_leaders,process_submit, process_reset, process_quit.
+    Methods: move_pointer, replay_step, record_replay, show_hint, cancel_hint, show_message, draw_rectangles, draw_rectangle,
+    init_click_targets, check_color_button_clicked, click_color,
+    click_submit, click_reset, click_hint, click_auto, on_mouse_clicked,
+    update_leaders, update_count, process_submit, process_reset, process_quit.
     '''
-    def __init__(self):
+    def __init__(self, replay=None, delay=AUTO_PLAY_DELAY):
         '''
         Constructor: Create a new instance of a MasterMind Game,
         Parameters:
-        self -- the current object.   
+        self -- the current object,
+        replay -- ReplayGame, a recorded game to play back instead of asking the user,
+        delay -- integer, milliseconds between two moves of the replay.
         '''
         self.screen = turtle.Screen()
         self.screen.setup(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.screen.title('CS5001 MasterMind Code Game')
+        self.renderer = BoardRenderer(self.screen) # shared pens, one update per event
+        self.assets = AssetRegistry(self.screen, turtle.Turtle) # each gif loaded once, stamped by a few turtles
         self.pointer = turtle.Turtle()
         self.pointer.speed('fastest')
         self.pointer.hideturtle()
 
         self.draw_rectangles() # draw three boards
-        self.color_marbles: list[list[None | Marble]] = [[None for _ in range(4)] for _ in range(10)]
-        self.peg_marbles: list[list[Marble | None]] = [[None for _ in range(4)] for _ in range(10)]
-        self.init_color_marbles() # color marbles set up
-        self.init_peg_marbles() # peg marbles set up 
+        self.color_marbles: list[list[None | Marble]] = [[None for _ in range(PEGS)] for _ in range(ROWS)]
+        self.peg_marbles: list[list[Marble | None]] = [[None for _ in range(PEGS)] for _ in range(ROWS)]
+        self.init_color_marbles() # empty color marbles drawn, made row by row later
+        self.init_peg_marbles() # empty peg marbles drawn, made row by row later
         self.color_buttons: list[None | Marble] = [None for _ in range(len(colors))]
         self.init_button_marbles() # button marbles setup
         self.option_buttons: dict[str, MyShape] = {}
         self.init_option_buttons() # option buttons set up
+        self.click_targets = HitGrid() # clickable regions, found in O(1) per click
+        self.click_handlers = {} # key of a region -> what its click does
+        self.init_click_targets()
 
         self.screen.onclick(self.on_mouse_clicked)# register clicks on canvas
         self.leaders = read_leaders() # read the leaders board when the game starts
         self.init_leader_board()# leader board set up
-        self.username = self.screen.textinput('CS5001 MasterMind Code Game', 'Your username:')
-        self.secret_code = random.sample(colors, 4) # generate random secret code
-        print(self.secret_code) # just for human eyes to compare
-        self.button_clicked: list[bool] = [False for _ in range(len(colors))]
-        self.color_button_enabled: list[bool] = [True for _ in range(len(colors))]
-        self.option_button_enabled: dict[str, bool] = {'submit': False, 'reset': True}
-        self.current_guess = [] # an empty list to keep track of guesses
-        self.current_round = 0 # update the number of rounds
+        self.renderer.flush() # show the board before asking for the username
+        self.replay = replay
+        self.delay = delay
+        if replay is None:
+            self.username = self.screen.textinput('CS5001 MasterMind Code Game', 'Your username:')
+            self.engine = GameEngine(on_win=self.update_leaders) # rules of the game
+        else: # a replay is not a new win
+            self.username = 'replay'
+            self.engine = GameEngine([colors[i] for i in replay.secret])
+        self.tasks = BackgroundTasks(self.screen) # hints and file I/O, off the clicks
+        self.suggestion = None # the guess of the last hint, for auto-play
+        self.book = get_opening_book(self.engine.config) # hints without search, None if too large
+        self.book_node = 0 # where the game is in the book, NO_NODE once it left it
+        self.auto_play = False
+        self.candidates = CandidateSet(self.engine.config) # codes still possible, filtered each round
+        self.count_times: list[tuple[int, float]] = [] # (codes before, seconds) of each filter
+        self.hint_pen = turtle.Turtle()
+        self.hint_pen.hideturtle()
+        print(self.engine.secret_code) # just for human eyes to compare
         self.pointer.color('red') 
         self.move_pointer() # turtle pointer moves along the guesses
+        self.renderer.flush()
+        self.assets.preload() # the end of game gifs, while the user thinks
+        if replay is not None:
+            self.screen.ontimer(self.replay_step, delay)
         self.screen.mainloop() 
 
     def move_pointer(self):
         '''
         Method: indicate and move along the row of current guess,
+          the marbles of the row are made when the pointer gets there
         Parameters: 
         self -- the current game object,
         returns None.
         '''
-        x = -310
-        y = 290 - self.current_round * 50 
+        self.init_row(self.engine.current_round)
+        x, y = pointer_position(self.engine.current_round)
         self.pointer.up()
         self.pointer.setpos(x, y) # go to the starting position that fits the board
         self.pointer.down()
@@ -305,9 +329,10 @@ class MasterMind:
         self -- the current game object,
         returns None.
         '''
-        self.option_buttons['submit'] = MyShape(self.screen, Point(10, -290), 'checkbutton.gif', 60, 60)
-        self.option_buttons['reset'] = MyShape(self.screen, Point(70, -290), 'xbutton.gif', 60, 60)
-        self.option_buttons['quit'] = MyShape(self.screen, Point(240, -290), 'quit.gif', 200, 100) # reuse class
+        for name, (x, y, gif_image, width, height) in OPTION_BUTTONS.items():
+            self.option_buttons[name] = MyShape(self.assets, Point(x, y), gif_image, width, height) # reuse class
+        for name, (x, y, label, width, height) in TEXT_BUTTONS.items():
+            self.option_buttons[name] = TextButton(Point(x, y), label, width, height)
 
     def init_button_marbles(self):
         '''
@@ -316,57 +341,72 @@ class MasterMind:
         self -- the current game object,
         returns None.
         '''
-        start_x = -280
-        start_y = -290
         for i, color in enumerate(colors):
-            x = start_x + i * 40
-            y = start_y
-            self.color_buttons[i] = Marble(Point(x, y), color, MARBLE_RADIUS) # reuse class Marble
+            x, y = color_button_position(i)
+            self.color_buttons[i] = Marble(Point(x, y), color, MARBLE_RADIUS, self.renderer, 'buttons') # reuse class Marble
             self.color_buttons[i].draw()
 
     def init_color_marbles(self):
         '''
-        Method: set up the color marbles
+        Method: draw the empty color marbles of every row with the board pen,
+          their Marble objects are only made by init_row
         Parameters: 
         self -- the current game object,
         returns None.
         '''
-        start_x = -280
-        start_y = 275
-        for row in range(10):
-            for col in range(4):
-                x = col * 50 + start_x
-                y = start_y - row * 50
-                self.color_marbles[row][col] = Marble(Point(x, y), 'white', MARBLE_RADIUS) # reuse class Marble
-                self.color_marbles[row][col].draw()
+        pen = self.renderer.pen('board')
+        pen.pensize(1)
+        for row in range(ROWS):
+            for col in range(PEGS):
+                x, y = color_marble_position(row, col)
+                draw_circle(pen, x, y, MARBLE_RADIUS, 'white')
 
     def init_peg_marbles(self):
         '''
-        Method: set up the peg marbles
+        Method: draw the empty peg marbles of every row with the board pen,
+          their Marble objects are only made by init_row
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        pen = self.renderer.pen('board')
+        pen.pensize(1)
+        for row in range(ROWS):
+            for i in range(PEGS):
+                x, y = peg_position(row, i)
+                draw_circle(pen, x, y, PEG_RADIUS, 'white')
+
+    def init_row(self, row):
+        '''
+        Method: make the color and peg marbles of a row, once, they start
+          as the empty marbles the board already shows
         Parameters: 
         self -- the current game object,
+        row -- integer, the round,
         returns None.
         '''
-        start_x = -50
-        start_y = 300
-        for row in range(10):
-            y = start_y - row * 50
-            for i in range(4):
-                xi = start_x + i % 2 * 32
-                yi = y - i // 2 * 20
-                self.peg_marbles[row][i] = Marble(Point(xi, yi), 'white', PEG_RADIUS) # reuse class Marble
-                self.peg_marbles[row][i].draw()
+        if row >= ROWS or self.color_marbles[row][0] is not None:
+            return # no such row, or made already
+        for col in range(PEGS):
+            x, y = color_marble_position(row, col)
+            self.color_marbles[row][col] = Marble(Point(x, y), 'white', MARBLE_RADIUS, self.renderer) # reuse class Marble
+            self.peg_marbles[row][col] = Marble(Point(*peg_position(row, col)), 'white', PEG_RADIUS, self.renderer, 'pegs')
+        for marble in self.color_marbles[row] + self.peg_marbles[row]:
+            marble.visible = True
+            marble.is_empty = False # drawn filled white, like draw() did
+            self.renderer.assume_painted(marble)
 
     def draw_rectangles(self):
         '''
         Method: draw three boards of marbles, buttons and leaders
+          with the one board pen
         Parameters: 
         self -- the current game object,
         returns None.
         '''
-        self.draw_rectangle(turtle.Turtle(), 5, 'black', -340, 340, 400, 570) # reuse Method 
-        self.draw_rectangle(turtle.Turtle(), 5, 'blue', 100, 340, 220, 570)
-        self.draw_rectangle(turtle.Turtle(), 5, 'black', -340, -240, 670, 100)
+        pen = self.renderer.pen('board')
+        for pensize, color, x, y, width, height in RECTANGLES:
+            self.draw_rectangle(pen, pensize, color, x, y, width, height) # reuse Method 
 
     def draw_rectangle(self, pen: turtle.Turtle, pensize, color, x, y, width, height):
         '''
@@ -387,6 +427,7 @@ class MasterMind:
         pen.color(color)
         pen.up()
         pen.goto(x, y)
+        pen.setheading(0) # the pen may be shared
         pen.down()
         pen.forward(width)
         pen.right(90)
@@ -395,6 +436,7 @@ class MasterMind:
         pen.forward(width)
         pen.right(90)
         pen.forward(height)
+        pen.right(90) # heading east again, as the shared pen is expected
         pen.hideturtle()
 
     def check_color_button_clicked(self, i, button, x, y):
@@ -408,32 +450,27 @@ class MasterMind:
         y -- the coordinate of y where the user clicks,
         returns Boolean, True if clicked.
         '''
-        if not button.clicked_in_region(x, y) or not self.color_button_enabled[i]:
-            return False # the color button is neither clicked nor functioning
-        button.draw_empty() # the color is gone
-        self.color_button_enabled[i] = False # turn off the button 
-        self.current_guess.append(button.color) # get the color to make the guess list
-        self.color_marbles[self.current_round][len(self.current_guess) - 1].color = button.color
-        self.color_marbles[self.current_round][len(self.current_guess) - 1].draw()# color fills 
-        if len(self.current_guess) == 4: # if guess counts to 4
-            for j in range(len(colors)):
-                self.color_button_enabled[j] = False # turn off all color buttons
-            self.option_button_enabled['submit'] = True # turn on submit button
-        return True
+        if not button.clicked_in_region(x, y):
+            return False # the color button is not clicked
+        return self.click_color(i)
 
-    def check_color_buttons_clicked(self, x, y):
+    def click_color(self, i):
         '''
-        Method: check if color buttons are clicked
+        Method: put the color of a clicked button in the next empty marble
         Parameters: 
         self -- the current game object,
-        x -- the coordinate of x where the user clicks,
-        y -- the coordinate of y where the user clicks,
-        returns Boolean, True if clicked.
+        i -- the index of the color button,
+        returns Boolean, True if the color was picked.
         '''
-        for i, button in enumerate(self.color_buttons): # iterate all the color buttons
-            if self.check_color_button_clicked(i, button, x, y): # the method above reused
-                return True
-        return False
+        if not self.engine.pick_color(i):
+            return False # the color button is not functioning
+        button = self.color_buttons[i]
+        button.draw_empty() # the color is gone
+        engine = self.engine
+        marble = self.color_marbles[engine.current_round][len(engine.current_guess) - 1]
+        marble.color = button.color
+        marble.draw() # color fills 
+        return True
 
     def process_submit(self):
         '''
@@ -442,33 +479,55 @@ class MasterMind:
         self -- the current game object,
         returns None.
         '''
-        self.option_button_enabled['submit'] = False # not functioning
-        bulls, cows = count_bulls_and_cows(self.secret_code, self.current_guess) # function reused
+        row = self.peg_marbles[self.engine.current_round] # pegs of this round
+        result = self.engine.submit()
+        if result is None:
+            return # submit is not functioning
+        bulls, cows = result
+        self.cancel_hint() # an old hint is no use any more
+        if self.book is not None:
+            guess = self.engine.history[-1][0]
+            followed = guess == self.book.guess(self.book_node)
+            self.book_node = self.book.child(self.book_node, bulls, cows) if followed else NO_NODE
         for i in range(bulls):
-            self.peg_marbles[self.current_round][i].color = 'black'
-            self.peg_marbles[self.current_round][i].draw() # draw black pegs for bulls
+            row[i].color = 'black'
+            row[i].draw() # draw black pegs for bulls
         for i in range(bulls, bulls + cows):
-            self.peg_marbles[self.current_round][i].color = 'red'
-            self.peg_marbles[self.current_round][i].draw() # draw red pegs for cows
-        if bulls == 4: # the user wins
-            for i in range(len(colors)):
-                self.color_button_enabled[i] = False # turn off color buttons
-            self.option_button_enabled['submit'] = False # turn off
-            self.option_button_enabled['reset'] = False # turn off
-            MyShape(self.screen, Point(0, 0), 'winner.gif', 183, 84) # gif displays
-            self.update_leaders() # update username and score
+            row[i].color = 'red'
+            row[i].draw() # draw red pegs for cows
+        self.update_count()
+        if self.engine.is_over():
+            self.record_replay()
+        if self.engine.state == WON: # the user wins, leaders updated by the engine
+            self.show_message(WON) # gif displays
             return
-        self.current_round += 1 # otherwise round plus 1
-        if self.current_round == 10:
-            self.option_button_enabled['reset'] = False # turn off 
-            MyShape(self.screen, Point(0, 0), 'Lose.gif', 183, 84) # the user loses
+        if self.engine.state == LOST:
+            self.show_message(LOST) # the user loses
             return
         self.move_pointer() # move pointer set up
-        self.current_guess.clear() # renew the tracker for the next round
         for i in range(len(colors)):
-            self.color_button_enabled[i] = True # turn on color buttons
             self.color_buttons[i].draw() # colors go back
+        self.process_hint() # the codes left are searched while the user thinks
  
+    def update_count(self):
+        '''
+        Method: keep only the codes consistent with the newest guess and
+        its pegs, so each round filters fewer codes, and write how many
+        are left right of the pegs, one text per round
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        guess, bulls, cows = self.engine.history[-1]
+        before = len(self.candidates)
+        start = time.perf_counter()
+        self.candidates.filter(guess, bulls, cows)
+        self.count_times.append((before, time.perf_counter() - start))
+        pen = self.renderer.pen('counts')
+        pen.up()
+        pen.setpos(*count_position(len(self.engine.history) - 1))
+        pen.write(f'{len(self.candidates):,}', font=COUNT_FONT)
+
     def process_reset(self):
         '''
         Method: process the reset of each round
@@ -476,12 +535,12 @@ class MasterMind:
         self -- the current game object,
         returns None.
         '''
-        self.option_button_enabled['submit'] = False # turn off submit button
-        self.current_guess.clear() # renew the tracker 
-        for marble in self.color_marbles[self.current_round]:
+        if not self.engine.reset():
+            return # reset is not functioning
+        self.cancel_hint()
+        for marble in self.color_marbles[self.engine.current_round]:
             marble.draw_empty() # clear the chosen marbles
         for i in range(len(colors)):
-            self.color_button_enabled[i] = True # turn on color buttons
             self.color_buttons[i].draw() # colors go back
 
     def process_quit(self):
@@ -491,48 +550,221 @@ class MasterMind:
         self -- the current game object,
         returns None.
         '''
-        MyShape(self.screen, Point(0, 0), 'quitmsg.gif', 184, 84) # gif displays
-        for i in range(len(colors)):
-            self.color_button_enabled[i] = False # turn off color buttons
-        self.option_button_enabled['submit'] = False 
-        self.option_button_enabled['reset'] = False # turn off option buttons
+        self.show_message(QUIT) # gif displays
+        self.engine.quit() # turn off all the buttons
+        self.record_replay()
+        self.renderer.flush() # show the gif before waiting
+        self.tasks.shutdown() # the files are written before leaving
         time.sleep(1)
         sys.exit(0) # see bottom Note in design.txt 
 
-    def check_option_buttons_clicked(self, x, y):
+    def show_message(self, state):
         '''
-        Method: check if option buttons are clicked
+        Method: stamp the gif of how the game ended in the middle of the board
         Parameters: 
         self -- the current game object,
-        x -- the coordinate of x where the user clicks,
-        y -- the coordinate of y where the user clicks,
+        state -- string, WON, LOST or QUIT,
+        returns None.
+        '''
+        gif_image, _, _ = MESSAGES[state]
+        self.assets.stamp(gif_image, Point(*MESSAGE_POSITION))
+
+    def process_hint(self):
+        '''
+        Method: find the codes still consistent with the pegs so far and
+        the guess to suggest, in the opening book while the game follows
+        it, otherwise searched in a worker thread; show_hint shows them
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        self.cancel_hint()
+        guess = self.book.guess(self.book_node) if self.book is not None else None
+        if guess is not None: # one lookup in the book
+            self.show_hint((int(self.book.sizes[self.book_node]), guess, 0.0))
+            return
+        self.hint_pen.up()
+        self.hint_pen.setpos(*HINT_POSITION)
+        self.hint_pen.write('thinking...', font=("Courier", 10, "bold"))
+        self.tasks.submit('hint', compute_hint, list(self.engine.history), self.engine.config, MINIMAX,
+                          on_done=self.show_hint)
+
+    def show_hint(self, hint):
+        '''
+        Method: show how many codes are left and the suggested guess,
+        called on the turtle thread when the search is done
+        Parameters: 
+        self -- the current game object,
+        hint -- tuple (codes left, guess, seconds), None if it was cancelled,
         returns None.
         '''
+        if hint is None:
+            return
+        remaining, guess, _ = hint # compute_hint is timed by the instrumentation
+        self.suggestion = guess
+        self.hint_pen.clear()
+        self.hint_pen.up()
+        self.hint_pen.setpos(HINT_POSITION[0], HINT_POSITION[1] + 15)
+        self.hint_pen.write(f'{remaining} codes left, try:', font=("Courier", 10, "bold"))
+        self.hint_pen.setpos(*HINT_POSITION)
+        self.hint_pen.write(' '.join(guess), font=("Courier", 10, "bold"))
+        self.renderer.flush()
+        if self.auto_play:
+            self.screen.ontimer(self.auto_play_step, AUTO_PLAY_DELAY)
+
+    def cancel_hint(self):
+        '''
+        Method: drop the hint being searched or shown
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        self.tasks.cancel('hint')
+        self.suggestion = None
+        self.hint_pen.clear()
+
+    def process_auto_play(self):
+        '''
+        Method: turn auto-play on or off, when on the solver plays a move
+        every AUTO_PLAY_DELAY milliseconds until the game ends
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        self.auto_play = not self.auto_play
+        if self.auto_play:
+            self.auto_play_step()
+
+    def auto_play_step(self):
+        '''
+        Method: play the suggested guess as if the user clicked it
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        if not self.auto_play or self.engine.is_over():
+            self.auto_play = False
+            return
+        guess = self.suggestion
+        if guess is None:
+            self.process_hint() # show_hint comes back here
+            return
+        if self.engine.current_guess:
+            self.process_reset() # start the row again
+        for color in guess:
+            self.click_color(colors.index(color))
+        self.process_submit() # searches the next hint, then show_hint comes back here
+        self.renderer.flush()
+
+    def replay_step(self):
+        '''
+        Method: play the next recorded guess as if the user clicked it
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        row = len(self.engine.history)
+        if self.engine.is_over() or row == len(self.replay.guesses):
+            return
+        for i in self.replay.guesses[row]:
+            self.click_color(i)
+        self.process_submit()
+        self.renderer.flush()
+        self.screen.ontimer(self.replay_step, self.delay)
+
+    def record_replay(self):
+        '''
+        Method: append the finished game to the replay log, unless it is a replay
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        if self.replay is None:
+            self.tasks.submit('replay', record_game, self.engine, replace=False)
+
+    def init_click_targets(self):
+        '''
+        Method: index the regions of the color and option buttons, and
+        the handler of each, the color buttons first where they overlap;
+        a handler returns False to pass the click on to the next region
+        Parameters: 
+        self -- the current game object,
+        returns None.
+        '''
+        for i, button in enumerate(self.color_buttons):
+            self.click_targets.add(('color', i), marble_box(button))
+            self.click_handlers[('color', i)] = functools.partial(self.click_color, i)
+        handlers = {'submit': self.click_submit, 'reset': self.click_reset, 'quit': self.process_quit,
+                    'hint': self.click_hint, 'auto': self.click_auto}
         for name, button in self.option_buttons.items():
-            if not button.clicked_in_region(x, y):
-                continue # there is no click
-            if name == 'submit' and self.option_button_enabled['submit']:
-                self.process_submit() # if submit is functioning and clicked
-                return
-            elif name == 'reset' and self.option_button_enabled['reset']:
-                self.process_reset() # if reset is functioning and clicked
-                return
-            elif name == 'quit':
-                self.process_quit() # if quit is functioning and clicked
-                return
+            self.click_targets.add(name, shape_box(button))
+            self.click_handlers[name] = handlers[name]
+
+    def click_submit(self):
+        '''
+        Method: the submit button is clicked
+        Parameters: 
+        self -- the current game object,
+        returns Boolean, True if the guess was submitted.
+        '''
+        if not self.engine.option_button_enabled['submit']:
+            return False
+        self.auto_play = False # the user takes over
+        self.process_submit() # if submit is functioning and clicked
+        return True
+
+    def click_reset(self):
+        '''
+        Method: the reset button is clicked
+        Parameters: 
+        self -- the current game object,
+        returns Boolean, True if the round was reset.
+        '''
+        if not self.engine.option_button_enabled['reset']:
+            return False
+        self.auto_play = False # the user takes over
+        self.process_reset() # if reset is functioning and clicked
+        return True
+
+    def click_hint(self):
+        '''
+        Method: the hint button is clicked
+        Parameters: 
+        self -- the current game object,
+        returns Boolean, True if the game is on.
+        '''
+        if self.engine.is_over():
+            return False
+        self.process_hint() # if the game is on and hint is clicked
+        return True
+
+    def click_auto(self):
+        '''
+        Method: the auto button is clicked
+        Parameters: 
+        self -- the current game object,
+        returns Boolean, True if the game is on.
+        '''
+        if self.engine.is_over():
+            return False
+        self.process_auto_play() # if the game is on and auto is clicked
+        return True
 
     def on_mouse_clicked(self, x, y):
         '''
-        Method: Put two sets of buttons into use by clicking
+        Method: Put the buttons into use by clicking, the regions under the
+        click are looked up in the grid and their handlers called in order
+        until one takes the click, as a used color button passes it on
         Parameters: 
         self -- the current game object,
         x -- the coordinate of x where the user clicks,
         y -- the coordinate of y where the user clicks,
         returns None.
         '''
-        if self.check_color_buttons_clicked(x, y):
-            return
-        self.check_option_buttons_clicked(x, y) # combine two types of clicks
+        for key in self.click_targets.hits(x, y):
+            if self.click_handlers[key]():
+                break # the click is taken
+        self.renderer.flush() # one screen update per click
 
     def init_leader_board(self):
         '''
@@ -545,29 +777,40 @@ class MasterMind:
         '''
         pen = turtle.Turtle() 
         pen.up()
-        pen.setpos(120, 290)
+        pen.setpos(*leader_position(-1))
         pen.down()
-        pen.write('Leaders:', font=("Courier", 24, "bold"))
+        pen.write('Leaders:', font=LEADERS_FONT)
         for i, leader in enumerate(self.leaders): # enumerate the sorted list
             pen.up()
-            pen.setpos(120, 260 - 30 * i)
+            pen.setpos(*leader_position(i))
             pen.down()
-            pen.write(f'{leader[0]} {leader[1]}', font=("Courier", 24, "bold"))
+            pen.write(f'{leader[0]} {leader[1]}', font=LEADERS_FONT)
         pen.hideturtle()
 
-    def update_leaders(self):
+    def update_leaders(self, score):
         '''
-        Method: append the new leader information, sort the list, and write to the leaders file
+        Method: append the new leader to the leaders log and read the top
+        leaders back, in a worker thread
         Parameters: 
         self -- the current game object,
+        score -- integer, the number of rounds the user took to win,
         returns None.
         '''
-        leader = (self.current_round + 1, self.username) # score and username
-        self.leaders.append(leader) # append a new leader
-        self.leaders = sorted(self.leaders, key=lambda x: x[0])[:5] # sorting based on the score , take top 5
-        write_leaders(self.leaders) # write to the leaders file
+        def done(leaders):
+            self.leaders = leaders # other games may have written too
+        leader = (score, self.username) # score and username
+        self.tasks.submit('leaders', record_leader, leader, on_done=done, replace=False)
 
 def main():
+   parser = argparse.ArgumentParser(description='CS5001 MasterMind Code Game')
+   parser.add_argument('--metrics', choices=FORMATS,
+                       help='time the hot paths and write their latencies at exit, also MASTERMIND_METRICS')
+   parser.add_argument('--metrics-file', help='where the metrics go, stderr by default')
+   args = parser.parse_args()
+   if args.metrics:
+      enable(args.metrics, args.metrics_file)
+   else:
+      enable_from_env() # off unless the variable is set
    try:
       MasterMind()
    except tkinter.TclError:
@@ -0,0 +1,236 @@
+import argparse
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from game_engine import GameConfig, DEFAULT_CONFIG, CODE_LENGTH, NUM_ROUNDS, colors
+from feedback_table import TABLE_DIR, MAX_TABLE_CODES, encode_feedback, get_feedback_table
+from solver import Solver, MINIMAX, EXPECTED_SIZE
+
+BOOK_VERSION = 1
+# Variants of up to this many codes get the whole decision tree, the
+# standard game (360 codes) has a few hundred nodes. Larger ones keep
+# only the first BOOK_PLIES guesses, deeper nodes are searched live.
+MAX_BOOK_CODES = 2000
+BOOK_PLIES = 2
+NO_NODE = -1
+
+class OpeningBook:
+    '''
+    Class: OpeningBook
+    Attributes: config, method, plies, guesses, sizes, children, codes, path
+    Methods: guess, child, node_for, depths, save, load, build.
+    The solver's decision tree: node 0 is the first guess and the child
+    of a node for a feedback is the next guess, so each suggestion of a
+    game is one lookup from the node of the round before.
+    '''
+    def __init__(self, config, method, plies, guesses, sizes, children, directory=None):
+        '''
+        Constructor: Create a new instance of an opening book,
+        Parameters:
+        self -- the current object,
+        config -- GameConfig, method -- string, MINIMAX or EXPECTED_SIZE,
+        plies -- integer, guesses kept from the root, None for the whole tree,
+        guesses -- numpy array, code index of the guess of each node, NO_NODE past plies,
+        sizes -- numpy array, codes still possible at each node,
+        children -- numpy array [node, feedback], the next node or NO_NODE,
+        directory -- string, where the book files are kept.
+        '''
+        self.config = config
+        self.method = method
+        self.plies = plies
+        self.guesses = guesses
+        self.sizes = sizes
+        self.children = children
+        self.codes = get_feedback_table(config.palette, config.code_length, config.allow_repeats).codes
+        self.path = book_path(config, method, directory)
+
+    def guess(self, node):
+        '''
+        Method: the guess to play at a node
+        Parameters: self -- the current book, node -- integer,
+        returns a list of color strings, or None if the node is not in the book.
+        '''
+        if node == NO_NODE or self.guesses[node] == NO_NODE:
+            return None
+        return [self.config.palette[c] for c in self.codes[self.guesses[node]]]
+
+    def child(self, node, bulls, cows):
+        '''
+        Method: the node after the guess of a node got its pegs
+        Parameters: self -- the current book, node -- integer,
+        bulls, cows -- integers, the pegs,
+        returns an integer, NO_NODE if the book does not go there.
+        '''
+        if node == NO_NODE:
+            return NO_NODE
+        return int(self.children[node, encode_feedback(bulls, cows, self.config.code_length)])
+
+    def node_for(self, history):
+        '''
+        Method: the node of a game whose guesses followed the book
+        Parameters: self -- the current book,
+        history -- list of (guess, bulls, cows),
+        returns an integer, NO_NODE if a guess left the book.
+        '''
+        node = 0
+        for guess, bulls, cows in history:
+            if guess != self.guess(node):
+                return NO_NODE
+            node = self.child(node, bulls, cows)
+        return node
+
+    def depths(self):
+        '''
+        Method: the guesses the book needs against every secret
+        Parameters: self -- the current book,
+        returns a collections.Counter, guesses -> secrets, None counts
+        the secrets that go past the book.
+        '''
+        table = get_feedback_table(self.config.palette, self.config.code_length, self.config.allow_repeats).table
+        depths = collections.Counter()
+        for secret in range(len(self.codes)):
+            node, guesses = 0, 1
+            while True:
+                guess = self.guesses[node]
+                if guess == NO_NODE:
+                    depths[None] += 1
+                    break
+                if guess == secret:
+                    depths[guesses] += 1
+                    break
+                node = self.children[node, table[secret, guess]]
+                guesses += 1
+        return depths
+
+    def save(self):
+        '''
+        Method: write the book to its file, replaced in one step
+        Parameters: self -- the current book,
+        returns None.
+        '''
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, guesses=self.guesses, sizes=self.sizes, children=self.children,
+                     plies=np.array(NO_NODE if self.plies is None else self.plies))
+        os.replace(temp_path, self.path)
+
+    @classmethod
+    def load(cls, config=DEFAULT_CONFIG, method=MINIMAX, directory=None):
+        '''
+        Method: read the book of a variant
+        Parameters: cls -- OpeningBook, config -- GameConfig,
+        method -- string, directory -- string,
+        returns OpeningBook, or None if it was never built.
+        '''
+        path = book_path(config, method, directory)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            plies = int(data['plies'])
+            return cls(config, method, None if plies == NO_NODE else plies,
+                       data['guesses'], data['sizes'], data['children'], directory)
+
+    @classmethod
+    def build(cls, config=DEFAULT_CONFIG, method=MINIMAX, plies=None, directory=None):
+        '''
+        Method: play the solver against every feedback it can get, breadth first
+        Parameters: cls -- OpeningBook, config -- GameConfig,
+        method -- string, MINIMAX or EXPECTED_SIZE,
+        plies -- integer, guesses to keep, None for the whole tree,
+        directory -- string,
+        returns OpeningBook.
+        '''
+        solver = Solver(config, method)
+        table = solver.feedback.table
+        length = config.code_length
+        win = encode_feedback(length, 0, length)
+        guesses, sizes, children = [], [], []
+        queue = collections.deque([(solver.candidates, 0)]) # node i is the i-th in the queue
+        next_node = 1
+        while queue:
+            candidates, depth = queue.popleft()
+            sizes.append(len(candidates))
+            row = np.full((length + 1) ** 2, NO_NODE, dtype=np.int32)
+            children.append(row)
+            if plies is not None and depth >= plies:
+                guesses.append(NO_NODE)
+                continue
+            solver.candidates = candidates
+            guess = solver.best_guess()
+            guesses.append(guess)
+            feedback = np.asarray(table[candidates, guess])
+            for value in np.unique(feedback).tolist():
+                if value == win:
+                    continue # the game is won, no next guess
+                row[value] = next_node
+                next_node += 1
+                queue.append((candidates[feedback == value], depth + 1))
+        return cls(config, method, plies, np.array(guesses, dtype=np.int32),
+                   np.array(sizes, dtype=np.int32), np.array(children), directory)
+
+def book_path(config, method, directory=None):
+    '''
+    Function that names the file of a book, after its variant and method.
+    Parameters: config -- GameConfig, method -- string, directory -- string.
+    Returns a string.
+    '''
+    key = json.dumps([BOOK_VERSION, config.palette, config.code_length, config.allow_repeats, method])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    return os.path.join(directory or TABLE_DIR, f'book-{digest}.npz')
+
+_books = {}
+
+def get_opening_book(config=DEFAULT_CONFIG, method=MINIMAX):
+    '''
+    Function that returns the book of a variant, read from its file or
+    built and saved the first time, one per process and variant.
+    Parameters: config -- GameConfig, method -- string, MINIMAX or EXPECTED_SIZE.
+    Returns OpeningBook, or None if the variant is too large for a
+    feedback table and every guess must be searched live.
+    '''
+    key = (config, method)
+    if key not in _books:
+        book = None
+        if config.code_count() <= MAX_TABLE_CODES:
+            book = OpeningBook.load(config, method)
+            if book is None:
+                plies = None if config.code_count() <= MAX_BOOK_CODES else BOOK_PLIES
+                book = OpeningBook.build(config, method, plies)
+                book.save()
+        _books[key] = book
+    return _books[key]
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the opening book of a variant')
+    parser.add_argument('--method', choices=[MINIMAX, EXPECTED_SIZE], default=MINIMAX)
+    parser.add_argument('--plies', type=int, help='guesses to keep, the whole tree by default if small')
+    parser.add_argument('--colors', type=int, default=len(colors), help='size of the palette')
+    parser.add_argument('--pegs', type=int, default=CODE_LENGTH, help='length of the code')
+    parser.add_argument('--repeats', action='store_true', help='allow repeated colors')
+    args = parser.parse_args()
+    palette = (colors + [f'color{i}' for i in range(len(colors), args.colors)])[:args.colors]
+    config = GameConfig(palette, args.pegs, NUM_ROUNDS, args.repeats)
+    plies = args.plies
+    if plies is None and config.code_count() > MAX_BOOK_CODES:
+        plies = BOOK_PLIES
+    start = time.perf_counter()
+    book = OpeningBook.build(config, args.method, plies)
+    book.save()
+    print(f'{len(book.guesses)} nodes in {time.perf_counter() - start:.2f} s, '
+          f'{os.path.getsize(book.path):,} bytes in {book.path}')
+    depths = book.depths()
+    played = {guesses: count for guesses, count in depths.items() if guesses is not None}
+    if played:
+        games = sum(played.values())
+        print(f'  {games} secrets in the book: mean {sum(k * v for k, v in played.items()) / games:.3f} '
+              f'guesses, worst {max(played)}')
+    if depths[None]:
+        print(f'  {depths[None]} secrets go past the {book.plies} plies kept, searched live')
+
+if __name__ == "__main__":
+    main()
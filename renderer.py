@@ -0,0 +1,111 @@
+import turtle
+
+BACKGROUND = 'white'
+
+class BoardRenderer:
+    '''
+    Class: BoardRenderer
+    Attributes: screen, pens, dirty, painted, draw_calls, flush_draw_calls
+    Methods: pen, mark_dirty, flush.
+    Draws marbles with a few shared pens while the screen tracer is off:
+    marbles only mark themselves dirty, and flush paints the ones whose
+    look really changed, then updates the screen once per event.
+    '''
+    def __init__(self, screen, new_pen=turtle.Turtle):
+        '''
+        Constructor: Create a new instance of a renderer,
+        Parameters:
+        self -- the current object,
+        screen -- turtle.Screen, tracer is turned off,
+        new_pen -- callable that makes a pen, turtle.Turtle by default.
+        '''
+        self.screen = screen
+        self.screen.tracer(0) # nothing shows until flush calls update
+        self.new_pen = new_pen
+        self.pens = {} # one pen per layer
+        self.dirty = {} # id of marble -> marble, in marking order
+        self.painted = {} # id of marble -> the look it was last painted with
+        self.draw_calls = 0 # marbles painted since the start
+        self.flush_draw_calls: list[int] = [] # marbles painted by each flush
+
+    def pen(self, layer):
+        '''
+        Method: the shared pen of a layer, made on first use
+        Parameters: self -- the current renderer, layer -- string,
+        returns a turtle.Turtle.
+        '''
+        if layer not in self.pens:
+            pen = self.new_pen()
+            pen.hideturtle()
+            pen.speed(0)
+            pen.setundobuffer(None) # never undone, no need to remember
+            self.pens[layer] = pen
+        return self.pens[layer]
+
+    def mark_dirty(self, marble):
+        '''
+        Method: remember that a marble must be looked at on the next flush
+        Parameters: self -- the current renderer, marble -- Marble,
+        returns None.
+        '''
+        self.dirty[id(marble)] = marble
+
+    def flush(self):
+        '''
+        Method: paint the dirty marbles that look different from the last
+        time they were painted, then update the screen once
+        Parameters: self -- the current renderer,
+        returns integer, the number of marbles painted.
+        '''
+        count = 0
+        for key, marble in self.dirty.items():
+            look = marble.look()
+            if self.painted.get(key) == look:
+                continue # drawn already, nothing to do
+            self.paint(marble, look)
+            self.painted[key] = look
+            count += 1
+        self.dirty.clear()
+        self.draw_calls += count
+        self.flush_draw_calls.append(count)
+        self.screen.update()
+        return count
+
+    def paint(self, marble, look):
+        '''
+        Method: paint one marble over whatever was there,
+        an erased marble is painted in the background color
+        Parameters: self -- the current renderer, marble -- Marble,
+        look -- tuple (visible, is_empty, color) from Marble.look,
+        returns None.
+        '''
+        visible, is_empty, color = look
+        fill = BACKGROUND if is_empty or not visible else color
+        draw_circle(self.pen(marble.layer), marble.position.x, marble.position.y,
+                    marble.radius, fill, 'black' if visible else BACKGROUND)
+
+    def assume_painted(self, marble):
+        '''
+        Method: record that a marble already shows as it looks now,
+        e.g. it was part of the static board, so nothing is painted
+        Parameters: self -- the current renderer, marble -- Marble,
+        returns None.
+        '''
+        self.painted[id(marble)] = marble.look()
+
+def draw_circle(pen, x, y, radius, fill, outline='black'):
+    '''
+    Function that draws a filled circle, the way turtle marbles are drawn.
+    Parameters: pen -- turtle.Turtle, x, y -- where the circle starts,
+    radius -- integer, fill, outline -- strings, colors.
+    Returns None.
+    '''
+    pen.up()
+    pen.goto(x, y)
+    pen.setheading(0) # the circle is above (x, y) only when heading east
+    pen.down()
+    pen.pencolor(outline)
+    pen.fillcolor(fill)
+    pen.begin_fill()
+    pen.circle(radius)
+    pen.end_fill()
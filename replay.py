@@ -0,0 +1,271 @@
+import argparse
+import concurrent.futures
+import itertools
+import mmap
+import os
+import struct
+import time
+from game_engine import GameEngine, DEFAULT_CONFIG, QUIT
+from board_state import STATES, MAX_COLORS, SIZE, pack_nibbles, unpack_nibbles
+from feedback_table import encode_feedback
+from leaderboard import locked
+
+REPLAYS_FILE = 'replays.bin'
+MAGIC = b'MMRP\x01' # start of a replay log, version 1
+# size of the record, colors, pegs, rounds, flags (repeats, then the final
+# state in bits 1-2), start time, number of guesses; then the secret and
+# the guesses as color indexes two per byte, one feedback byte per guess
+# and the milliseconds from the start to each guess
+RECORD = struct.Struct('<HBBBBdB')
+REPEATS = 1
+
+class ReplayGame:
+    '''
+    Class: ReplayGame
+    Attributes: variant, secret, guesses, feedback, started, times, state
+    A recorded game: color indexes, packed feedback and seconds since started.
+    '''
+    __slots__ = ('variant', 'secret', 'guesses', 'feedback', 'started', 'times', 'state')
+
+    def __init__(self, variant, secret, guesses, feedback, started, times, state):
+        '''
+        Constructor: Create a new instance of a recorded game,
+        Parameters:
+        self -- the current object,
+        variant -- tuple (colors, pegs, rounds, repeats),
+        secret -- bytes, color indexes of the secret,
+        guesses -- list of bytes, color indexes of each guess,
+        feedback -- bytes, encode_feedback of each guess,
+        started -- float, time.time() when the game started,
+        times -- tuple of floats, seconds from the start to each guess,
+        state -- string, how the game ended.
+        '''
+        self.variant = variant
+        self.secret = secret
+        self.guesses = guesses
+        self.feedback = feedback
+        self.started = started
+        self.times = times
+        self.state = state
+
+def encode_game(engine):
+    '''
+    Function that records a game in the binary form of the replay log.
+    Parameters: engine -- GameEngine, usually a finished game.
+    Returns bytes, 87 for a game of 10 rounds.
+    '''
+    config = engine.config
+    if len(config.palette) > MAX_COLORS:
+        raise ValueError(f'at most {MAX_COLORS} colors fit a replay')
+    index = {color: i for i, color in enumerate(config.palette)}
+    length = config.code_length
+    n = len(engine.history)
+    body = b''.join((
+        pack_nibbles([index[color] for color in engine.secret_code]),
+        pack_nibbles([index[color] for guess, _, _ in engine.history for color in guess]),
+        bytes(encode_feedback(bulls, cows, length) for _, bulls, cows in engine.history),
+        struct.pack(f'<{n}I', *(round((t - engine.started) * 1000) for t in engine.submit_times)),
+    ))
+    flags = (REPEATS if config.allow_repeats else 0) | STATES.index(engine.state) << 1
+    header = RECORD.pack(RECORD.size + len(body), len(config.palette), length, config.rounds,
+                         flags, engine.started, n)
+    return header + body
+
+def decode_game(data, offset):
+    '''
+    Function that reads one record of a replay log.
+    Parameters: data -- bytes or mmap of the log, offset -- integer, start of the record.
+    Returns a tuple (ReplayGame, integer offset of the next record).
+    '''
+    size, n_colors, length, rounds, flags, started, n = RECORD.unpack_from(data, offset)
+    position = offset + RECORD.size
+    secret = bytes(unpack_nibbles(data[position:position + (length + 1) // 2], length))
+    position += (length + 1) // 2
+    indices = unpack_nibbles(data[position:position + (n * length + 1) // 2], n * length)
+    position += (n * length + 1) // 2
+    feedback = bytes(data[position:position + n])
+    times = struct.unpack_from(f'<{n}I', data, position + n)
+    game = ReplayGame((n_colors, length, rounds, bool(flags & REPEATS)), secret,
+                      [bytes(indices[i * length:(i + 1) * length]) for i in range(n)], feedback,
+                      started, tuple(t / 1000 for t in times), STATES[flags >> 1 & 3])
+    return game, offset + size
+
+def iter_offsets(data, start=None, stop=None):
+    '''
+    Function that walks where each record of a replay log starts, without decoding it.
+    Parameters: data -- bytes or mmap of the log,
+    start -- integer, offset of a record, None for the first one,
+    stop -- integer, offset past the last record walked, None for the end.
+    Returns a generator of integers.
+    '''
+    if start is None:
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError('not a replay log')
+        start = len(MAGIC)
+    stop = len(data) if stop is None else stop
+    offset = start
+    while offset < stop:
+        yield offset
+        offset += SIZE.unpack_from(data, offset)[0]
+
+def shard_bounds(data, n_shards):
+    '''
+    Function that splits a replay log into shards of about the same
+    number of bytes, each starting on a record, in one pass that keeps
+    only the bounds.
+    Parameters: data -- bytes or mmap of the log, n_shards -- integer.
+    Returns a list of increasing offsets, the first record, the starts
+    of the next shards and the end of the log.
+    '''
+    bounds = []
+    end = len(data)
+    for offset in iter_offsets(data):
+        if not bounds:
+            bounds.append(offset)
+            first, target = offset, 1
+        elif offset >= first + (end - first) * target // n_shards:
+            bounds.append(offset)
+            target = (offset - first) * n_shards // (end - first) + 1
+    return (bounds or [len(MAGIC)]) + [end]
+
+class ReplayLog:
+    '''
+    Class: ReplayLog
+    Attributes: path
+    Methods: append, games.
+    An append-only file of recorded games; each game is written with a
+    single write, so several games may record into the same log. The
+    first write of a new log, which starts with the header, holds the
+    lock of the log so only one process writes the header.
+    '''
+    def __init__(self, path=REPLAYS_FILE):
+        '''
+        Constructor: Create a new instance of a replay log,
+        Parameters:
+        self -- the current object,
+        path -- string, the log file, made on the first append.
+        '''
+        self.path = path
+
+    def append(self, engines):
+        '''
+        Method: record finished games at the end of the log
+        Parameters: self -- the current log, engines -- iterable of GameEngine,
+        returns None.
+        '''
+        data = b''.join(encode_game(engine) for engine in engines)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size > 0:
+                os.write(fd, data) # the header is there already
+                return
+            with locked(self.path): # another process may be making the log too
+                os.write(fd, data if os.fstat(fd).st_size > 0 else MAGIC + data)
+        finally:
+            os.close(fd)
+
+    def games(self):
+        '''
+        Method: read the recorded games in order
+        Parameters: self -- the current log,
+        returns a generator of ReplayGame.
+        '''
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in iter_offsets(data):
+                yield decode_game(data, offset)[0]
+
+def replay(game, config=DEFAULT_CONFIG):
+    '''
+    Function that plays a recorded game again through the rules of GameEngine.
+    Parameters: game -- ReplayGame, config -- GameConfig it was played in.
+    Returns an integer, the first round whose feedback or end differs from
+    the record, or -1 if the game plays the same.
+    '''
+    length = config.code_length
+    engine = GameEngine([config.palette[i] for i in game.secret], config=config)
+    for row, guess in enumerate(game.guesses):
+        if engine.is_over():
+            return row # the rules ended the game earlier
+        for i in guess:
+            if not engine.pick_color(i):
+                return row # the rules refuse this guess now
+        result = engine.submit()
+        if result is None or encode_feedback(*result, length) != game.feedback[row]:
+            return row
+    if game.state == QUIT and not engine.is_over():
+        engine.quit()
+    return -1 if engine.state == game.state else len(game.guesses)
+
+def replay_shard(path, config, start, stop):
+    '''
+    Function that replays the records of a log between two offsets,
+    it runs in the worker processes.
+    Parameters: path -- string, the log, config -- GameConfig,
+    start, stop -- integers, offsets of the first record and past the last.
+    Returns a tuple (integer games, list of (offset, round) mismatches).
+    '''
+    mismatches = []
+    games = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = start
+        while offset < stop:
+            game, next_offset = decode_game(data, offset)
+            if game.variant != (len(config.palette), config.code_length, config.rounds, config.allow_repeats):
+                raise ValueError(f'the game at offset {offset} was played in another variant')
+            row = replay(game, config)
+            if row >= 0:
+                mismatches.append((offset, row))
+            games += 1
+            offset = next_offset
+    return games, mismatches
+
+def replay_log(path=REPLAYS_FILE, config=DEFAULT_CONFIG, workers=0):
+    '''
+    Function that replays every game of a log as fast as possible.
+    Parameters: path -- string, the log, config -- GameConfig of its games,
+    workers -- integer, processes to shard the log over, 0 replays in this process.
+    Returns a dict with the games, the mismatches as (offset, round), and wall time.
+    '''
+    start_time = time.perf_counter()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        bounds = shard_bounds(data, 1 if workers == 0 else workers * 4) # small shards keep every worker busy
+    games, mismatches = 0, []
+    if workers == 0:
+        games, mismatches = replay_shard(path, config, bounds[0], bounds[-1])
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(replay_shard, path, config, a, b)
+                       for a, b in zip(bounds, bounds[1:]) if a < b]
+            for future in concurrent.futures.as_completed(futures):
+                shard_games, shard_mismatches = future.result()
+                games += shard_games
+                mismatches += shard_mismatches
+    return {'games': games, 'mismatches': sorted(mismatches), 'wall_time': time.perf_counter() - start_time}
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded MasterMind games')
+    parser.add_argument('path', nargs='?', default=REPLAYS_FILE)
+    parser.add_argument('--workers', type=int, default=0,
+                        help='processes to replay with, 0 to replay in this process')
+    parser.add_argument('--show', type=int, metavar='N',
+                        help='replay game N in the turtle window instead')
+    parser.add_argument('--delay', type=int, default=500, help='milliseconds between two moves of --show')
+    args = parser.parse_args()
+    if args.show is not None:
+        from mastermind_game import MasterMind # turtle is only needed to watch
+        game = next(itertools.islice(ReplayLog(args.path).games(), args.show, None), None) \
+            if args.show >= 0 else None
+        if game is None:
+            parser.error(f'{args.path} has no game {args.show}, the games are numbered from 0')
+        MasterMind(replay=game, delay=args.delay)
+        return
+    result = replay_log(args.path, workers=args.workers)
+    rate = result['games'] / result['wall_time'] if result['wall_time'] else 0
+    print(f"{result['games']:,} games replayed in {result['wall_time']:.2f} s, {rate:,.0f} games/sec")
+    for offset, row in result['mismatches']:
+        print(f'  game at offset {offset} differs from round {row + 1}')
+    if not result['mismatches']:
+        print('  every game plays the same')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import itertools
+import numpy as np
+from game_engine import CODE_LENGTH, colors
+
+def code_space(palette=colors, length=CODE_LENGTH, repeats=False):
+    '''
+    Function that lists every code random.sample(palette, length) can produce,
+    or every code of the variant with repeated colors.
+    Parameters: palette -- list of strings, the colors,
+    length -- integer, the number of pegs,
+    repeats -- Boolean, True if a color may be used more than once.
+    Returns a numpy array of shape (codes, length) of color indexes, the row
+    of a code is its compact index, see code_index.
+    '''
+    if repeats: # the codes are the numbers in base len(palette)
+        number = np.arange(len(palette) ** length)
+        codes = np.empty((len(number), length), dtype=np.uint8)
+        for position in range(length - 1, -1, -1):
+            number, codes[:, position] = np.divmod(number, len(palette))
+        return codes
+    codes = list(itertools.permutations(range(len(palette)), length))
+    return np.array(codes, dtype=np.uint8).reshape(len(codes), length)
+
+def code_index(code, palette=colors, repeats=False):
+    '''
+    Function that finds the row of a code in code_space without building it.
+    Parameters: code -- list of color strings or color indexes,
+    palette -- list of strings, the colors,
+    repeats -- Boolean, True if a color may be used more than once.
+    Returns an integer, the compact index of the code.
+    '''
+    digits = [palette.index(c) if isinstance(c, str) else int(c) for c in code]
+    if repeats:
+        index = 0
+        for digit in digits:
+            index = index * len(palette) + digit
+        return index
+    unused = list(range(len(palette)))
+    index = 0
+    for position, digit in enumerate(digits):
+        block = 1 # number of codes sharing the pegs before this one
+        for k in range(len(palette) - position - 1, len(palette) - len(digits), -1):
+            block *= k
+        index += unused.index(digit) * block
+        unused.remove(digit)
+    return index
+
+def encode_codes(codes, palette=colors, index=None):
+    '''
+    Function that turns codes of color names into an integer array.
+    Parameters: codes -- a code or a (nested) sequence of codes, each a list
+    of color strings or already of integers,
+    palette -- list of strings, colors numbered by their index,
+    index -- dict color -> number, shared by codes compared with each other,
+    filled from the palette if None.
+    Colors missing from the palette get numbers after it, one per color
+    name in the shared index, so two different names never match.
+    Returns a numpy array of integers whose last axis is the code.
+    '''
+    array = np.asarray(codes)
+    if array.dtype.kind in 'iu':
+        return array
+    if index is None:
+        index = {}
+    if not index:
+        index.update((color, i) for i, color in enumerate(palette))
+    flat = [index.setdefault(color, len(index)) for color in array.ravel()]
+    return np.array(flat, dtype=np.int16).reshape(array.shape)
+
+def count_bulls_and_cows_batch(secrets, guesses):
+    '''
+    Function that evaluates many guesses against many secrets at once,
+    with the same rules as count_bulls_and_cows, repeated colors included.
+    Parameters: secrets and guesses are codes as accepted by encode_codes,
+    broadcast against each other on every axis but the last, e.g.
+    secrets[:, None] and guesses[None, :] score every pair.
+    Returns two numpy arrays of integers, the counts of bulls and cows.
+    '''
+    index = {} # one numbering for both sides, colors off the palette included
+    secrets = encode_codes(secrets, index=index)
+    guesses = encode_codes(guesses, index=index)
+    length = guesses.shape[-1]
+    shape = np.broadcast_shapes(secrets.shape[:-1], guesses.shape[:-1])
+    bulls = np.zeros(shape, dtype=np.uint8)
+    cows = np.zeros(shape, dtype=np.uint8)
+    for i in range(length): # one pass per peg keeps memory to the batch size
+        guess = guesses[..., i]
+        bulls += guess == secrets[..., i] # the colors and positions same
+        # the k-th peg of a color in the guess matches if the secret
+        # has at least k pegs of that color
+        occurrence = np.ones(guesses.shape[:-1], dtype=np.uint8)
+        for j in range(i):
+            occurrence += guesses[..., j] == guess
+        in_secret = np.zeros(shape, dtype=np.uint8)
+        for j in range(secrets.shape[-1]):
+            in_secret += guess == secrets[..., j]
+        cows += occurrence <= in_secret
+    cows -= bulls # the colors are there but not the same index
+    return bulls, cows
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from game_engine import GameEngine, DEFAULT_CONFIG
+from leaderboard import LeaderBoard, LEADERS_LOG
+
+IDLE_TIMEOUT = 300 # seconds a session may stay silent before it is dropped
+FLUSH_INTERVAL = 1.0 # seconds between two batched leaderboard writes
+
+class Session:
+    '''
+    Class: Session
+    Attributes: session_id, username, engine, last_seen
+    Methods: touch.
+    One game of one player.
+    '''
+    def __init__(self, session_id, username, engine):
+        '''
+        Constructor: Create a new instance of a session,
+        Parameters:
+        self -- the current object,
+        session_id -- string, username -- string,
+        engine -- GameEngine, the rules of this game.
+        '''
+        self.session_id = session_id
+        self.username = username
+        self.engine = engine
+        self.touch()
+
+    def touch(self):
+        '''
+        Method: remember the session was just used
+        Parameters: self -- the current session,
+        returns None.
+        '''
+        self.last_seen = time.monotonic()
+
+class GameServer:
+    '''
+    Class: GameServer
+    Attributes: sessions, config, board, idle_timeout, pending_leaders
+    Methods: handle_request, handle_client, reap_idle, flush_leaders, serve.
+    Hosts many games in one process. Each request and response is one
+    line of JSON; the rules are those of GameEngine, as in the turtle game.
+    Requests: {"op": "new", "username": ...}, then with "session":
+    "pick" (a "color"), "reset", "submit", "guess" (all "colors" at once,
+    then submit), "state" and "quit".
+    '''
+    def __init__(self, config=DEFAULT_CONFIG, board=None, idle_timeout=IDLE_TIMEOUT):
+        '''
+        Constructor: Create a new instance of a server,
+        Parameters:
+        self -- the current object,
+        config -- GameConfig, the variant every session plays,
+        board -- LeaderBoard, where wins are recorded, None for no records,
+        idle_timeout -- float, seconds before a silent session is dropped.
+        '''
+        self.config = config
+        self.board = board
+        self.idle_timeout = idle_timeout
+        self.sessions: dict[str, Session] = {}
+        self.pending_leaders = [] # (score, username, when) not written yet
+        self.ids = itertools.count(1)
+
+    def new_session(self, username):
+        '''
+        Method: start a game with its own secret
+        Parameters: self -- the current server, username -- string,
+        returns Session.
+        '''
+        session_id = str(next(self.ids))
+        def on_win(score):
+            self.pending_leaders.append((score, username, time.time()))
+        session = Session(session_id, username, GameEngine(on_win=on_win, config=self.config))
+        self.sessions[session_id] = session
+        return session
+
+    def state(self, session):
+        '''
+        Method: what a client sees of a game, never the secret while playing
+        Parameters: self -- the current server, session -- Session,
+        returns dict.
+        '''
+        engine = session.engine
+        state = {'ok': True, 'session': session.session_id, 'state': engine.state,
+                 'round': engine.current_round, 'guess': engine.current_guess}
+        if engine.is_over():
+            state['secret'] = engine.secret_code
+        return state
+
+    def handle_request(self, request):
+        '''
+        Method: apply one request to its session
+        Parameters: self -- the current server, request -- dict,
+        returns dict, the response.
+        '''
+        op = request.get('op')
+        if op == 'new':
+            session = self.new_session(str(request.get('username', '')))
+            response = self.state(session)
+            response.update(colors=self.config.palette, pegs=self.config.code_length,
+                            rounds=self.config.rounds, repeats=self.config.allow_repeats)
+            return response
+        session = self.sessions.get(str(request.get('session')))
+        if session is None:
+            return {'ok': False, 'error': 'unknown session'}
+        session.touch()
+        engine = session.engine
+        if op == 'pick':
+            if request.get('color') not in self.config.palette:
+                return {'ok': False, 'error': 'unknown color'}
+            if not engine.pick_color(self.config.palette.index(request['color'])):
+                return {'ok': False, 'error': 'color button is off'}
+            return self.state(session)
+        if op == 'reset':
+            if not engine.reset():
+                return {'ok': False, 'error': 'reset is off'}
+            return self.state(session)
+        if op in ('submit', 'guess'):
+            if op == 'guess':
+                colors = request.get('colors')
+                if not isinstance(colors, list) or len(colors) != self.config.code_length \
+                   or any(color not in self.config.palette for color in colors):
+                    return {'ok': False, 'error': 'bad guess'}
+                if engine.current_guess and not engine.reset():
+                    return {'ok': False, 'error': 'reset is off'}
+                for color in colors:
+                    if not engine.pick_color(self.config.palette.index(color)):
+                        engine.reset()
+                        return {'ok': False, 'error': 'color button is off'}
+            result = engine.submit()
+            if result is None:
+                return {'ok': False, 'error': 'submit is off'}
+            response = self.state(session)
+            response['bulls'], response['cows'] = result
+            if engine.is_over():
+                del self.sessions[session.session_id]
+            return response
+        if op == 'state':
+            return self.state(session)
+        if op == 'quit':
+            engine.quit()
+            del self.sessions[session.session_id]
+            return self.state(session)
+        return {'ok': False, 'error': 'unknown op'}
+
+    async def handle_client(self, reader, writer):
+        '''
+        Method: answer the lines of one connection until it closes
+        Parameters: self -- the current server,
+        reader, writer -- asyncio streams of the connection,
+        returns None.
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.handle_request(json.loads(line))
+                except (ValueError, AttributeError):
+                    response = {'ok': False, 'error': 'bad request'}
+                writer.write(json.dumps(response).encode() + b'\n')
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain() # only wait on slow readers
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def reap_idle(self):
+        '''
+        Method: drop the sessions that have been silent too long
+        Parameters: self -- the current server,
+        returns integer, the number dropped.
+        '''
+        deadline = time.monotonic() - self.idle_timeout
+        idle = [key for key, session in self.sessions.items() if session.last_seen < deadline]
+        for key in idle:
+            del self.sessions[key]
+        return len(idle)
+
+    async def flush_leaders(self):
+        '''
+        Method: write the wins since the last flush in one batch, in a
+        worker thread so the event loop keeps answering; if the write
+        fails the batch is pending again, ahead of the newer wins
+        Parameters: self -- the current server,
+        returns None.
+        '''
+        if self.board is None:
+            self.pending_leaders.clear() # nowhere to record them
+        if not self.pending_leaders:
+            return
+        batch, self.pending_leaders = self.pending_leaders, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.board.append, batch)
+        except Exception:
+            self.pending_leaders = batch + self.pending_leaders # tried again on the next flush
+            raise
+
+    async def housekeeping(self):
+        '''
+        Method: reap idle sessions and flush the leaders, forever; an
+        error is reported on stderr and the next round goes on
+        Parameters: self -- the current server,
+        returns None.
+        '''
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                self.reap_idle()
+                await self.flush_leaders()
+            except Exception as error:
+                print(f'mastermind server: housekeeping failed: {error!r}', file=sys.stderr)
+
+    async def serve(self, host='127.0.0.1', port=5001, unix_path=None, ready=None):
+        '''
+        Method: serve until cancelled, on TCP or on a Unix socket
+        Parameters:
+        self -- the current server,
+        host, port -- the TCP address,
+        unix_path -- string, a Unix socket to use instead of TCP,
+        ready -- asyncio.Event, set once connections are accepted,
+        returns None.
+        '''
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        housekeeping = asyncio.create_task(self.housekeeping())
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            housekeeping.cancel()
+            await self.flush_leaders() # no win is lost on shutdown
+
+def main():
+    parser = argparse.ArgumentParser(description='MasterMind game server, one JSON object per line')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--unix', help='serve on this Unix socket instead of TCP')
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT)
+    parser.add_argument('--leaders', default=LEADERS_LOG, help='leaders log, empty for none')
+    args = parser.parse_args()
+    board = LeaderBoard(args.leaders) if args.leaders else None
+    server = GameServer(board=board, idle_timeout=args.idle_timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+import argparse
+import base64
+import os
+import struct
+import time
+import zlib
+from xml.sax.saxutils import escape, quoteattr
+import numpy as np
+from game_engine import GameEngine, DEFAULT_CONFIG, WON, LOST, QUIT
+from board_state import BoardState
+from assets import gif_size
+from leaderboard import LeaderBoard
+from replay import ReplayLog, REPLAYS_FILE
+from candidates import CandidateSet
+from layout import MARBLE_RADIUS, PEG_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT, ROWS, PEGS, \
+     RECTANGLES, OPTION_BUTTONS, TEXT_BUTTONS, MESSAGE_POSITION, MESSAGES, LEADERS_FONT, BUTTON_FONT, \
+     COUNT_FONT, pointer_position, color_marble_position, peg_position, color_button_position, \
+     leader_position, count_position
+
+BACKGROUND = 'white' # as renderer.BACKGROUND, without importing turtle
+TOP_LEADERS = 5 # leaders shown on the board
+# Tk's values of the color names the game draws with, for the PNG
+COLOR_RGB = {
+    'white': (255, 255, 255), 'black': (0, 0, 0), 'red': (255, 0, 0), 'blue': (0, 0, 255),
+    'green': (0, 255, 0), 'yellow': (255, 255, 0), 'purple': (160, 32, 240),
+}
+UNKNOWN_RGB = (128, 128, 128) # colors of larger palettes Tk does not know
+# the images are painted as indexes into these colors, a byte per pixel
+IMAGE_COLORS = list(COLOR_RGB)
+IMAGE_RGB = np.array([COLOR_RGB[color] for color in IMAGE_COLORS] + [UNKNOWN_RGB], dtype=np.uint8)
+# the classic turtle arrow heading east, relative to its tip
+POINTER_SHAPE = ((0, 0), (-9, 5), (-7, 0), (-9, -5))
+TEXT_DESCENT = 0.25 # Tk writes text above the point, the baseline is this many font sizes higher
+PT = 4 / 3 # pixels per point of a font
+# a block font of the digits, 3 by 5, for the counts on the PNG, which has no fonts
+GLYPHS = {
+    '0': ('111', '101', '101', '101', '111'), '1': ('010', '110', '010', '010', '111'),
+    '2': ('111', '001', '111', '100', '111'), '3': ('111', '001', '111', '001', '111'),
+    '4': ('101', '101', '111', '001', '001'), '5': ('111', '100', '111', '001', '111'),
+    '6': ('111', '100', '111', '101', '111'), '7': ('111', '001', '001', '001', '001'),
+    '8': ('111', '101', '111', '101', '111'), '9': ('111', '101', '111', '001', '111'),
+    ',': ('000', '000', '000', '010', '100'),
+}
+
+def screen_point(x, y):
+    '''
+    Function that turns turtle coordinates, centered and upwards, into
+    image coordinates, from the top left corner and downwards.
+    Parameters: x, y -- numbers, turtle coordinates.
+    Returns a tuple of numbers.
+    '''
+    return x + SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - y
+
+def circle_center(x, y, radius):
+    '''
+    Function that finds the center of a circle the turtle draws from
+    (x, y) heading east, as draw_circle does.
+    Parameters: x, y -- numbers, where the circle starts, radius -- number.
+    Returns a tuple of numbers, turtle coordinates.
+    '''
+    return x, y + radius
+
+def button_colors(board):
+    '''
+    Function that finds what the color buttons show: the colors of the
+    guess being made are gone, and those of the last guess once the game
+    is won or lost, as the turtle board leaves them.
+    Parameters: board -- BoardState.
+    Returns a list of color strings, None for an empty button.
+    '''
+    picked = set(board.current)
+    length = board.config.code_length
+    if board.state in (WON, LOST) and board.bulls:
+        picked = set(board.guesses[-length:])
+    return [None if i in picked else color for i, color in enumerate(board.config.palette)]
+
+def pointer_row(board):
+    '''
+    Function that finds the row the red pointer is on.
+    Parameters: board -- BoardState.
+    Returns an integer.
+    '''
+    if board.state in (WON, LOST):
+        return len(board.bulls) - 1 # the pointer stays on the last guess
+    return min(board.current_round, board.config.rounds - 1)
+
+def codes_left(board):
+    '''
+    Function that finds how many codes were still possible after each
+    submitted guess, as the turtle board writes right of the pegs.
+    Parameters: board -- BoardState.
+    Returns a list of integers, one per submitted round.
+    '''
+    palette, length = board.config.palette, board.config.code_length
+    candidates = CandidateSet(board.config)
+    counts = []
+    for row, (bulls, cows) in enumerate(zip(board.bulls, board.cows)):
+        guess = [palette[i] for i in board.guesses[row * length:(row + 1) * length]]
+        candidates.filter(guess, bulls, cows)
+        counts.append(len(candidates))
+    return counts
+
+def board_from_replay(game, config=DEFAULT_CONFIG):
+    '''
+    Function that plays a recorded game again to the board it ended on.
+    Parameters: game -- ReplayGame, config -- GameConfig it was played in.
+    Returns BoardState.
+    '''
+    engine = GameEngine([config.palette[i] for i in game.secret], config=config)
+    for guess in game.guesses:
+        if engine.is_over():
+            break
+        for i in guess:
+            engine.pick_color(i)
+        engine.submit()
+    if game.state == QUIT and not engine.is_over():
+        engine.quit()
+    return BoardState.from_engine(engine)
+
+def svg_circle(x, y, radius, fill, outline='black'):
+    '''
+    Function that writes a marble as an SVG circle.
+    Parameters: x, y -- where the turtle starts the circle,
+    radius -- integer, fill, outline -- strings, colors.
+    Returns a string.
+    '''
+    cx, cy = screen_point(*circle_center(x, y, radius))
+    return f'<circle cx="{cx:g}" cy="{cy:g}" r="{radius}" fill="{fill}" stroke="{outline}"/>'
+
+def svg_text(x, y, text, font, anchor='start'):
+    '''
+    Function that writes text as turtle.write puts it.
+    Parameters: x, y -- turtle coordinates, text -- string,
+    font -- tuple (family, size, weight), anchor -- string, start or middle.
+    Returns a string.
+    '''
+    family, size, weight = font
+    sx, sy = screen_point(x - 1, y) # Tk puts the text a pixel to the left
+    return (f'<text x="{sx:g}" y="{sy - size * PT * TEXT_DESCENT:g}" font-family="{family}" '
+            f'font-size="{size}pt" font-weight="{weight}" text-anchor="{anchor}">{escape(text)}</text>')
+
+_svg_images = {}
+
+def svg_image(gif_image, x, y, embed=True):
+    '''
+    Function that writes a gif stamped at (x, y), at its own size, the
+    gif is read once per process.
+    Parameters: gif_image -- string, the gif file, x, y -- its center,
+    embed -- Boolean, True to put the gif inside the SVG, False to link to the file.
+    Returns a string.
+    '''
+    key = (gif_image, x, y, embed)
+    if key not in _svg_images:
+        width, height = gif_size(gif_image)
+        sx, sy = screen_point(x, y)
+        href = gif_image
+        if embed:
+            with open(gif_image, 'rb') as f:
+                href = 'data:image/gif;base64,' + base64.b64encode(f.read()).decode('ascii')
+        _svg_images[key] = (f'<image x="{sx - width / 2:g}" y="{sy - height / 2:g}" width="{width}" '
+                            f'height="{height}" href={quoteattr(href)}/>')
+    return _svg_images[key]
+
+_static_svg = {}
+
+def static_svg(embed=True):
+    '''
+    Function that writes the parts of the board every game shares, once
+    per process: the boards, the empty marbles and pegs, the option
+    buttons and the title of the leaders.
+    Parameters: embed -- Boolean, True to put the gifs inside the SVG.
+    Returns a string.
+    '''
+    if embed not in _static_svg:
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{SCREEN_WIDTH}" height="{SCREEN_HEIGHT}" '
+                 f'viewBox="0 0 {SCREEN_WIDTH} {SCREEN_HEIGHT}">',
+                 f'<rect width="{SCREEN_WIDTH}" height="{SCREEN_HEIGHT}" fill="{BACKGROUND}"/>']
+        for pensize, color, x, y, width, height in RECTANGLES:
+            sx, sy = screen_point(x, y)
+            parts.append(f'<rect x="{sx:g}" y="{sy:g}" width="{width}" height="{height}" fill="none" '
+                         f'stroke="{color}" stroke-width="{pensize}"/>')
+        for row in range(ROWS):
+            for col in range(PEGS):
+                parts.append(svg_circle(*color_marble_position(row, col), MARBLE_RADIUS, 'white'))
+            for i in range(PEGS):
+                parts.append(svg_circle(*peg_position(row, i), PEG_RADIUS, 'white'))
+        for x, y, gif_image, _, _ in OPTION_BUTTONS.values():
+            parts.append(svg_image(gif_image, x, y, embed))
+        for x, y, label, width, height in TEXT_BUTTONS.values():
+            sx, sy = screen_point(x - width // 2, y + height // 2)
+            parts.append(f'<rect x="{sx:g}" y="{sy:g}" width="{width}" height="{height}" fill="none" stroke="black"/>')
+            parts.append(svg_text(x, y - 8, label, BUTTON_FONT, 'middle'))
+        parts.append(svg_text(*leader_position(-1), 'Leaders:', LEADERS_FONT))
+        _static_svg[embed] = '\n'.join(parts)
+    return _static_svg[embed]
+
+def render_svg(board, leaders=(), embed=True):
+    '''
+    Function that draws a game as the turtle board shows it, as SVG.
+    Parameters: board -- BoardState, leaders -- list of (score, username),
+    embed -- Boolean, True to put the gifs inside the SVG, False to link to the files.
+    Returns a string.
+    '''
+    parts = [static_svg(embed)]
+    for record in board.marbles():
+        if record.color is not None:
+            parts.append(svg_circle(record.position.x, record.position.y, record.radius, record.color))
+    for i, color in enumerate(button_colors(board)):
+        parts.append(svg_circle(*color_button_position(i), MARBLE_RADIUS, color or 'white'))
+    x, y = pointer_position(pointer_row(board))
+    points = ' '.join('%g,%g' % screen_point(x + dx, y + dy) for dx, dy in POINTER_SHAPE)
+    parts.append(f'<polygon points="{points}" fill="red" stroke="red"/>')
+    for row, count in enumerate(codes_left(board)):
+        parts.append(svg_text(*count_position(row), f'{count:,}', COUNT_FONT))
+    for i, (score, username) in enumerate(leaders[:TOP_LEADERS]):
+        parts.append(svg_text(*leader_position(i), f'{score} {username}', LEADERS_FONT))
+    if board.state in MESSAGES:
+        parts.append(svg_image(MESSAGES[board.state][0], *MESSAGE_POSITION, embed))
+    parts.append('</svg>\n')
+    return '\n'.join(parts)
+
+def color_index(color):
+    '''
+    Function that finds the pixel value of a color name.
+    Parameters: color -- string.
+    Returns an integer, its index in IMAGE_RGB.
+    '''
+    return IMAGE_COLORS.index(color) if color in COLOR_RGB else len(IMAGE_COLORS)
+
+_disks = {}
+
+def disk(radius, scale, dx, dy):
+    '''
+    Function that finds the pixels of a circle and of its outline, one
+    per scale and position of the center within a pixel.
+    Parameters: radius -- number, scale -- float,
+    dx, dy -- floats in [0, 1), the center within its pixel.
+    Returns a tuple (fill mask, outline mask) of numpy Boolean arrays.
+    '''
+    key = (radius, scale, round(dx, 2), round(dy, 2))
+    if key not in _disks:
+        r = radius * scale
+        size = int(r) + 2
+        ys, xs = np.ogrid[-size:size + 1, -size:size + 1]
+        distance = np.hypot(xs + 0.5 - dx, ys + 0.5 - dy)
+        line = max(scale, 1) / 2
+        _disks[key] = (distance <= r, np.abs(distance - r) <= line)
+    return _disks[key]
+
+def paint_circle(pixels, x, y, radius, fill, scale, outline='black'):
+    '''
+    Function that paints a marble on an image.
+    Parameters: pixels -- numpy array [row, column] of color indexes,
+    x, y -- where the turtle starts the circle, radius -- integer,
+    fill -- string, scale -- float, outline -- string.
+    Returns None.
+    '''
+    cx, cy = screen_point(*circle_center(x, y, radius))
+    cx, cy = cx * scale, cy * scale
+    column, row = int(cx), int(cy)
+    inside, ring = disk(radius, scale, cx - column, cy - row)
+    size = inside.shape[0] // 2
+    region = pixels[row - size:row + size + 1, column - size:column + size + 1]
+    if region.shape != inside.shape:
+        return # off the image
+    region[inside] = color_index(fill)
+    region[ring] = color_index(outline)
+
+def paint_frame(pixels, x, y, width, height, pensize, color, scale):
+    '''
+    Function that paints the outline of a rectangle as the turtle pen
+    traces it from its top left corner.
+    Parameters: pixels -- numpy array [row, column] of color indexes,
+    x, y -- turtle coordinates of the top left corner,
+    width, height, pensize -- numbers, color -- string, scale -- float.
+    Returns None.
+    '''
+    sx, sy = screen_point(x, y)
+    half = max(pensize * scale, 1) / 2
+    left, top = round(sx * scale - half), round(sy * scale - half)
+    right, bottom = round((sx + width) * scale + half), round((sy + height) * scale + half)
+    line = max(round(2 * half), 1)
+    index = color_index(color)
+    pixels[top:top + line, left:right] = index
+    pixels[bottom - line:bottom, left:right] = index
+    pixels[top:bottom, left:left + line] = index
+    pixels[top:bottom, right - line:right] = index
+
+_glyphs = {}
+
+def paint_digits(pixels, x, y, text, font, scale, color='black'):
+    '''
+    Function that paints a number where turtle.write puts it, in the
+    block font of GLYPHS at about the height of the font.
+    Parameters: pixels -- numpy array [row, column] of color indexes,
+    x, y -- turtle coordinates, text -- string of digits and commas,
+    font -- tuple (family, size, weight), scale -- float, color -- string.
+    Returns None.
+    '''
+    size = font[1]
+    unit = max(round(size * PT / 6 * scale), 1) # pixels per dot of a glyph
+    sx, sy = screen_point(x - 1, y)
+    left = round(sx * scale)
+    top = round((sy - size * PT * TEXT_DESCENT) * scale) - 5 * unit
+    index = color_index(color)
+    for char in text:
+        key = (char, unit)
+        if key not in _glyphs and char in GLYPHS:
+            dots = np.array([[dot == '1' for dot in line] for line in GLYPHS[char]])
+            _glyphs[key] = np.kron(dots, np.ones((unit, unit), dtype=bool))
+        mask = _glyphs.get(key)
+        if mask is not None:
+            region = pixels[top:top + mask.shape[0], left:left + mask.shape[1]]
+            if region.shape == mask.shape:
+                region[mask] = index
+        left += 4 * unit
+
+_static_raster = {}
+
+def static_raster(scale=1.0):
+    '''
+    Function that paints the parts of the board every game shares, once
+    per scale; the gifs and text are left out, an image needs Tk or a
+    gif decoder and fonts for them.
+    Parameters: scale -- float, 0.25 for a thumbnail.
+    Returns a read-only numpy array [row, column] of color indexes.
+    '''
+    if scale not in _static_raster:
+        pixels = np.full((round(SCREEN_HEIGHT * scale), round(SCREEN_WIDTH * scale)), color_index(BACKGROUND),
+                         dtype=np.uint8)
+        for pensize, color, x, y, width, height in RECTANGLES:
+            paint_frame(pixels, x, y, width, height, pensize, color, scale)
+        for x, y, _, width, height in TEXT_BUTTONS.values():
+            paint_frame(pixels, x - width // 2, y + height // 2, width, height, 1, 'black', scale)
+        for row in range(ROWS):
+            for col in range(PEGS):
+                paint_circle(pixels, *color_marble_position(row, col), MARBLE_RADIUS, 'white', scale)
+            for i in range(PEGS):
+                paint_circle(pixels, *peg_position(row, i), PEG_RADIUS, 'white', scale)
+        pixels.flags.writeable = False
+        _static_raster[scale] = pixels
+    return _static_raster[scale]
+
+def render_pixels(board, scale=1.0):
+    '''
+    Function that paints the marbles, pegs, buttons and codes left of a game on an image.
+    Parameters: board -- BoardState, scale -- float.
+    Returns a numpy array [row, column] of color indexes, IMAGE_RGB[pixels] are the colors.
+    '''
+    pixels = static_raster(scale).copy()
+    for record in board.marbles():
+        if record.color is not None:
+            paint_circle(pixels, record.position.x, record.position.y, record.radius, record.color, scale)
+    for i, color in enumerate(button_colors(board)):
+        paint_circle(pixels, *color_button_position(i), MARBLE_RADIUS, color or 'white', scale)
+    for row, count in enumerate(codes_left(board)):
+        paint_digits(pixels, *count_position(row), f'{count:,}', COUNT_FONT, scale)
+    return pixels
+
+def encode_png(pixels, level=1):
+    '''
+    Function that writes an image as a PNG file with a palette, a few
+    flat colors compress well even at the fastest level.
+    Parameters: pixels -- numpy array [row, column] of indexes in IMAGE_RGB,
+    level -- integer, zlib compression level.
+    Returns bytes.
+    '''
+    height, width = pixels.shape
+    rows = np.zeros((height, width + 1), dtype=np.uint8) # each row starts with filter 0
+    rows[:, 1:] = pixels
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)) + \
+           chunk(b'PLTE', IMAGE_RGB.tobytes()) + chunk(b'IDAT', zlib.compress(rows.tobytes(), level)) + \
+           chunk(b'IEND', b'')
+
+def render_png(board, scale=1.0):
+    '''
+    Function that draws a game as a PNG image, without its gifs, text and pointer.
+    Parameters: board -- BoardState, scale -- float, 0.25 for a thumbnail.
+    Returns bytes.
+    '''
+    return encode_png(render_pixels(board, scale))
+
+def main():
+    parser = argparse.ArgumentParser(description='Draw recorded MasterMind games as SVG or PNG, without a display')
+    parser.add_argument('path', nargs='?', default=REPLAYS_FILE, help='the replay log')
+    parser.add_argument('--format', choices=['svg', 'png'], default='svg')
+    parser.add_argument('--out-dir', default='snapshots')
+    parser.add_argument('--game', type=int, metavar='N', help='only game N of the log')
+    parser.add_argument('--limit', type=int, help='at most this many games')
+    parser.add_argument('--scale', type=float, default=1.0, help='size of the PNG, 0.25 for thumbnails')
+    parser.add_argument('--link-images', action='store_true', help='link the gifs instead of putting them in the SVG')
+    parser.add_argument('--leaders', help='leaders log whose top leaders are drawn')
+    args = parser.parse_args()
+    leaders = LeaderBoard(args.leaders).top(TOP_LEADERS) if args.leaders else []
+    os.makedirs(args.out_dir, exist_ok=True)
+    boards = 0
+    start = time.perf_counter()
+    for i, game in enumerate(ReplayLog(args.path).games()):
+        if args.game is not None and i != args.game:
+            continue
+        board = board_from_replay(game)
+        if args.format == 'svg':
+            data = render_svg(board, leaders, not args.link_images).encode('utf-8')
+        else:
+            data = render_png(board, args.scale)
+        with open(os.path.join(args.out_dir, f'game-{i}.{args.format}'), 'wb') as f:
+            f.write(data)
+        boards += 1
+        if boards == args.limit or i == args.game:
+            break
+    elapsed = time.perf_counter() - start
+    print(f'{boards:,} boards in {elapsed:.2f} s, {boards / elapsed if elapsed else 0:,.0f}/sec, in {args.out_dir}')
+
+if __name__ == "__main__":
+    main()
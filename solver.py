@@ -0,0 +1,117 @@
+import time
+import numpy as np
+from game_engine import CODE_LENGTH, DEFAULT_CONFIG
+from scoring import code_index
+from feedback_table import get_feedback_table, encode_feedback
+
+MINIMAX = 'minimax'
+EXPECTED_SIZE = 'expected'
+
+class Solver:
+    '''
+    Class: Solver
+    Attributes: config, method, candidates, latencies
+    Methods: observe, best_guess, suggest.
+    Suggests the next guess by partitioning the codes still consistent
+    with the pegs so far, Knuth's minimax or the smallest expected size.
+    '''
+    def __init__(self, config=DEFAULT_CONFIG, method=MINIMAX):
+        '''
+        Constructor: Create a new instance of a solver,
+        Parameters:
+        self -- the current object,
+        config -- GameConfig, the variant of the game, its code space
+                  must fit in a feedback table,
+        method -- string, MINIMAX or EXPECTED_SIZE.
+        '''
+        self.config = config
+        self.palette = config.palette
+        self.length = config.code_length
+        self.method = method
+        self.feedback = get_feedback_table(self.palette, self.length, config.allow_repeats)
+        self.candidates = np.arange(len(self.feedback.codes))
+        self.latencies = [] # seconds spent in each best_guess
+
+    def observe(self, guess, bulls, cows):
+        '''
+        Method: keep only the candidates that would give the same pegs
+        Parameters:
+        self -- the current solver,
+        guess -- list of color strings, the submitted guess,
+        bulls, cows -- integers, its pegs,
+        returns None.
+        '''
+        column = self.feedback.table[:, code_index(guess, self.palette, self.config.allow_repeats)]
+        feedback = encode_feedback(bulls, cows, self.length)
+        self.candidates = self.candidates[column[self.candidates] == feedback]
+
+    def best_guess(self):
+        '''
+        Method: pick the guess whose worst (or expected) partition of the
+        candidates is the smallest, candidates win ties, then lower indexes,
+        Parameters: self -- the current solver,
+        returns an integer, the code index of the guess,
+        raises ValueError if the pegs observed contradict each other.
+        '''
+        if len(self.candidates) == 0:
+            raise ValueError('no code is consistent with the feedback')
+        start = time.perf_counter()
+        if len(self.candidates) <= 2:
+            guess = int(self.candidates[0]) # any of them can still win now
+        else:
+            scores = partition_scores(self.feedback.table, self.candidates, self.length, self.method)
+            penalty = np.ones(len(scores), dtype=np.int64)
+            penalty[self.candidates] = 0 # a candidate may be the secret itself
+            guess = int(np.lexsort((penalty, scores))[0])
+        self.latencies.append(time.perf_counter() - start)
+        return guess
+
+    def suggest(self):
+        '''
+        Method: the next guess as the UI shows it
+        Parameters: self -- the current solver,
+        returns a list of color strings,
+        raises ValueError like best_guess.
+        '''
+        return [self.palette[c] for c in self.feedback.codes[self.best_guess()]]
+
+def compute_hint(history, config=DEFAULT_CONFIG, method=MINIMAX, cancel_event=None):
+    '''
+    Function that finds the codes still consistent with every peg result
+    so far and suggests a guess, with a solver of its own, so it may run
+    in a worker thread while the game goes on.
+    Parameters: history -- list of (guess, bulls, cows), a copy of the rounds so far,
+    config -- GameConfig, method -- string, MINIMAX or EXPECTED_SIZE,
+    cancel_event -- threading.Event, checked between the steps, or None.
+    Returns a tuple (integer codes left, list of color strings, float seconds),
+    or None if cancelled.
+    '''
+    start = time.perf_counter()
+    solver = Solver(config, method)
+    for guess, bulls, cows in history:
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        solver.observe(guess, bulls, cows)
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    guess = solver.suggest()
+    return len(solver.candidates), guess, time.perf_counter() - start
+
+def partition_scores(table, candidates, length=CODE_LENGTH, method=MINIMAX):
+    '''
+    Function that scores every guess by how it splits the candidates.
+    Parameters: table -- the feedback table indexed [secret, guess],
+    candidates -- numpy array of code indexes,
+    length -- integer, the number of pegs,
+    method -- string, MINIMAX for the largest part, EXPECTED_SIZE for the
+              sum of squared part sizes (the expected size times candidates).
+    Returns a numpy array of integers, lower is better, one per guess.
+    '''
+    n_feedback = (length + 1) ** 2
+    feedback = np.asarray(table[candidates]).T.astype(np.int64) # rows are guesses
+    feedback += np.arange(len(feedback))[:, None] * n_feedback
+    sizes = np.bincount(feedback.ravel(), minlength=len(feedback) * n_feedback)
+    sizes = sizes.reshape(len(feedback), n_feedback)
+    if method == MINIMAX:
+        return sizes.max(axis=1)
+    return (sizes * sizes).sum(axis=1)
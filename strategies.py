@@ -0,0 +1,159 @@
+import abc
+import importlib
+from game_engine import DEFAULT_CONFIG
+from candidates import CandidateSet
+from solver import Solver, MINIMAX, EXPECTED_SIZE
+from consistent_codes import shared_memo
+
+class Strategy(abc.ABC):
+    '''
+    Class: Strategy
+    Attributes: config
+    Methods: next_guess, observe.
+    A guessing strategy plays one game: it is asked for a guess, then
+    told the pegs of that guess, until it wins. Subclass it and pass
+    'module:Class' to evaluate.py to grade your own, it must define
+    both next_guess and observe.
+    '''
+    def __init__(self, config=DEFAULT_CONFIG):
+        '''
+        Constructor: Create a new instance of a strategy for one game,
+        Parameters:
+        self -- the current object,
+        config -- GameConfig, the variant of the game.
+        '''
+        self.config = config
+
+    @abc.abstractmethod
+    def next_guess(self):
+        '''
+        Method: the guess to submit next
+        Parameters: self -- the current strategy,
+        returns a list of color strings.
+        '''
+
+    @abc.abstractmethod
+    def observe(self, guess, bulls, cows):
+        '''
+        Method: learn the pegs of a submitted guess
+        Parameters:
+        self -- the current strategy,
+        guess -- list of color strings,
+        bulls, cows -- integers, its pegs,
+        returns None.
+        '''
+
+class ConsistentGuessStrategy(Strategy):
+    '''
+    Class: ConsistentGuessStrategy
+    Attributes: config, candidates
+    Methods: next_guess, observe.
+    The baseline: always guess the first code that agrees with every
+    peg so far.
+    '''
+    def __init__(self, config=DEFAULT_CONFIG):
+        super().__init__(config)
+        self.candidates = CandidateSet(config)
+
+    def next_guess(self):
+        '''
+        Method: the first code still consistent with the pegs
+        Parameters: self -- the current strategy,
+        returns a list of color strings.
+        '''
+        return self.candidates.first()
+
+    def observe(self, guess, bulls, cows):
+        '''
+        Method: drop the codes that would not give these pegs
+        Parameters: see Strategy.observe,
+        returns None.
+        '''
+        self.candidates.filter(guess, bulls, cows)
+
+class SolverStrategy(Strategy):
+    '''
+    Class: SolverStrategy
+    Attributes: config, solver
+    Methods: next_guess, observe.
+    The hint solver as a strategy, minimax by default.
+    '''
+    method = MINIMAX
+
+    def __init__(self, config=DEFAULT_CONFIG):
+        super().__init__(config)
+        self.solver = Solver(config, self.method)
+
+    def next_guess(self):
+        '''
+        Method: the guess the solver suggests
+        Parameters: self -- the current strategy,
+        returns a list of color strings.
+        '''
+        return self.solver.suggest()
+
+    def observe(self, guess, bulls, cows):
+        '''
+        Method: pass the pegs on to the solver
+        Parameters: see Strategy.observe,
+        returns None.
+        '''
+        self.solver.observe(guess, bulls, cows)
+
+class ExpectedSizeStrategy(SolverStrategy):
+    '''
+    Class: ExpectedSizeStrategy
+    The hint solver with the smallest expected partition size.
+    '''
+    method = EXPECTED_SIZE
+
+class MemoStrategy(Strategy):
+    '''
+    Class: MemoStrategy
+    Attributes: config, history, memo
+    Methods: next_guess, observe.
+    The minimax solver through the memo every game of the process shares,
+    the same guesses as SolverStrategy, only searched once per history.
+    '''
+    method = MINIMAX
+
+    def __init__(self, config=DEFAULT_CONFIG):
+        super().__init__(config)
+        self.history = []
+        self.memo = shared_memo(config, self.method)
+
+    def next_guess(self):
+        '''
+        Method: the guess the memo remembers or ranks for the pegs so far
+        Parameters: self -- the current strategy,
+        returns a list of color strings.
+        '''
+        return self.memo.best_guess(self.history)
+
+    def observe(self, guess, bulls, cows):
+        '''
+        Method: add the pegs to the history
+        Parameters: see Strategy.observe,
+        returns None.
+        '''
+        self.history.append((guess, bulls, cows))
+
+STRATEGIES = {
+    'consistent': ConsistentGuessStrategy,
+    'minimax': SolverStrategy,
+    'expected': ExpectedSizeStrategy,
+    'memo': MemoStrategy,
+}
+
+def load_strategy(name):
+    '''
+    Function that finds a strategy class by name.
+    Parameters: name -- string, a key of STRATEGIES or 'module:Class'.
+    Returns a subclass of Strategy.
+    '''
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f'unknown strategy {name!r}, use one of {sorted(STRATEGIES)} or module:Class')
+    return getattr(importlib.import_module(module), class_name)
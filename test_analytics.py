@@ -0,0 +1,72 @@
+import collections
+import os
+import random
+import tempfile
+import unittest
+from game_engine import GameEngine, WON, LOST, QUIT
+from replay import ReplayLog, MAGIC, shard_bounds
+from analytics import Summary, analyze, summarize
+from test_support import random_game
+
+class TestAnalytics(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the statistics of recorded games.
+    '''
+    def test_summary_counts_the_games(self):
+        '''
+        Function that tests the streamed counts match the games played,
+        serially and sharded over processes.
+        '''
+        rng = random.Random(3)
+        engines = [random_game(rng) for _ in range(300)]
+        quitter = GameEngine(rng=rng)
+        quitter.quit()
+        engines.append(quitter)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'replays.bin')
+            ReplayLog(path).append(engines)
+            summary, _ = analyze(path)
+            sharded, _ = analyze(path, workers=2)
+        self.assertEqual(summary.to_dict(), sharded.to_dict())
+        self.assertEqual(summary.games, 301)
+        self.assertEqual(summary.guesses, sum(len(engine.history) for engine in engines))
+        self.assertEqual(summary.states[QUIT], 1)
+        self.assertEqual(summary.states[WON] + summary.states[LOST], 300)
+        self.assertEqual(summary.rounds_to_win, collections.Counter(
+            len(engine.history) for engine in engines if engine.state == WON))
+        palette = engines[0].config.palette
+        self.assertEqual(summary.first_guesses, collections.Counter(
+            bytes(palette.index(color) for color in engine.history[0][0]) for engine in engines[:300]))
+        self.assertEqual(sum(summary.secret_colors.values()), 301 * 4)
+        shares, chi_square = summary.color_bias(len(palette))
+        self.assertAlmostEqual(sum(shares.values()), 1.0)
+        self.assertLess(chi_square, 20.5) # 0.1% tail of 5 degrees of freedom
+        self.assertAlmostEqual(summary.loss_rate(), summary.states[LOST] / 300)
+
+    def test_shards_cover_the_log(self):
+        '''
+        Function that tests shards start on records, in order, and their
+        summaries add up to the whole log.
+        '''
+        rng = random.Random(4)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'replays.bin')
+            ReplayLog(path).append(random_game(rng) for _ in range(50))
+            with open(path, 'rb') as f:
+                data = f.read()
+        whole = summarize(data)
+        for n_shards in (1, 3, 7, 100):
+            bounds = shard_bounds(data, n_shards)
+            self.assertEqual((bounds[0], bounds[-1]), (len(MAGIC), len(data)))
+            self.assertEqual(bounds, sorted(set(bounds)))
+            self.assertLessEqual(len(bounds), n_shards + 1)
+            merged = Summary()
+            for a, b in zip(bounds, bounds[1:]):
+                merged.merge(summarize(data, a, b))
+            self.assertEqual(merged.to_dict(), whole.to_dict())
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import unittest
+from assets import AssetRegistry, GIF_ASSETS, gif_size
+from Point import Point
+
+class FakeTurtle:
+    '''
+    Class: FakeTurtle
+    A stand-in for turtle.Turtle that remembers its stamps.
+    '''
+    def __init__(self):
+        self.stamps = []
+        self.gif = None
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def shape(self, gif_image):
+        self.gif = gif_image
+
+    def stamp(self):
+        self.stamps.append(self.gif)
+        return len(self.stamps)
+
+class FakeScreen:
+    '''
+    Class: FakeScreen
+    A stand-in for turtle.Screen that counts the shapes registered and
+    keeps the timers to run them by hand.
+    '''
+    def __init__(self):
+        self.registered = []
+        self.timers = []
+
+    def register_shape(self, gif_image):
+        self.registered.append(gif_image)
+
+    def ontimer(self, callback, delay):
+        self.timers.append(callback)
+
+    def run_timers(self):
+        timers, self.timers = self.timers, []
+        for callback in timers:
+            callback()
+
+class TestAssets(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the gifs are loaded once and stamped by a pool.
+    '''
+    def test_load_once_and_reuse_turtles(self):
+        '''
+        Function that tests each gif is registered once however often it
+        is stamped, and the stamps share the turtles of the pool.
+        '''
+        screen = FakeScreen()
+        assets = AssetRegistry(screen, FakeTurtle, pool_size=2)
+        for _ in range(3):
+            for gif_image in ('winner.gif', 'Lose.gif', 'quitmsg.gif'):
+                assets.stamp(gif_image, Point(0, 0))
+        self.assertEqual(screen.registered, ['winner.gif', 'Lose.gif', 'quitmsg.gif'])
+        self.assertEqual(len(assets.pool), 2)
+        self.assertEqual(sum(len(pen.stamps) for pen in assets.pool), 9)
+        self.assertEqual(gif_size('winner.gif'), (183, 83))
+        stats = assets.stats()
+        self.assertEqual((stats['assets'], stats['turtles']), (3, 2))
+        self.assertEqual(stats['image_bytes'], sum(w * h * 4 for w, h in map(gif_size, screen.registered)))
+
+    def test_preload_one_per_tick(self):
+        '''
+        Function that tests the preload loads one gif per timer tick, and
+        skips the gifs already loaded or stamped meanwhile.
+        '''
+        screen = FakeScreen()
+        assets = AssetRegistry(screen, FakeTurtle)
+        assets.load(GIF_ASSETS[0])
+        assets.preload()
+        assets.preload() # asked twice, loaded once
+        self.assertEqual(len(screen.timers), 1)
+        screen.run_timers()
+        self.assertEqual(screen.registered, GIF_ASSETS[:2])
+        assets.stamp(GIF_ASSETS[-1], Point(0, 0)) # needed before its turn
+        while screen.timers:
+            screen.run_timers()
+        self.assertEqual(sorted(screen.registered), sorted(GIF_ASSETS))
+        self.assertEqual(len(screen.registered), len(GIF_ASSETS))
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import contextlib
+import io
+import itertools
+import os
+import tempfile
+import threading
+import time
+import unittest
+from background import BackgroundTasks
+from game_engine import colors, count_bulls_and_cows
+from test_support import stub_turtle
+from mastermind_game import MasterMind
+from solver import compute_hint
+
+class FakeScreen:
+    '''
+    Class: FakeScreen
+    A stand-in for turtle.Screen that keeps the timers to run them by hand.
+    '''
+    def __init__(self):
+        self.timers = []
+
+    def ontimer(self, callback, delay):
+        self.timers.append(callback)
+
+    def run_timers(self):
+        timers, self.timers = self.timers, []
+        for callback in timers:
+            callback()
+
+def wait_and_poll(tasks, screen):
+    '''
+    Function that lets the worker threads finish, then polls as the turtle loop would.
+    Parameters: tasks -- BackgroundTasks, screen -- FakeScreen.
+    Returns None.
+    '''
+    for task in list(tasks.tasks):
+        try:
+            task.future.result(timeout=10)
+        except Exception:
+            pass
+    screen.run_timers()
+
+class TestBackgroundTasks(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests work off the turtle thread.
+    '''
+    def test_results_and_cancel(self):
+        '''
+        Function that tests results come back on poll, and cancelled ones never do.
+        '''
+        screen = FakeScreen()
+        tasks = BackgroundTasks(screen)
+        results = []
+        started = threading.Event()
+        def slow(cancel_event):
+            started.set()
+            while not cancel_event.is_set():
+                time.sleep(0.001)
+            return 'late'
+        tasks.submit('hint', slow, on_done=results.append)
+        started.wait(10)
+        tasks.submit('hint', lambda cancel_event: 'fresh', on_done=results.append) # replaces the slow one
+        tasks.submit('leaders', lambda cancel_event: 'saved', on_done=results.append, replace=False)
+        self.assertEqual(len(screen.timers), 1) # one poll for all the tasks
+        wait_and_poll(tasks, screen)
+        self.assertEqual(sorted(results), ['fresh', 'saved'])
+        self.assertFalse(tasks.polling)
+        tasks.shutdown()
+
+    def test_failed_task_keeps_polling(self):
+        '''
+        Function that tests a task that raises is reported, and the other
+        tasks and the later ones still come back.
+        '''
+        screen = FakeScreen()
+        tasks = BackgroundTasks(screen)
+        results = []
+        def fail(cancel_event):
+            raise OSError('disk full')
+        tasks.submit('leaders', fail, on_done=results.append, replace=False)
+        tasks.submit('replay', lambda cancel_event: 'recorded', on_done=results.append, replace=False)
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            wait_and_poll(tasks, screen)
+        self.assertEqual(results, ['recorded'])
+        self.assertIn('leaders failed', errors.getvalue())
+        self.assertFalse(tasks.polling)
+        tasks.submit('hint', lambda cancel_event: 'later', on_done=results.append)
+        self.assertEqual(len(screen.timers), 1) # polling starts again
+        wait_and_poll(tasks, screen)
+        self.assertEqual(results, ['recorded', 'later'])
+        tasks.shutdown()
+
+    def test_hint_left_codes(self):
+        '''
+        Function that tests the hint counts the codes consistent with every peg result.
+        '''
+        guess = ['red', 'blue', 'purple', 'black']
+        expected = [list(code) for code in itertools.permutations(colors, 4)
+                    if count_bulls_and_cows(list(code), guess) == (2, 0)]
+        remaining, suggestion, _ = compute_hint([(guess, 2, 0)])
+        self.assertEqual(remaining, len(expected))
+        self.assertEqual(len(suggestion), 4)
+        cancel_event = threading.Event()
+        cancel_event.set()
+        self.assertIsNone(compute_hint([], cancel_event=cancel_event))
+
+    def test_game_hint_off_the_clicks(self):
+        '''
+        Function that tests a submit starts a hint in the background and a reset cancels it.
+        '''
+        with tempfile.TemporaryDirectory() as directory, stub_turtle(os.path.join(directory, 'leaders.log')):
+            game = MasterMind()
+            game.tasks.screen = screen = FakeScreen()
+            game.engine.secret_code = ['red', 'blue', 'green', 'yellow']
+            for i in (0, 1, 4, 5): # red, blue, purple, black
+                button = game.color_buttons[i]
+                game.check_color_button_clicked(i, button, button.position.x, button.position.y)
+            game.process_submit()
+            self.assertEqual([task.name for task in game.tasks.tasks], ['hint'])
+            wait_and_poll(game.tasks, screen)
+            self.assertEqual(len(game.suggestion), 4)
+            game.process_hint()
+            button = game.color_buttons[0]
+            game.check_color_button_clicked(0, button, button.position.x, button.position.y)
+            game.process_reset()
+            self.assertEqual(game.tasks.tasks, [])
+            self.assertIsNone(game.suggestion)
+            game.tasks.shutdown()
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import contextlib
+import io
+import os
+import tempfile
+import types
+import unittest
+from benchmark import compare, main_suite, bench_board_construction, bench_marble_draw
+
+class TestBenchmarkSuite(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the regression check of the benchmarks.
+    '''
+    def test_compare_with_baseline(self):
+        '''
+        Function that tests only changes for the worse beyond the threshold fail.
+        '''
+        baseline = {'games': {'value': 100.0, 'unit': 'games/sec', 'higher_is_better': True},
+                    'draw': {'value': 10.0, 'unit': 'us', 'higher_is_better': False}}
+        metrics = {'games': {'value': 70.0, 'unit': 'games/sec', 'higher_is_better': True},
+                   'draw': {'value': 5.0, 'unit': 'us', 'higher_is_better': False},
+                   'new': {'value': 1.0, 'unit': 'ms', 'higher_is_better': False}}
+        regressions = compare(metrics, baseline, 0.25)
+        self.assertEqual([(name, old, new) for name, old, new, _ in regressions], [('games', 100.0, 70.0)])
+        self.assertEqual(compare(metrics, baseline, 0.5), [])
+
+    def test_missing_baseline_fails(self):
+        '''
+        Function that tests the suite fails at once when there is no baseline to compare with.
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            args = types.SimpleNamespace(baseline=os.path.join(directory, 'none.json'), save_baseline=False)
+            errors = io.StringIO()
+            with contextlib.redirect_stderr(errors):
+                self.assertEqual(main_suite(args), 2)
+        self.assertIn('--save-baseline', errors.getvalue())
+
+    def test_stubbed_turtle(self):
+        '''
+        Function that tests the board is built and drawn without a display.
+        '''
+        self.assertGreater(bench_board_construction(runs=1), 0)
+        self.assertGreater(bench_marble_draw(n_frames=2), 0)
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
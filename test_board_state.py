@@ -0,0 +1,68 @@
+import random
+import unittest
+import mastermind_game
+from board_state import BoardState, Point, pack_boards, unpack_boards
+from game_engine import GameEngine, GameConfig, PLAYING, LOST
+
+class TestBoardState(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the snapshots of a game.
+    '''
+    def test_resume_mid_game(self):
+        '''
+        Function that tests a resumed game plays on like the original.
+        '''
+        engine = GameEngine(['red', 'blue', 'green', 'yellow'])
+        for color in (['red', 'green', 'blue', 'black'], ['purple', 'blue']):
+            for c in color:
+                engine.pick_color(engine.config.palette.index(c))
+            if len(engine.current_guess) == 4:
+                engine.submit()
+        data = BoardState.from_engine(engine).to_bytes()
+        self.assertLess(len(data), 64)
+        resumed = BoardState.from_bytes(data).to_engine()
+        for attribute in ('secret_code', 'history', 'current_guess', 'current_round', 'state',
+                          'color_button_enabled', 'option_button_enabled'):
+            self.assertEqual(getattr(resumed, attribute), getattr(engine, attribute))
+        self.assertEqual(resumed.state, PLAYING)
+        self.assertFalse(resumed.pick_color(1)) # blue is taken this round
+        self.assertTrue(resumed.reset())
+
+    def test_bulk_checkpoint(self):
+        '''
+        Function that tests many finished games survive a checkpoint.
+        '''
+        rng = random.Random(1)
+        engines = []
+        for _ in range(50):
+            engine = GameEngine(rng=rng)
+            while not engine.is_over():
+                for i in rng.sample(range(6), 4):
+                    engine.pick_color(i)
+                engine.submit()
+            engines.append(engine)
+        boards = unpack_boards(pack_boards(BoardState.from_engine(engine) for engine in engines))
+        self.assertEqual([board.to_engine().history for board in boards], [engine.history for engine in engines])
+        lost = next(board for board in boards if board.state == LOST)
+        self.assertEqual(len(lost.to_bytes()), 55) # 53 of header and history, 2 of its last picks
+        self.assertEqual(len(lost.marbles()), 10 * 4 * 2)
+
+    def test_marbles_and_variants(self):
+        '''
+        Function that tests the marble records and a board of another variant.
+        '''
+        engine = GameEngine(['red', 'blue', 'green', 'yellow'])
+        engine.pick_color(0)
+        records = BoardState.from_engine(engine).marbles()
+        self.assertEqual([record.color for record in records], ['red', None, None, None] + [None] * 4)
+        self.assertFalse(hasattr(Point(0, 0), '__dict__'))
+        self.assertIs(Point, mastermind_game.Point) # one Point, from Point.py
+        data = BoardState.from_engine(GameEngine(config=GameConfig(code_length=5, allow_repeats=True))).to_bytes()
+        with self.assertRaises(ValueError):
+            BoardState.from_bytes(data)
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import itertools
+import random
+import unittest
+from game_engine import GameConfig, GameEngine, count_bulls_and_cows, colors
+from scoring import code_space, code_index, count_bulls_and_cows_batch
+from candidates import CandidateSet
+
+class TestRepeatedColors(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests variants with repeated colors.
+    '''
+    def test_duplicates_counted_once(self):
+        '''
+        Function that tests a secret peg is never counted twice.
+        '''
+        self.assertEqual(count_bulls_and_cows(['red', 'red', 'blue', 'blue'],
+                                              ['red', 'blue', 'red', 'red']), (1, 2))
+        self.assertEqual(count_bulls_and_cows(['red', 'blue', 'green', 'yellow'],
+                                              ['blue', 'blue', 'blue', 'blue']), (1, 0))
+
+    def test_batch_agrees_with_repeats(self):
+        '''
+        Function that tests the batch scoring of a whole variant with repeats.
+        '''
+        palette = colors[:4]
+        codes = code_space(palette, 3, repeats=True)
+        self.assertEqual(len(codes), 64)
+        bulls, cows = count_bulls_and_cows_batch(codes[:, None], codes[None, :])
+        for s, secret_code in enumerate(codes.tolist()):
+            self.assertEqual(code_index(secret_code, palette, repeats=True), s)
+            for g, guess in enumerate(codes.tolist()):
+                self.assertEqual((bulls[s, g], cows[s, g]), count_bulls_and_cows(secret_code, guess))
+
+    def test_config(self):
+        '''
+        Function that tests the size of variants and the buttons with repeats.
+        '''
+        self.assertEqual(GameConfig().code_count(), 360)
+        self.assertEqual(GameConfig(colors + ['white', 'orange'], 5, allow_repeats=True).code_count(), 32768)
+        self.assertRaises(ValueError, GameConfig, colors, 7)
+        engine = GameEngine(['red', 'red', 'red'], config=GameConfig(colors, 3, allow_repeats=True))
+        for _ in range(3):
+            self.assertTrue(engine.pick_color(0))
+        self.assertEqual(engine.submit(), (3, 0))
+
+class TestCandidateSet(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the candidate store.
+    '''
+    def test_filter_matches_scoring(self):
+        '''
+        Function that tests the survivors are exactly the consistent codes.
+        '''
+        config = GameConfig(colors, 4, allow_repeats=True)
+        candidates = CandidateSet(config)
+        everything = [list(code) for code in itertools.product(colors, repeat=4)]
+        rng = random.Random(3)
+        secret_code = config.random_code(rng)
+        history = []
+        for _ in range(3):
+            guess = config.random_code(rng)
+            bulls, cows = count_bulls_and_cows(secret_code, guess)
+            history.append((guess, bulls, cows))
+            candidates.filter(guess, bulls, cows)
+        expected = [code for code in everything
+                    if all(count_bulls_and_cows(code, guess) == (b, c) for guess, b, c in history)]
+        self.assertEqual(list(candidates.codes()), expected)
+        self.assertIn(secret_code, expected)
+        self.assertEqual(len(candidates), len(expected))
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import itertools
+import os
+import tempfile
+import unittest
+from consistent_codes import ConsistentCodes, parse_row
+from evaluate import evaluate
+from game_engine import colors, count_bulls_and_cows
+from solver import Solver
+
+HISTORY = [(['red', 'blue', 'green', 'yellow'], 1, 2), (['purple', 'black', 'red', 'blue'], 0, 2)]
+
+class TestConsistentCodes(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the memo of consistent codes.
+    '''
+    def test_codes_and_guess(self):
+        '''
+        Function that tests the codes left and the guess match a full search.
+        '''
+        memo = ConsistentCodes()
+        expected = [list(code) for code in itertools.permutations(colors, 4)
+                    if all(count_bulls_and_cows(list(code), guess) == (bulls, cows) for guess, bulls, cows in HISTORY)]
+        self.assertEqual(sorted(memo.codes(HISTORY)), sorted(expected))
+        solver = Solver()
+        for row in HISTORY:
+            solver.observe(*row)
+        self.assertEqual(memo.best_guess(HISTORY), solver.suggest())
+        self.assertEqual(parse_row('red,blue,green,yellow:1:2'), HISTORY[0])
+
+    def test_inconsistent_history(self):
+        '''
+        Function that tests rows that contradict each other leave no code
+        and no guess, and that impossible pegs are refused.
+        '''
+        memo = ConsistentCodes()
+        history = [parse_row('red,blue,green,yellow:4:0'), parse_row('red,blue,green,purple:4:0')]
+        self.assertEqual(memo.codes(history), [])
+        self.assertIsNone(memo.best_guess(history))
+        for row in ('red,blue,green,yellow:4:1', 'red,blue,green,yellow:-1:2', 'red,blue,green,yellow:x:0',
+                    'red,blue,green,yellow:1'):
+            self.assertRaises(ValueError, parse_row, row)
+
+    def test_hits_and_eviction(self):
+        '''
+        Function that tests the same rows in any order hit, and the oldest entries go first.
+        '''
+        memo = ConsistentCodes(max_entries=3)
+        memo.candidates(HISTORY)
+        self.assertEqual(memo.stats()['misses'], 1)
+        memo.candidates(HISTORY[::-1])
+        memo.candidates(HISTORY)
+        self.assertEqual(memo.stats()['hits'], 2)
+        memo.candidates(HISTORY[:1] + [(['black', 'yellow', 'purple', 'green'], 0, 1)])
+        self.assertEqual(memo.stats()['prefix_hits'], 1)
+        memo.candidates([(['green', 'red', 'black', 'purple'], 1, 1)])
+        stats = memo.stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (3, 1))
+        self.assertNotIn(memo.fingerprint(HISTORY), memo.entries) # its prefix was used since
+
+    def test_save_and_load(self):
+        '''
+        Function that tests a saved memo warms up a new one.
+        '''
+        memo = ConsistentCodes()
+        guess = memo.best_guess(HISTORY)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'memo.npz')
+            memo.save(path)
+            warm = ConsistentCodes()
+            self.assertEqual(warm.load(path), 2)
+            self.assertEqual(warm.best_guess(HISTORY), guess)
+            self.assertEqual(warm.stats()['hits'], 1)
+            self.assertEqual(warm.candidates(HISTORY).tolist(), memo.candidates(HISTORY).tolist())
+            with self.assertRaises(ValueError):
+                ConsistentCodes(method='expected').load(path)
+
+    def test_memo_strategy(self):
+        '''
+        Function that tests the memo strategy plays the same games as the solver.
+        '''
+        memo = evaluate('memo', workers=0)
+        minimax = evaluate('minimax', workers=0)
+        self.assertEqual(memo['histogram'], minimax['histogram'])
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import unittest
+from game_engine import GameConfig, colors
+from evaluate import evaluate, play
+from strategies import Strategy, ConsistentGuessStrategy, load_strategy, STRATEGIES
+
+class TestEvaluate(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests grading strategies over every secret.
+    '''
+    def test_consistent_guess_plays(self):
+        '''
+        Function that tests the baseline wins and the first guess is the first code.
+        '''
+        strategy = ConsistentGuessStrategy()
+        self.assertEqual(strategy.next_guess(), ['red', 'blue', 'green', 'yellow'])
+        self.assertEqual(play(ConsistentGuessStrategy(), ['red', 'blue', 'green', 'yellow']), 1)
+        self.assertLessEqual(play(ConsistentGuessStrategy(), ['black', 'purple', 'yellow', 'green']), 10)
+
+    def test_serial_and_parallel_agree(self):
+        '''
+        Function that tests sharding over processes gives the serial histogram.
+        '''
+        config = GameConfig(colors[:5], 3)
+        serial = evaluate('consistent', config, workers=0)
+        parallel = evaluate('consistent', config, workers=2)
+        self.assertEqual(serial['games'], 60)
+        self.assertEqual(serial['histogram'], parallel['histogram'])
+        self.assertEqual(serial['worst'], max(serial['histogram']))
+
+    def test_load_strategy(self):
+        '''
+        Function that tests strategies load by name or module:Class.
+        '''
+        self.assertIs(load_strategy('consistent'), STRATEGIES['consistent'])
+        self.assertIs(load_strategy('strategies:ConsistentGuessStrategy'), ConsistentGuessStrategy)
+        self.assertRaises(ValueError, load_strategy, 'nope')
+
+    def test_strategy_is_abstract(self):
+        '''
+        Function that tests a strategy missing observe cannot be created.
+        '''
+        class GuessOnly(Strategy):
+            def next_guess(self):
+                return ['red', 'blue', 'green', 'yellow']
+
+        self.assertRaises(TypeError, Strategy)
+        self.assertRaises(TypeError, GuessOnly)
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from game_engine import count_bulls_and_cows, colors
+from scoring import code_index
+from feedback_table import FeedbackTable
+
+class TestFeedbackTable(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the precomputed feedback table.
+    '''
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookup_matches_scoring(self):
+        '''
+        Function that tests every entry of the table against count_bulls_and_cows.
+        '''
+        table = FeedbackTable(directory=self.directory.name)
+        codes = [[colors[c] for c in code] for code in table.codes.tolist()]
+        self.assertEqual(table.table.shape, (360, 360))
+        for s, secret_code in enumerate(codes):
+            for g, guess in enumerate(codes):
+                self.assertEqual(table.lookup(s, g), count_bulls_and_cows(secret_code, guess))
+
+    def test_generated_once(self):
+        '''
+        Function that tests a second table of the same colors reuses the file.
+        '''
+        table = FeedbackTable(directory=self.directory.name)
+        table.table
+        modified = os.path.getmtime(table.path)
+        other = FeedbackTable(directory=self.directory.name)
+        secret_code = ['red', 'blue', 'green', 'yellow']
+        guess = ['yellow', 'blue', 'red', 'black']
+        self.assertEqual(other.lookup(code_index(secret_code), code_index(guess)), (1, 2))
+        self.assertEqual(os.path.getmtime(other.path), modified)
+
+    def test_variants(self):
+        '''
+        Function that tests other colors get their own file and size.
+        '''
+        table = FeedbackTable(colors[:5], 3, directory=self.directory.name)
+        self.assertNotEqual(table.path, FeedbackTable(directory=self.directory.name).path)
+        self.assertEqual(table.table.shape, (60, 60))
+        self.assertRaises(ValueError, FeedbackTable, colors + ['a', 'b', 'c', 'd'], 6)
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from game_engine import GameEngine, NUM_ROUNDS, WON, LOST, QUIT, PLAYING, colors
+
+class TestGameEngine(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the headless rules of the game.
+    '''
+    def pick(self, engine, guess):
+        for color in guess:
+            engine.pick_color(colors.index(color))
+
+    def test_win_calls_hook(self):
+        '''
+        Function that tests a correct guess wins and reports the score.
+        '''
+        scores = []
+        engine = GameEngine(['red', 'blue', 'green', 'yellow'], on_win=scores.append)
+        self.pick(engine, ['red', 'green', 'blue', 'yellow'])
+        self.assertEqual(engine.submit(), (2, 2))
+        self.pick(engine, ['red', 'blue', 'green', 'yellow'])
+        self.assertEqual(engine.submit(), (4, 0))
+        self.assertEqual(engine.state, WON)
+        self.assertEqual(scores, [2])
+        self.assertFalse(engine.option_button_enabled['reset'])
+
+    def test_lose_after_last_round(self):
+        '''
+        Function that tests the game is lost after the last round.
+        '''
+        engine = GameEngine(['red', 'blue', 'green', 'yellow'])
+        for _ in range(NUM_ROUNDS):
+            self.assertEqual(engine.state, PLAYING)
+            self.pick(engine, ['purple', 'black', 'red', 'blue'])
+            engine.submit()
+        self.assertEqual(engine.state, LOST)
+        self.assertTrue(engine.is_over())
+
+    def test_buttons_switch(self):
+        '''
+        Function that tests a color is only taken once and submit waits for 4 colors.
+        '''
+        engine = GameEngine(rng=random.Random(1))
+        self.assertTrue(engine.pick_color(0))
+        self.assertFalse(engine.pick_color(0))
+        self.assertIsNone(engine.submit())
+        self.assertTrue(engine.reset())
+        self.assertEqual(engine.current_guess, [])
+        self.assertTrue(engine.pick_color(0))
+
+    def test_quit(self):
+        '''
+        Function that tests quit turns off every button.
+        '''
+        engine = GameEngine(rng=random.Random(2))
+        engine.quit()
+        self.assertEqual(engine.state, QUIT)
+        self.assertFalse(any(engine.color_button_enabled))
+        self.assertFalse(engine.reset())
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
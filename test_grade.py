@@ -0,0 +1,69 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from game_engine import colors, count_bulls_and_cows
+from grade import grade, grade_chunk
+
+class TestGrade(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests grading rows of secrets and guesses.
+    '''
+    def test_same_as_the_rules(self):
+        '''
+        Function that tests random rows, repeated colors and other lengths
+        included, score as count_bulls_and_cows, in input order when sharded.
+        '''
+        rng = random.Random(6)
+        rows = []
+        for i in range(3000):
+            length = rng.choice([4, 4, 5])
+            rows.append({'id': f'game-{i}', 'secret': [rng.choice(colors) for _ in range(length)],
+                         'guess': [rng.choice(colors) for _ in range(length)]})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'rows.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row) + '\n')
+            serial, sharded = io.StringIO(), io.StringIO()
+            result = grade([path], serial, chunk_rows=500)
+            grade([path], sharded, workers=2, chunk_rows=700)
+        self.assertEqual((result['rows'], result['errors']), (3000, 0))
+        self.assertEqual(serial.getvalue(), sharded.getvalue())
+        for row, line in zip(rows, serial.getvalue().splitlines()):
+            graded = json.loads(line)
+            self.assertEqual(graded['id'], row['id'])
+            self.assertEqual((graded['bulls'], graded['cows']), count_bulls_and_cows(row['secret'], row['guess']))
+
+    def test_csv_and_bad_rows(self):
+        '''
+        Function that tests CSV rows with codes as strings, and that a bad
+        row is reported without stopping the others.
+        '''
+        lines = ['1,red blue green yellow,blue red green black\n', '2,red blue,red\n',
+                 '3,"red,red,blue,blue","blue,red,red,red"\n']
+        text, rows, errors = grade_chunk(lines, 'csv', ['id', 'secret', 'guess'], 10, 'csv')
+        self.assertEqual((rows, errors), (3, 1))
+        out = text.splitlines()
+        self.assertEqual(out[0], '10,1,1,2,')
+        self.assertTrue(out[1].startswith('11,,,,') and 'same number of pegs' in out[1])
+        self.assertEqual(out[2], '12,3,1,2,')
+        text, _, errors = grade_chunk(['["red blue", "blue red"]\n', '{"secret": 1}\n', 'nope\n'], 'jsonl', None, 0)
+        self.assertEqual(errors, 2)
+        self.assertEqual(json.loads(text.splitlines()[0]), {'row': 0, 'bulls': 0, 'cows': 2})
+        lines = ['{"secret": [["a"], "b"], "guess": ["b", "a"]}\n', '{"secret": [1, 2], "guess": [2, {"c": 1}]}\n',
+                 '{"secret": [1, "b"], "guess": ["b", 1]}\n']
+        text, _, errors = grade_chunk(lines, 'jsonl', None, 0)
+        self.assertEqual(errors, 2)
+        out = [json.loads(line) for line in text.splitlines()]
+        self.assertIn('a color is', out[0]['error'])
+        self.assertIn('a color is', out[1]['error'])
+        self.assertEqual(out[2], {'row': 2, 'bulls': 0, 'cows': 2})
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
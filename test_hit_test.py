@@ -0,0 +1,82 @@
+import os
+import random
+import tempfile
+import unittest
+from Point import Point
+from hit_test import HitGrid, marble_box, shape_box
+from test_support import stub_turtle
+from mastermind_game import Marble, MyShape, MasterMind
+
+class TestHitGrid(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the hit grid finds what a scan of the regions finds.
+    '''
+    def test_same_as_scan(self):
+        '''
+        Function that tests random clicks on overlapping marbles and shapes
+        hit the first region a scan in order would hit.
+        '''
+        rng = random.Random(5)
+        regions = [Marble(Point(rng.randint(-300, 300), rng.randint(-300, 300)), 'red', 16, None)
+                   for _ in range(200)]
+        regions += [MyShape.__new__(MyShape) for _ in range(20)]
+        for shape in regions[200:]:
+            shape.position = Point(rng.randint(-300, 300), rng.randint(-300, 300))
+            shape.width, shape.height = rng.randint(10, 200), rng.randint(10, 100)
+        grid = HitGrid()
+        for i, region in enumerate(regions):
+            grid.add(i, marble_box(region) if i < 200 else shape_box(region))
+        for _ in range(5000):
+            x, y = rng.randint(-350, 350), rng.randint(-350, 350)
+            expected = next((i for i, region in enumerate(regions) if region.clicked_in_region(x, y)), None)
+            self.assertEqual(grid.hit(x, y), expected)
+
+    def test_add_and_remove(self):
+        '''
+        Function that tests a region moves when added again, and is gone once removed.
+        '''
+        grid = HitGrid(cell_size=10)
+        grid.add('slot', (0, 0, 15, 15))
+        self.assertEqual(grid.hit(15, 15), 'slot')
+        grid.add('slot', (100, 100, 105, 105))
+        self.assertIsNone(grid.hit(15, 15))
+        self.assertEqual(grid.hit(100, 105), 'slot')
+        self.assertTrue(grid.remove('slot'))
+        self.assertFalse(grid.remove('slot'))
+        self.assertIsNone(grid.hit(100, 100))
+        self.assertEqual(grid.cells, {})
+
+    def test_hits_in_order(self):
+        '''
+        Function that tests every region under a click is found, in the order added.
+        '''
+        grid = HitGrid(cell_size=10)
+        grid.add('b', (5, 5, 30, 30))
+        grid.add('a', (0, 0, 20, 20))
+        grid.add('c', (50, 50, 60, 60))
+        self.assertEqual(grid.hits(10, 10), ['b', 'a'])
+        self.assertEqual(grid.hits(2, 2), ['a'])
+        self.assertEqual(grid.hits(40, 40), [])
+        self.assertEqual(grid.hit(10, 10), 'b')
+
+    def test_click_passes_over_used_color(self):
+        '''
+        Function that tests a click where two color buttons overlap picks
+        the next button once the first color is used, as the scan did.
+        '''
+        with tempfile.TemporaryDirectory() as directory, stub_turtle(os.path.join(directory, 'leaders.log')):
+            game = MasterMind()
+            first, second = game.color_buttons[0], game.color_buttons[1]
+            x = (first.position.x + second.position.x) / 2 + 5 # in both hit boxes
+            game.on_mouse_clicked(first.position.x, first.position.y)
+            game.on_mouse_clicked(x, first.position.y)
+            self.assertEqual(game.engine.current_guess, [first.color, second.color])
+            game.on_mouse_clicked(x, first.position.y) # both colors are used
+            self.assertEqual(len(game.engine.current_guess), 2)
+            game.tasks.shutdown()
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
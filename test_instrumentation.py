@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+import game_engine
+import mastermind_game
+from test_support import stub_turtle
+from instrumentation import enable, disable
+
+class TestInstrumentation(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the opt-in timing of the hot paths.
+    '''
+    def test_off_by_default(self):
+        '''
+        Function that tests nothing is wrapped unless enabled.
+        '''
+        for function in (game_engine.count_bulls_and_cows, mastermind_game.MasterMind.on_mouse_clicked,
+                         mastermind_game.Marble.draw):
+            self.assertFalse(hasattr(function, '__wrapped_by_metrics__'))
+
+    def test_clicks_timed_and_exported(self):
+        '''
+        Function that tests the clicks of a game are counted and dumped as JSON and Prometheus.
+        '''
+        metrics = enable('json')
+        try:
+            with tempfile.TemporaryDirectory() as directory, stub_turtle(os.path.join(directory, 'leaders.log')):
+                game = mastermind_game.MasterMind()
+                for i in range(4):
+                    button = game.color_buttons[i]
+                    game.on_mouse_clicked(button.position.x, button.position.y)
+                game.process_submit()
+                game.tasks.shutdown()
+            counts = {name: histogram.count for name, histogram in metrics.histograms.items()}
+            self.assertEqual(counts['MasterMind.on_mouse_clicked'], 4)
+            self.assertEqual(counts['MasterMind.click_color'], 4)
+            self.assertEqual(counts['HitGrid.hits'], 4)
+            self.assertEqual(counts['count_bulls_and_cows'], 1)
+            self.assertEqual(counts['read_leaders'], 1)
+            self.assertGreaterEqual(counts['Marble.draw'], 4)
+            self.assertIn('"MasterMind.process_submit"', metrics.to_json())
+            text = metrics.to_prometheus()
+            self.assertIn('mastermind_call_seconds_count{call="MasterMind.on_mouse_clicked"} 4', text)
+            self.assertIn('mastermind_call_seconds_bucket{call="count_bulls_and_cows",le="+Inf"} 1', text)
+        finally:
+            disable(metrics)
+        self.assertFalse(hasattr(game_engine.count_bulls_and_cows, '__wrapped_by_metrics__'))
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
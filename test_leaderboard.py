@@ -0,0 +1,137 @@
+import concurrent.futures
+import os
+import tempfile
+import unittest
+from leaderboard import LeaderBoard
+
+def record_many(path, name):
+    board = LeaderBoard(path)
+    for score in range(1, 26):
+        board.record(score, name)
+
+class TestLeaderBoard(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the append-only leader board.
+    '''
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'leaders.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_top_keeps_best(self):
+        '''
+        Function that tests the index keeps the best leaders and the log keeps all.
+        '''
+        board = LeaderBoard(self.path, top_k=3)
+        for score, username in [(5, 'ann'), (3, 'bob'), (7, 'cat'), (3, 'dan'), (1, 'eve'), (9, 'fay')]:
+            board.record(score, username)
+        self.assertEqual(board.top(), [(1, 'eve'), (3, 'bob'), (3, 'dan')])
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 6)
+
+    def test_concurrent_games(self):
+        '''
+        Function that tests games in other processes do not overwrite each other.
+        '''
+        with concurrent.futures.ProcessPoolExecutor(4) as pool:
+            list(pool.map(record_many, [self.path] * 4, ['a', 'b', 'c', 'd']))
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 100)
+        board = LeaderBoard(self.path)
+        self.assertEqual([score for score, _ in board.top(5)], [1, 1, 1, 1, 2])
+        self.assertEqual(board.read_index(), board.rebuild_index())
+
+    def test_compact_and_queries(self):
+        '''
+        Function that tests personal bests and percentiles across segments.
+        '''
+        board = LeaderBoard(self.path, top_k=3)
+        for i in range(40):
+            board.record(1 + i % 10, f'user{i % 7}')
+        self.assertEqual(board.compact(chunk_rows=3), self.path + '.000001')
+        board.record(1, 'user3')
+        board.record(4, 'new')
+        self.assertEqual(board.personal_best('user3'), (1, 7))
+        self.assertEqual(board.personal_best('user6'), (1, 5))
+        self.assertEqual(board.personal_best('new'), (4, 1))
+        self.assertEqual(board.personal_best('nobody'), (None, 0))
+        self.assertEqual(board.compact(), self.path + '.000002')
+        self.assertIsNone(board.compact())
+        self.assertEqual(board.personal_best('user3'), (1, 7))
+        self.assertEqual(board.percentile(0), 100.0)
+        self.assertEqual(board.percentile(11), 0.0)
+        self.assertAlmostEqual(board.percentile(10), 100 * 2 / 42)
+        self.assertEqual(board.top(), [(1, 'user0'), (1, 'user3'), (1, 'user6')])
+        self.assertEqual(board.read_index(), board.rebuild_index())
+
+    def test_personal_best_reads_only_new_wins(self):
+        '''
+        Function that tests a personal best parses only the wins appended
+        since the last query, by this board or another, until compact.
+        '''
+        board, other = LeaderBoard(self.path), LeaderBoard(self.path)
+        self.assertEqual(board.personal_best('ann'), (None, 0))
+        board.record(5, 'ann')
+        other.record(3, 'ann')
+        self.assertEqual(board.personal_best('ann'), (3, 2))
+        read = board._recent[1]
+        self.assertEqual(read, os.path.getsize(self.path))
+        other.record(2, 'bob')
+        self.assertEqual(board.personal_best('bob'), (2, 1))
+        self.assertGreater(board._recent[1], read)
+        other.compact()
+        self.assertEqual(board.personal_best('ann'), (3, 2)) # from the user index only
+        other.record(1, 'ann')
+        self.assertEqual(board.personal_best('ann'), (1, 3))
+        self.assertEqual(board._recent[1], os.path.getsize(self.path))
+
+    def test_stale_sparse_keys(self):
+        '''
+        Function that tests the user index is searched right when compact
+        stopped before its sparse keys were written, or never wrote them.
+        '''
+        board = LeaderBoard(self.path)
+        board.append([(5, f'user{i:03d}', 0.0) for i in range(0, 600, 2)])
+        board.compact()
+        with open(board.users_path + '.sparse', encoding='utf-8') as f:
+            stale = f.read()
+        board.append([(3, f'user{i:03d}', 0.0) for i in range(1, 600, 2)])
+        board.compact()
+        with open(board.users_path + '.sparse', 'w', encoding='utf-8') as f:
+            f.write(stale)
+        for i in (0, 1, 255, 256, 598, 599):
+            self.assertEqual(LeaderBoard(self.path).personal_best(f'user{i:03d}'), (3 + 2 * (i % 2 == 0), 1))
+        os.remove(board.users_path + '.sparse')
+        self.assertEqual(LeaderBoard(self.path).personal_best('user599'), (3, 1))
+
+    def test_rebuild_index(self):
+        '''
+        Function that tests a lost index is rebuilt from the log.
+        '''
+        board = LeaderBoard(self.path)
+        board.record(4, 'tab\\tname')
+        board.record(2, 'ann')
+        os.remove(board.index_path)
+        self.assertEqual(board.top(), [(2, 'ann'), (4, 'tab\\tname')])
+
+    def test_migrate(self):
+        '''
+        Function that tests the old leaders.txt list is moved once, without eval.
+        '''
+        old_path = os.path.join(self.directory.name, 'leaders.txt')
+        with open(old_path, 'w') as f:
+            f.write(str([(2, 'ann'), (4, 'bob')]))
+        board = LeaderBoard(self.path)
+        self.assertEqual(board.migrate(old_path), 2)
+        self.assertEqual(board.migrate(old_path), 0)
+        self.assertEqual(board.top(), [(2, 'ann'), (4, 'bob')])
+        with open(old_path, 'w') as f:
+            f.write("__import__('os').getcwd()")
+        self.assertRaises(ValueError, LeaderBoard(self.path + '2').migrate, old_path)
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
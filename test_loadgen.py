@@ -0,0 +1,66 @@
+import asyncio
+import random
+import time
+import unittest
+from histogram import LatencyHistogram
+from loadgen import InProcessEndpoint, LoadReport, RETRY_DELAY, generate_load, run_bot
+from server import GameServer
+
+class RefusingEndpoint(InProcessEndpoint):
+    '''
+    Class: RefusingEndpoint
+    An in-process endpoint whose server refuses every new game.
+    '''
+    async def request(self, request):
+        return {'ok': False, 'error': 'full'}
+
+class TestLoadGenerator(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the bot players and their report.
+    '''
+    def test_histogram_percentiles(self):
+        '''
+        Function that tests the percentiles are within a bucket of the truth.
+        '''
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000)
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.03)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.05)
+        self.assertEqual(histogram.max, 1.0)
+
+    def test_bots_play_full_games(self):
+        '''
+        Function that tests the bots finish games without errors on both endpoints.
+        '''
+        for endpoint in ('inprocess', 'unix'):
+            summary = asyncio.run(generate_load(bots=5, duration=0.3, endpoint=endpoint))
+            self.assertGreater(summary['games'], 0)
+            self.assertEqual(summary['error_rate'], 0.0)
+            self.assertGreater(summary['latency_ms']['count'], summary['games'])
+            self.assertLessEqual(summary['latency_ms']['p50'], summary['latency_ms']['p99'])
+
+    def test_refused_bot_lets_others_play(self):
+        '''
+        Function that tests a bot the server keeps refusing waits between
+        tries, so the other bots still play.
+        '''
+        async def run():
+            server = GameServer()
+            refused, playing = LoadReport(), LoadReport()
+            deadline = time.perf_counter() + 0.2
+            await asyncio.gather(
+                run_bot(RefusingEndpoint(server), refused, 'random', deadline, 0.0, random.Random(1)),
+                run_bot(InProcessEndpoint(server), playing, 'consistent', deadline, 0.0, random.Random(2)))
+            return refused, playing
+        refused, playing = asyncio.run(run())
+        self.assertGreater(playing.games, 0)
+        self.assertLessEqual(refused.requests, 0.2 / RETRY_DELAY + 2)
+        self.assertEqual(refused.errors, refused.requests)
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
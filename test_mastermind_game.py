@@ -1,5 +1,10 @@
+import itertools
+import os
+import tempfile
 import unittest
-from mastermind_game import count_bulls_and_cows
+from game_engine import colors
+from mastermind_game import MasterMind, count_bulls_and_cows
+from test_support import stub_turtle
 
 class TestCountBullsAndCows(unittest.TestCase):
     '''
@@ -44,6 +49,33 @@ class TestCountBullsAndCows(unittest.TestCase):
         current_guess = ['purple', 'black', 'orange', 'pink']
         result = count_bulls_and_cows(secret_code, current_guess)
         self.assertEqual(result, (0, 0))
+
+class TestCodesLeft(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the count of the codes left on the board.
+    '''
+    def test_game_counts_codes_left(self):
+        '''
+        Function that tests the game keeps the count of the codes left round by round.
+        '''
+        with tempfile.TemporaryDirectory() as directory, stub_turtle(os.path.join(directory, 'leaders.log')):
+            game = MasterMind()
+            game.engine.secret_code = ['red', 'blue', 'green', 'yellow']
+            everything = [list(code) for code in itertools.permutations(colors, 4)]
+            left = []
+            for round_, picks in enumerate([(0, 1, 4, 5), (1, 0, 2, 3)], 1): # red blue purple black, blue red green yellow
+                for i in picks:
+                    game.click_color(i)
+                game.process_submit()
+                expected = [code for code in everything
+                            if all(count_bulls_and_cows(code, guess) == (b, c) for guess, b, c in game.engine.history)]
+                self.assertEqual(len(game.candidates), len(expected))
+                self.assertEqual(len(game.count_times), round_)
+                left.append(len(expected))
+            self.assertEqual(game.count_times[0][0], 360) # the first round filters every code
+            self.assertEqual(game.count_times[1][0], left[0]) # the second only those the first kept
+            game.tasks.shutdown()
+
 def main():
     unittest.main(verbosity = 3)
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from game_engine import GameEngine, GameConfig, colors, count_bulls_and_cows
+from opening_book import OpeningBook, get_opening_book, NO_NODE
+from solver import Solver
+
+class TestOpeningBook(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the precomputed decision tree.
+    '''
+    def test_book_follows_the_solver(self):
+        '''
+        Function that tests each lookup is the guess the live solver would suggest.
+        '''
+        book = get_opening_book()
+        for secret_code in (['red', 'blue', 'green', 'yellow'], ['black', 'purple', 'yellow', 'red']):
+            solver = Solver()
+            node = 0
+            while True:
+                guess = book.guess(node)
+                self.assertEqual(guess, solver.suggest())
+                self.assertEqual(book.sizes[node], len(solver.candidates))
+                bulls, cows = count_bulls_and_cows(secret_code, guess)
+                if bulls == 4:
+                    break
+                solver.observe(guess, bulls, cows)
+                node = book.child(node, bulls, cows)
+        depths = book.depths()
+        self.assertEqual(sum(depths.values()), 360)
+        self.assertLessEqual(max(depths), GameEngine().config.rounds)
+
+    def test_save_load_and_history(self):
+        '''
+        Function that tests the file keeps the tree and a history leaving the book is noticed.
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            book = OpeningBook.build(directory=directory)
+            book.save()
+            loaded = OpeningBook.load(directory=directory)
+            self.assertEqual(loaded.children.tolist(), book.children.tolist())
+            first = book.guess(0)
+            self.assertEqual(loaded.node_for([(first, 1, 1)]), book.child(0, 1, 1))
+            other = [color for color in colors if color not in first][:2] + first[:2]
+            self.assertEqual(loaded.node_for([(other, 1, 1)]), NO_NODE)
+            self.assertIsNone(loaded.guess(NO_NODE))
+
+    def test_large_variant_keeps_first_plies(self):
+        '''
+        Function that tests a book cut after a few plies leaves the rest to live search.
+        '''
+        config = GameConfig(colors, 3, 10, True)
+        with tempfile.TemporaryDirectory() as directory:
+            book = OpeningBook.build(config, plies=1, directory=directory)
+        self.assertIsNotNone(book.guess(0))
+        bulls, cows = count_bulls_and_cows(['red', 'red', 'blue'], book.guess(0))
+        self.assertIsNone(book.guess(book.child(0, bulls, cows)))
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
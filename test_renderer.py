@@ -0,0 +1,134 @@
+import turtle
+import unittest
+from mastermind_game import MasterMind, Marble, Point
+from renderer import BoardRenderer, draw_circle
+from layout import RECTANGLES, MARBLE_RADIUS, color_marble_position
+
+class FakePen:
+    '''
+    Class: FakePen
+    A stand-in for turtle.Turtle that only counts the circles drawn.
+    '''
+    circles = 0
+
+    def circle(self, radius):
+        FakePen.circles += 1
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+class FakeScreen:
+    '''
+    Class: FakeScreen
+    A stand-in for turtle.Screen that counts updates.
+    '''
+    def __init__(self):
+        self.updates = 0
+
+    def tracer(self, n):
+        self.traced = n
+
+    def update(self):
+        self.updates += 1
+
+class TracingPen(turtle.TNavigator):
+    '''
+    Class: TracingPen
+    A turtle with no canvas that remembers every point it moves to.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.trace = []
+
+    def _goto(self, end):
+        self.trace.append(end)
+        super()._goto(end)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def center(self):
+        xs, ys = [p[0] for p in self.trace[1:]], [p[1] for p in self.trace[1:]] # the first is the start
+        self.trace.clear()
+        return (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+
+class TestBoardRenderer(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests marbles are only painted when they change.
+    '''
+    def setUp(self):
+        FakePen.circles = 0
+        self.screen = FakeScreen()
+        self.renderer = BoardRenderer(self.screen, new_pen=FakePen)
+        self.marbles = [Marble(Point(i * 40, 0), 'red', 16, self.renderer) for i in range(6)]
+
+    def test_shared_pen_and_one_update(self):
+        '''
+        Function that tests all marbles share one pen and one update per flush.
+        '''
+        for marble in self.marbles:
+            marble.draw()
+        self.assertEqual(self.renderer.flush(), 6)
+        self.assertEqual(len(self.renderer.pens), 1)
+        self.assertEqual(self.screen.updates, 1)
+        self.assertEqual(self.screen.traced, 0)
+
+    def test_redundant_draws_skipped(self):
+        '''
+        Function that tests drawing a marble again with the same look paints nothing.
+        '''
+        for marble in self.marbles:
+            marble.draw()
+        self.renderer.flush()
+        self.marbles[0].draw_empty() # a color button is clicked
+        for marble in self.marbles:
+            marble.draw() # every button drawn again, as after a submit
+        self.assertEqual(self.renderer.flush(), 0)
+        self.marbles[1].draw_empty()
+        self.marbles[1].draw_empty()
+        self.assertEqual(self.renderer.flush(), 1)
+        self.assertEqual(self.renderer.flush_draw_calls, [6, 0, 1])
+        self.assertEqual(FakePen.circles, self.renderer.draw_calls)
+
+    def test_assume_painted(self):
+        '''
+        Function that tests a marble already on the static board is not painted again.
+        '''
+        marble = Marble(Point(0, 0), 'white', 16, self.renderer)
+        marble.visible = True
+        marble.is_empty = False
+        self.renderer.assume_painted(marble)
+        marble.draw()
+        self.assertEqual(self.renderer.flush(), 0)
+        marble.color = 'red'
+        marble.draw()
+        self.assertEqual(self.renderer.flush(), 1)
+
+    def test_circles_line_up_after_a_board(self):
+        '''
+        Function that tests an empty marble of the static board and the
+        marble painted over it later share one center, above where they
+        start, after the shared pen drew a board.
+        '''
+        pen = TracingPen()
+        pensize, color, x, y, width, height = RECTANGLES[0]
+        MasterMind.draw_rectangle(None, pen, pensize, color, x, y, width, height)
+        self.assertEqual(pen.heading(), 0)
+        pen.trace.clear()
+        x, y = color_marble_position(3, 2)
+        pen.left(90) # whatever the pen drew before
+        draw_circle(pen, x, y, MARBLE_RADIUS, 'white')
+        empty = pen.center()
+        renderer = BoardRenderer(FakeScreen(), new_pen=lambda: pen)
+        Marble(Point(x, y), 'red', MARBLE_RADIUS, renderer).draw()
+        renderer.flush()
+        filled = pen.center()
+        self.assertAlmostEqual(empty[0], x, delta=0.5)
+        self.assertAlmostEqual(empty[1], y + MARBLE_RADIUS, delta=0.5)
+        self.assertAlmostEqual(filled[0], empty[0], delta=0.5)
+        self.assertAlmostEqual(filled[1], empty[1], delta=0.5)
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
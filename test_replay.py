@@ -0,0 +1,93 @@
+import concurrent.futures
+import os
+import random
+import tempfile
+import unittest
+from game_engine import GameEngine, WON, QUIT
+from replay import MAGIC, ReplayLog, encode_game, decode_game, replay, replay_log
+from test_support import random_game
+
+def record_games(path, seed, n_games=10):
+    '''
+    Function that records random games one by one, it runs in the worker processes.
+    Parameters: path -- string, the log, seed -- integer, n_games -- integer.
+    Returns None.
+    '''
+    rng = random.Random(seed)
+    for _ in range(n_games):
+        ReplayLog(path).append([random_game(rng)])
+
+class TestReplay(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests recording and replaying games.
+    '''
+    def test_record_and_decode(self):
+        '''
+        Function that tests a record holds the secret, guesses, feedback and times.
+        '''
+        engine = GameEngine(['red', 'blue', 'green', 'yellow'])
+        for guess in (['blue', 'red', 'green', 'black'], ['red', 'blue', 'green', 'yellow']):
+            for color in guess:
+                engine.pick_color(engine.config.palette.index(color))
+            engine.submit()
+        data = encode_game(engine)
+        game, end = decode_game(data, 0)
+        self.assertEqual(end, len(data))
+        self.assertEqual(list(game.secret), [0, 1, 2, 3])
+        self.assertEqual([list(guess) for guess in game.guesses], [[1, 0, 2, 5], [0, 1, 2, 3]])
+        self.assertEqual(list(game.feedback), [1 * 5 + 2, 4 * 5])
+        self.assertEqual((game.state, len(game.times)), (WON, 2))
+        self.assertAlmostEqual(game.started, engine.started, places=3)
+        self.assertEqual(replay(game), -1)
+
+    def test_processes_start_a_log_together(self):
+        '''
+        Function that tests processes recording into a new log write its header once.
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'replays.bin')
+            with concurrent.futures.ProcessPoolExecutor(4) as pool:
+                list(pool.map(record_games, [path] * 4, range(4)))
+            with open(path, 'rb') as f:
+                data = f.read()
+            self.assertTrue(data.startswith(MAGIC))
+            self.assertNotIn(MAGIC, data[len(MAGIC):])
+            self.assertEqual(len(list(ReplayLog(path).games())), 40)
+
+    def test_replay_log_finds_regressions(self):
+        '''
+        Function that tests a whole log replays the same, serially and sharded,
+        and that a changed record is reported.
+        '''
+        rng = random.Random(2)
+        engines = [random_game(rng) for _ in range(200)]
+        quitter = GameEngine(rng=rng)
+        quitter.quit()
+        engines.append(quitter)
+        with tempfile.TemporaryDirectory() as directory:
+            log = ReplayLog(os.path.join(directory, 'replays.bin'))
+            log.append(engines[:100])
+            log.append(engines[100:])
+            games = list(log.games())
+            self.assertEqual(len(games), 201)
+            self.assertEqual(games[-1].state, QUIT)
+            serial = replay_log(log.path)
+            sharded = replay_log(log.path, workers=2)
+            self.assertEqual((serial['games'], serial['mismatches']), (201, []))
+            self.assertEqual((sharded['games'], sharded['mismatches']), (201, []))
+
+    def test_tampered_record(self):
+        '''
+        Function that tests a record whose feedback is wrong does not replay the same.
+        '''
+        engine = random_game(random.Random(3))
+        data = bytearray(encode_game(engine))
+        game, _ = decode_game(data, 0)
+        game.feedback = bytes([game.feedback[0] ^ 1]) + game.feedback[1:]
+        self.assertEqual(replay(game), 0)
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
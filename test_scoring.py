@@ -0,0 +1,60 @@
+import itertools
+import unittest
+import numpy as np
+from game_engine import count_bulls_and_cows, colors
+from scoring import count_bulls_and_cows_batch
+
+class TestCountBullsAndCowsBatch(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the batch version of Bulls and Cows
+    agrees with count_bulls_and_cows.
+    '''
+    def test_known_cases(self):
+        '''
+        Function that tests the cases of test_mastermind_game in one batch.
+        '''
+        secret_code = ['red', 'blue', 'green', 'yellow']
+        guesses = [['red', 'blue', 'green', 'yellow'],
+                   ['yellow', 'green', 'blue', 'red'],
+                   ['red', 'green', 'blue', 'yellow'],
+                   ['purple', 'black', 'orange', 'pink']]
+        bulls, cows = count_bulls_and_cows_batch([secret_code], guesses)
+        self.assertEqual(list(zip(bulls.tolist(), cows.tolist())),
+                         [(4, 0), (0, 4), (2, 2), (0, 0)])
+
+    def test_whole_code_space(self):
+        '''
+        Function that tests every pair of the 360 codes against the scalar function.
+        '''
+        codes = [list(code) for code in itertools.permutations(colors, 4)]
+        bulls, cows = count_bulls_and_cows_batch(np.array(codes)[:, None], np.array(codes)[None, :])
+        self.assertEqual(bulls.shape, (360, 360))
+        for s, secret_code in enumerate(codes):
+            for g, guess in enumerate(codes):
+                self.assertEqual((bulls[s, g], cows[s, g]), count_bulls_and_cows(secret_code, guess))
+
+    def test_repeated_guess_colors(self):
+        '''
+        Function that tests guesses with repeated colors count like the scalar function.
+        '''
+        secret_code = ['red', 'blue', 'green', 'yellow']
+        guess = ['blue', 'blue', 'red', 'red']
+        bulls, cows = count_bulls_and_cows_batch(secret_code, guess)
+        self.assertEqual((int(bulls), int(cows)), count_bulls_and_cows(secret_code, guess))
+
+    def test_colors_off_the_palette(self):
+        '''
+        Function that tests different colors missing from the palette never
+        match each other, and the same one matches itself.
+        '''
+        secrets = [['orange', 'red', 'blue', 'green'], ['orange', 'pink', 'blue', 'green']]
+        guesses = [['pink', 'blue', 'red', 'green'], ['pink', 'orange', 'white', 'green']]
+        bulls, cows = count_bulls_and_cows_batch(secrets, guesses)
+        for i, (secret_code, guess) in enumerate(zip(secrets, guesses)):
+            self.assertEqual((int(bulls[i]), int(cows[i])), count_bulls_and_cows(secret_code, guess))
+        self.assertEqual((int(bulls[0]), int(cows[0])), (1, 2))
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from leaderboard import LeaderBoard
+from server import GameServer
+
+class FailingBoard:
+    '''
+    Class: FailingBoard
+    A stand-in for LeaderBoard whose first writes fail, as on a full disk.
+    '''
+    def __init__(self, failures):
+        self.failures = failures
+        self.rows = []
+
+    def append(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('disk full')
+        self.rows += rows
+
+class TestGameServer(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the multi-game server.
+    '''
+    def test_play_a_game(self):
+        '''
+        Function that tests a session follows the rules of the game.
+        '''
+        server = GameServer()
+        session = server.handle_request({'op': 'new', 'username': 'ann'})['session']
+        secret_code = server.sessions[session].engine.secret_code
+        response = server.handle_request({'op': 'pick', 'session': session, 'color': secret_code[0]})
+        self.assertEqual(response['guess'], secret_code[:1])
+        self.assertFalse(server.handle_request({'op': 'submit', 'session': session})['ok'])
+        self.assertTrue(server.handle_request({'op': 'reset', 'session': session})['ok'])
+        response = server.handle_request({'op': 'guess', 'session': session, 'colors': secret_code})
+        self.assertEqual((response['bulls'], response['cows'], response['state']), (4, 0, 'won'))
+        self.assertEqual(response['secret'], secret_code)
+        self.assertNotIn(session, server.sessions)
+        self.assertEqual([(score, name) for score, name, _ in server.pending_leaders], [(1, 'ann')])
+
+    def test_errors_and_idle_sessions(self):
+        '''
+        Function that tests bad requests are answered and idle sessions dropped.
+        '''
+        server = GameServer(idle_timeout=0)
+        session = server.handle_request({'op': 'new'})['session']
+        self.assertEqual(server.handle_request({'op': 'guess', 'session': session, 'colors': ['red']})['error'], 'bad guess')
+        self.assertEqual(server.handle_request({'op': 'fly', 'session': session})['error'], 'unknown op')
+        self.assertEqual(server.reap_idle(), 1)
+        self.assertEqual(server.handle_request({'op': 'state', 'session': session})['error'], 'unknown session')
+
+    def test_housekeeping_survives_a_failed_write(self):
+        '''
+        Function that tests a failed leaders write keeps its wins for the
+        next flush, and the idle sessions are still dropped after it.
+        '''
+        board = FailingBoard(failures=2)
+        server = GameServer(board=board, idle_timeout=0)
+        server.pending_leaders = [(3, 'ann', 1.0)]
+        async def run():
+            housekeeping = asyncio.create_task(server.housekeeping())
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if len(board.rows) == 1:
+                    break
+            server.pending_leaders.append((5, 'bob', 2.0))
+            server.handle_request({'op': 'new'})
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if len(board.rows) == 2 and not server.sessions:
+                    break
+            housekeeping.cancel()
+        errors = io.StringIO()
+        with mock.patch('server.FLUSH_INTERVAL', 0.01), contextlib.redirect_stderr(errors):
+            asyncio.run(run())
+        self.assertEqual(board.rows, [(3, 'ann', 1.0), (5, 'bob', 2.0)])
+        self.assertEqual(errors.getvalue().count('disk full'), 2)
+        self.assertEqual(server.sessions, {})
+        self.assertEqual(server.pending_leaders, [])
+
+    def test_unix_socket(self):
+        '''
+        Function that tests games over a Unix socket and the batched leaders.
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            board = LeaderBoard(os.path.join(directory, 'leaders.log'))
+            server = GameServer(board=board)
+            path = os.path.join(directory, 'game.sock')
+
+            async def play():
+                ready = asyncio.Event()
+                serving = asyncio.create_task(server.serve(unix_path=path, ready=ready))
+                await ready.wait()
+                reader, writer = await asyncio.open_unix_connection(path)
+                async def ask(request):
+                    writer.write(json.dumps(request).encode() + b'\n')
+                    return json.loads(await reader.readline())
+                for name in ('ann', 'bob'):
+                    session = (await ask({'op': 'new', 'username': name}))['session']
+                    secret_code = server.sessions[session].engine.secret_code
+                    self.assertEqual((await ask({'op': 'guess', 'session': session, 'colors': secret_code}))['bulls'], 4)
+                writer.write(b'not json\n')
+                self.assertEqual(json.loads(await reader.readline())['error'], 'bad request')
+                writer.close()
+                serving.cancel()
+                try:
+                    await serving
+                except asyncio.CancelledError:
+                    pass
+
+            asyncio.run(play())
+            self.assertEqual(board.top(), [(1, 'ann'), (1, 'bob')])
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
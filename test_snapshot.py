@@ -0,0 +1,125 @@
+import re
+import turtle
+import unittest
+import zlib
+import itertools
+from game_engine import GameEngine, WON, colors, count_bulls_and_cows
+from board_state import BoardState
+from mastermind_game import MasterMind
+from renderer import draw_circle
+from layout import RECTANGLES, SCREEN_WIDTH, SCREEN_HEIGHT, MARBLE_RADIUS, COUNT_FONT, color_marble_position, \
+     count_position
+from snapshot import IMAGE_RGB, circle_center, screen_point, codes_left, render_svg, render_pixels, render_png, \
+     static_raster, svg_text
+
+class TracingPen(turtle.TNavigator):
+    '''
+    Class: TracingPen
+    A turtle with no canvas that remembers every point it moves to.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.trace = []
+
+    def _goto(self, end):
+        self.trace.append(end)
+        super()._goto(end)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def won_board():
+    '''
+    Function that plays a game won in two guesses.
+    Parameters: None.
+    Returns BoardState.
+    '''
+    engine = GameEngine(['red', 'blue', 'green', 'yellow'])
+    for guess in (['blue', 'red', 'green', 'black'], ['red', 'blue', 'green', 'yellow']):
+        for color in guess:
+            engine.pick_color(engine.config.palette.index(color))
+        engine.submit()
+    return BoardState.from_engine(engine)
+
+class TestSnapshot(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests boards drawn without Tk match the turtle board.
+    '''
+    def test_geometry_matches_turtle(self):
+        '''
+        Function that tests circles and boards sit where the turtle draws them,
+        even with a pen that drew something else before.
+        '''
+        pen = TracingPen()
+        pensize, color, x, y, width, height = RECTANGLES[0]
+        MasterMind.draw_rectangle(None, pen, pensize, color, x, y, width, height)
+        xs, ys = [p[0] for p in pen.trace], [p[1] for p in pen.trace]
+        box = (min(xs), max(ys), max(xs) - min(xs), max(ys) - min(ys))
+        self.assertEqual(tuple(round(value, 6) for value in box), (x, y, width, height))
+        pen.trace.clear()
+        x, y = color_marble_position(3, 2)
+        draw_circle(pen, x, y, MARBLE_RADIUS, 'white')
+        xs, ys = [p[0] for p in pen.trace[1:]], [p[1] for p in pen.trace[1:]]
+        cx, cy = circle_center(x, y, MARBLE_RADIUS)
+        self.assertAlmostEqual((min(xs) + max(xs)) / 2, cx, delta=0.5)
+        self.assertAlmostEqual((min(ys) + max(ys)) / 2, cy, delta=0.5)
+        svg = render_svg(won_board())
+        sx, sy = screen_point(*RECTANGLES[0][2:4])
+        self.assertIn(f'<rect x="{sx:g}" y="{sy:g}" width="{width}" height="{height}"', svg)
+
+    def test_svg_of_a_won_game(self):
+        '''
+        Function that tests the guesses, pegs, win message and leaders are drawn.
+        '''
+        svg = render_svg(won_board(), [(2, 'ann'), (3, '<bob>')], embed=False)
+        fills = re.findall(r'<circle [^>]*fill="(\w+)"', svg)
+        self.assertEqual(fills.count('yellow'), 1) # the guess only, its button is empty
+        self.assertEqual(fills.count('black'), 1 + 1 + 4 + 1) # a guess, 1 then 4 bulls, a button
+        self.assertIn('href="winner.gif"', svg)
+        self.assertIn('2 ann', svg)
+        self.assertIn('&lt;bob&gt;', svg)
+        self.assertTrue(svg.rstrip().endswith('</svg>'))
+
+    def test_codes_left(self):
+        '''
+        Function that tests the codes left after each guess are counted and
+        written where the game writes them, on the SVG and the PNG.
+        '''
+        board = won_board()
+        first = sum(count_bulls_and_cows(list(code), ['blue', 'red', 'green', 'black']) == (1, 2)
+                    for code in itertools.permutations(colors, 4))
+        self.assertEqual(codes_left(board), [first, 1])
+        svg = render_svg(board)
+        for row, count in enumerate([first, 1]):
+            self.assertIn(svg_text(*count_position(row), str(count), COUNT_FONT), svg)
+        pixels, static = render_pixels(board), static_raster()
+        for row in range(2):
+            x, y = screen_point(*count_position(row))
+            top, left = int(y) - 16, int(x)
+            changed = pixels[top:int(y) + 4, left:left + 30] != static[top:int(y) + 4, left:left + 30]
+            self.assertTrue(changed.any())
+        x, y = screen_point(*count_position(2))
+        self.assertTrue((pixels[int(y) - 16:int(y) + 4, int(x):int(x) + 30] ==
+                         static[int(y) - 16:int(y) + 4, int(x):int(x) + 30]).all()) # no third guess
+
+    def test_png(self):
+        '''
+        Function that tests the PNG has the size of the screen and the marbles in their colors.
+        '''
+        board = won_board()
+        pixels = render_pixels(board)
+        self.assertEqual(pixels.shape, (SCREEN_HEIGHT, SCREEN_WIDTH))
+        x, y = screen_point(*circle_center(*color_marble_position(1, 0), MARBLE_RADIUS))
+        self.assertEqual(tuple(IMAGE_RGB[pixels[int(y), int(x)]]), (255, 0, 0)) # red, first peg of round 2
+        data = render_png(board, scale=0.5)
+        self.assertEqual(data[:8], b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(data[16:24], (SCREEN_WIDTH // 2).to_bytes(4, 'big') + (SCREEN_HEIGHT // 2).to_bytes(4, 'big'))
+        start = data.index(b'IDAT') + 4
+        rows = zlib.decompress(data[start:start + int.from_bytes(data[start - 8:start - 4], 'big')])
+        self.assertEqual(len(rows), SCREEN_HEIGHT // 2 * (SCREEN_WIDTH // 2 + 1))
+
+def main():
+    unittest.main(verbosity = 3)
+
+if __name__ == "__main__":
+    main()
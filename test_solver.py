@@ -0,0 +1,61 @@
+import unittest
+from game_engine import count_bulls_and_cows
+from solver import Solver, MINIMAX, EXPECTED_SIZE
+
+class TestSolver(unittest.TestCase):
+    '''
+    Class of a Test Suite that tests the hint and auto-play solver.
+    '''
+    def solve(self, secret_code, method):
+        solver = Solver(method=method)
+        for rounds in range(1, 11):
+            guess = solver.suggest()
+            bulls, cows = count_bulls_and_cows(secret_code, guess)
+            if bulls == 4:
+                return rounds
+            solver.observe(guess, bulls, cows)
+        return None
+
+    def test_minimax_wins_in_five(self):
+        '''
+        Function that tests minimax finds every secret within five guesses.
+        '''
+        solver = Solver()
+        codes = [[solver.palette[c] for c in code] for code in solver.feedback.codes.tolist()]
+        for secret_code in codes[::7]:
+            self.assertLessEqual(self.solve(secret_code, MINIMAX), 5)
+
+    def test_expected_size(self):
+        '''
+        Function that tests the expected size method also wins.
+        '''
+        self.assertIsNotNone(self.solve(['black', 'purple', 'red', 'green'], EXPECTED_SIZE))
+
+    def test_observe_keeps_consistent_codes(self):
+        '''
+        Function that tests the candidates all give the observed pegs.
+        '''
+        solver = Solver()
+        solver.observe(['red', 'blue', 'green', 'yellow'], 1, 2)
+        for code in solver.feedback.codes[solver.candidates].tolist():
+            secret_code = [solver.palette[c] for c in code]
+            self.assertEqual(count_bulls_and_cows(secret_code, ['red', 'blue', 'green', 'yellow']), (1, 2))
+        self.assertEqual(len(solver.latencies), 0)
+        solver.suggest()
+        self.assertEqual(len(solver.latencies), 1)
+
+    def test_contradicting_pegs(self):
+        '''
+        Function that tests pegs no code can give leave no guess to suggest.
+        '''
+        solver = Solver()
+        solver.observe(['red', 'blue', 'green', 'yellow'], 4, 0)
+        solver.observe(['red', 'blue', 'green', 'yellow'], 0, 4)
+        self.assertEqual(len(solver.candidates), 0)
+        self.assertRaisesRegex(ValueError, 'no code is consistent', solver.best_guess)
+        self.assertRaises(ValueError, solver.suggest)
+
+def main():
+    unittest.main(verbosity = 3)
+if __name__ == "__main__":
+    main()
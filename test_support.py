@@ -0,0 +1,48 @@
+import types
+from unittest import mock
+from game_engine import GameEngine, CODE_LENGTH, colors
+from renderer import BoardRenderer
+
+class StubPen:
+    '''
+    Class: StubPen
+    A stand-in for turtle.Turtle that draws nothing, so the game code
+    around the turtle calls runs without a display.
+    '''
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+class StubScreen(StubPen):
+    '''
+    Class: StubScreen
+    A stand-in for turtle.Screen whose username prompt answers at once.
+    '''
+    def textinput(self, title, prompt):
+        return 'bench'
+
+def stub_turtle(leaders_file):
+    '''
+    Function that swaps the turtle of the game for stubs.
+    Parameters: leaders_file -- string, the leaders log the game uses meanwhile.
+    Returns a context manager, mastermind_game is patched inside it.
+    '''
+    import mastermind_game # imports turtle, not needed elsewhere
+    stub = types.SimpleNamespace(Turtle=StubPen, Screen=StubScreen, Terminator=Exception)
+    return mock.patch.multiple(mastermind_game, turtle=stub, LEADERS_FILE=leaders_file,
+                               BoardRenderer=lambda screen: BoardRenderer(screen, new_pen=StubPen))
+
+def random_game(rng):
+    '''
+    Function that plays one headless game with random guesses.
+    Parameters: rng -- random.Random, source of the secret and the guesses.
+    Returns the finished GameEngine.
+    '''
+    engine = GameEngine(rng=rng)
+    while not engine.is_over():
+        for i in rng.sample(range(len(colors)), CODE_LENGTH):
+            engine.pick_color(i)
+        engine.submit()
+    return engine